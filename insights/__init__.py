@@ -147,7 +147,7 @@ def process_dir(broker, root, graph, context, inventory=None, parallel=False):
         from .core.cluster import process_cluster
 
         archives = [f for f in ctx.all_files if f.endswith(COMPRESSION_TYPES)]
-        return process_cluster(graph, archives, broker=broker, inventory=inventory)
+        return process_cluster(graph, archives, broker=broker, inventory=inventory, parallel=parallel)
 
     graph = dict((k, v) for k, v in graph.items() if k in dr.COMPONENTS[dr.GROUPS.single])
     if parallel:
@@ -326,6 +326,8 @@ def run(
     inventory=None,
     print_component=None,
     store_skips=False,
+    low_memory=False,
+    parse_cache=None,
 ):
     args = None
     formatters = None
@@ -377,6 +379,13 @@ def run(
             default=False,
         )
         p.add_argument("--tags", help="Expression to select rules by tag.")
+        p.add_argument(
+            "--low-memory",
+            help="Release intermediate results once they're no longer needed. "
+            "Formatters only see the results of rules and facts.",
+            action="store_true",
+            default=False,
+        )
 
         class Args(object):
             pass
@@ -394,6 +403,8 @@ def run(
 
         args.format = "insights.formats._json" if args.format == "json" else args.format
         args.format = "insights.formats._yaml" if args.format == "yaml" else args.format
+        args.format = "insights.formats._jsonl" if args.format == "jsonl" else args.format
+        args.format = "insights.formats._yaml_stream" if args.format == "yaml_stream" else args.format
         fmt = args.format if "." in args.format else "insights.formats." + args.format
 
         Formatter = dr.get_component(fmt)
@@ -472,15 +483,20 @@ def run(
     broker = dr.Broker()
     if args:
         broker.store_skips = args.show_skips
+        broker.evict = args.low_memory
     else:
         broker.store_skips = store_skips
+        broker.evict = low_memory
+    broker.parse_cache = parse_cache
+    # tracebacks are only formatted if they're shown
+    broker.lazy_tracebacks = True
 
     if args and args.bare:
         ctx = ExecutionContext()  # dummy context that no spec depend on. needed for filters to work
         specs = parse_specs(args.bare)
         specs = load_specs(specs, ctx)
 
-        broker = dr.Broker()
+        broker = dr.Broker(broker)
         broker[ExecutionContext] = ctx
         for spec, content in specs.items():
             broker[spec] = content if dr.DELEGATES[spec].multi_output else content[-1]
@@ -55,6 +55,9 @@ DEFAULT_OBFUSCATIONS = {
     'mac',
     'password',
 }
+STATELESS_OBFUSCATIONS = {
+    'password',
+}
 
 
 class Cleaner(object):
@@ -99,6 +102,21 @@ class Cleaner(object):
             self.obfuscate.update(hostname=Hostname(self.fqdn)) if 'hostname' in obfs else None
             # - MAC obfuscation
             self.obfuscate.update(mac=Mac()) if 'mac' in obfs else None
+        # Cache of cleaned file content, see insights.cleaner.cache
+        self.cache = None
+
+    def fingerprint(self, no_obfuscate=None, no_redact=False):
+        """
+        Returns a string that identifies how content is cleaned with the
+        given options, or None when the result depends on the content cleaned
+        before, i.e. when the content is obfuscated with a mapping.
+        """
+        obfs = set(k for k, v in self.obfuscate.items() if v) - set(no_obfuscate or [])
+        if obfs - STATELESS_OBFUSCATIONS:
+            return None
+        pattern = self.redact['pattern']
+        redact = [pattern._exclude, pattern._regex] if pattern and not no_redact else None
+        return json.dumps([redact, sorted(obfs)])
 
     def clean_content(self, lines, no_obfuscate=None, no_redact=False, allowlist=None, width=False):
         """
@@ -0,0 +1,140 @@
+"""
+Cleaned Content Cache
+=====================
+
+A cache of the cleaned content of files from previous collections, so that
+unchanged files don't have to be read and cleaned again.
+
+The content is stored by its sha256 digest in the ``objects`` directory of
+the cache, and ``index.json`` maps the digest of the key of a file to the
+digest of its content. The key of a file includes its path, device, inode,
+size and modification time along with its filters and the configuration of
+the :py:class:`insights.cleaner.Cleaner`, so any change to them is a miss.
+
+Only content that is not obfuscated with a mapping is cached, since those
+mappings are built from the content as it's cleaned.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+from insights.util import fs
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+RACY_SECONDS = 2
+"""Files modified more recently than this are not cached."""
+
+
+class ContentCache(object):
+    """
+    Class to store and restore the cleaned content of files.
+
+    Args:
+        path (str): The directory of the cache. It's created if it doesn't
+            exist.
+        version (str): Identifies the code cleaning the content. Entries
+            stored by another version are ignored.
+    """
+
+    def __init__(self, path, version=None):
+        self.path = path
+        self.objects = os.path.join(path, "objects")
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self._used = dict()
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.path, INDEX_FILE)) as f:
+                index = json.load(f)
+            if isinstance(index, dict) and index.get("version") == self.version:
+                return index.get("entries", {})
+        except (IOError, OSError, ValueError) as e:
+            logger.debug("Could not load the content cache index: %s", str(e))
+        return {}
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects, digest[:2], digest)
+
+    def key(self, *parts):
+        """
+        Returns the key for the json serializable parts.
+        """
+        data = json.dumps([self.version, parts], sort_keys=True)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def restore(self, key, dst):
+        """
+        Copies the content cached for the key to dst. Returns the size of the
+        content, or None if the key isn't in the cache.
+        """
+        with self._lock:
+            digest = self._index.get(key)
+        if digest is not None:
+            src = self._object_path(digest)
+            try:
+                fs.ensure_path(os.path.dirname(dst))
+                shutil.copyfile(src, dst)
+                size = os.path.getsize(dst)
+                with self._lock:
+                    self._used[key] = digest
+                    self.hits += 1
+                return size
+            except (IOError, OSError) as e:
+                logger.debug("Could not restore %s from the content cache: %s", dst, str(e))
+        with self._lock:
+            self.misses += 1
+
+    def store(self, key, src):
+        """
+        Adds the content of the file src to the cache for the key.
+        """
+        try:
+            sha = hashlib.sha256()
+            with open(src, "rb") as f:
+                for chunk in iter(lambda: f.read(65536), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            dst = self._object_path(digest)
+            if not os.path.exists(dst):
+                fs.ensure_path(os.path.dirname(dst), mode=0o700)
+                fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dst))
+                os.close(fd)
+                shutil.copyfile(src, tmp)
+                os.rename(tmp, dst)
+            with self._lock:
+                self._index[key] = self._used[key] = digest
+        except (IOError, OSError) as e:
+            logger.debug("Could not add %s to the content cache: %s", src, str(e))
+
+    def save(self):
+        """
+        Saves the index of the entries used since the cache was loaded and
+        removes the content no longer referenced by it.
+        """
+        with self._lock:
+            used = dict(self._used)
+        fs.ensure_path(self.path, mode=0o700)
+        fd, tmp = tempfile.mkstemp(dir=self.path)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"version": self.version, "entries": used}, f)
+        os.rename(tmp, os.path.join(self.path, INDEX_FILE))
+
+        digests = set(used.values())
+        for root, _, files in os.walk(self.objects):
+            for name in files:
+                if name not in digests:
+                    try:
+                        os.remove(os.path.join(root, name))
+                    except OSError as e:  # pragma: no cover
+                        logger.debug("Could not remove %s: %s", name, str(e))
@@ -4,6 +4,7 @@ import hashlib
 import logging
 import os
 import pkgutil
+import shutil
 import sys
 import tempfile
 
@@ -14,7 +15,7 @@ from insights.client.apps.ansible.playbook_verifier.contrib.ruamel_yaml.ruamel i
 from insights.client.constants import InsightsConstants as constants
 
 
-__all__ = ("load_playbook_yaml", "verify", "PlaybookVerificationError")
+__all__ = ("load_playbook_yaml", "verify", "verify_plays", "VerificationSession", "PlaybookVerificationError")
 
 yaml = yaml.YAML(typ='rt')
 yaml.indent(mapping=2, sequence=4, offset=2)
@@ -30,6 +31,10 @@ PUBLIC_KEY_PATH = pkgutil.get_data(insights.client.apps.ansible.__name__, 'playb
 logger = logging.getLogger(__name__)
 logging.getLogger('insights.client.apps.ansible.playbook_verifier.contrib').setLevel(logging.INFO)
 
+# Verified revocation lists, by the SHA256 digest of their YAML.  The list ships with the egg,
+# so it's only verified once per egg version for the life of the process.
+_verified_revocation_lists = {}
+
 
 class PlaybookVerificationError(Exception):
     """Exception raised when playbook verification fails."""
@@ -106,6 +111,70 @@ def get_public_key(gpg):
     return import_results
 
 
+class VerificationSession(object):
+    """GPG keyring session for verifying many plays.
+
+    The GPG instance is created and the public key imported once, on first use,
+    instead of for every play. Signatures are written to a private temporary
+    directory that is removed by :meth:`close`.
+
+    It can be used as a context manager::
+
+        with VerificationSession() as session:
+            for play in plays:
+                verify(play, session)
+    """
+    def __init__(self):
+        self._gpg = None
+        self._tmp_dir = None
+
+    @property
+    def gpg(self):
+        """The GPG instance with the public key imported.
+
+        :rtype: gnupg.GPG
+        :raises PlaybookVerificationError: The public key could not be imported.
+        """
+        if self._gpg is None:
+            gpg = gnupg.GPG(gnupghome=constants.insights_core_lib_dir)
+            get_public_key(gpg)
+            self._gpg = gpg
+        return self._gpg
+
+    def verify_data(self, data, signature):
+        """Verify the detached signature of the data.
+
+        :param data: The signed data.
+        :type data: bytes
+        :param signature: The decoded signature.
+        :type signature: bytes
+        :returns: Result of the GPG verification.
+        """
+        gpg = self.gpg
+        if self._tmp_dir is None:
+            self._tmp_dir = tempfile.mkdtemp(prefix="insights-playbook-verifier-")
+
+        fd, fn = tempfile.mkstemp(dir=self._tmp_dir)
+        try:
+            os.write(fd, signature)
+            os.close(fd)
+            return gpg.verify_data(fn, data)
+        finally:
+            os.unlink(fn)
+
+    def close(self):
+        """Remove the temporary files of the session."""
+        if self._tmp_dir is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 def exclude_dynamic_elements(play):
     """Remove dynamic elements from the Ansible play.
 
@@ -156,13 +225,15 @@ def exclude_dynamic_elements(play):
     return result
 
 
-def execute_verification(play, encoded_signature):
+def execute_verification(play, encoded_signature, session=None):
     """Use GPG to verify the play.
 
     :param play: The Ansible play.
     :type play: dict
     :param encoded_signature: The base64-encoded signature.
     :type encoded_signature: str
+    :param session: The session to verify the play with, a new one by default.
+    :type session: VerificationSession
 
     :returns: Result of the GPG verification and a hash of the play.
     :rtype: Tuple[..., bytes]
@@ -170,20 +241,15 @@ def execute_verification(play, encoded_signature):
     play_name = play.get("name", "unnamed")  # type: str
     logger.debug("Play '{play_name}' is being validated".format(play_name=play_name))
 
-    gpg = gnupg.GPG(gnupghome=constants.insights_core_lib_dir)
     serialized_play = serialize_play(play)
     play_hash = hash_play(serialized_play)
     decoded_signature = base64.b64decode(encoded_signature)
 
-    # load public key
-    get_public_key(gpg)
-
-    fd, fn = tempfile.mkstemp()
-    os.write(fd, decoded_signature)
-    os.close(fd)
-
-    result = gpg.verify_data(fn, play_hash)
-    os.unlink(fn)
+    if session is None:
+        with VerificationSession() as session:
+            result = session.verify_data(play_hash, decoded_signature)
+    else:
+        result = session.verify_data(play_hash, decoded_signature)
 
     logger.debug("Play '{play_name}' validation result: valid={valid}, status={status}".format(
         play_name=play_name, valid=result.valid, status=result.status
@@ -191,11 +257,13 @@ def execute_verification(play, encoded_signature):
     return result, play_hash
 
 
-def verify_play(play):
+def verify_play(play, session=None):
     """Verify the signature in a play.
 
     :param play: The Ansible play.
     :type play: dict
+    :param session: The session to verify the play with, a new one by default.
+    :type session: VerificationSession
 
     :returns: Result of the GPG verification and a hash of the play.
     :rtype: Tuple[..., bytes]
@@ -208,18 +276,27 @@ def verify_play(play):
     cleaned_play = exclude_dynamic_elements(play)  # type: dict
     encoded_signature = play["vars"][PLAYBOOK_SIGNATURE_LABEL]  # type: str
 
-    return execute_verification(cleaned_play, encoded_signature)
+    return execute_verification(cleaned_play, encoded_signature, session)
 
 
-def get_play_revocation_list(revoked_plays_yaml):
+def get_play_revocation_list(revoked_plays_yaml, session=None):
     """
     Load the list of revoked play hashes from the egg.
 
+    A list is verified once, later calls with the same YAML return the
+    list verified the first time.
+
     :param revoked_plays_yaml: The YAML containing hashes of revoked plays.
     :type revoked_plays_yaml: bytes
+    :param session: The session to verify the list with, a new one by default.
+    :type session: VerificationSession
     :returns: Revocation entries in a form of `name:hash`.
     :rtype: list[dict[str, str]]
     """
+    digest = hashlib.sha256(revoked_plays_yaml).hexdigest()
+    if digest in _verified_revocation_lists:
+        return _verified_revocation_lists[digest]
+
     try:
         # We know the structure of the YAML will stay like this:
         # > - name: revocation list
@@ -237,20 +314,23 @@ def get_play_revocation_list(revoked_plays_yaml):
     except Exception:
         raise PlaybookVerificationError("Could not load play revocation list.")
 
-    verified, _ = verify_play(revoked_plays)
+    verified, _ = verify_play(revoked_plays, session)
 
     if not verified:
         raise PlaybookVerificationError("List of revocation signatures is invalid.")
 
     revocation_list = revoked_plays.get("revoked_playbooks", [])  # type: list[str]
+    _verified_revocation_lists[digest] = revocation_list
     return revocation_list
 
 
-def verify(play):
+def verify(play, session=None):
     """Verify the GPG-signed Ansible play.
 
     :param play: Unverified Ansible play.
     :type play: dict
+    :param session: The session to verify the play with, a new one by default.
+    :type session: VerificationSession
     :returns: Verified Ansible play.
     :rtype: dict
     :raises PlaybookVerificationError: An error occurred when trying to verify the play.
@@ -262,10 +342,10 @@ def verify(play):
         raise PlaybookVerificationError("Empty plays cannot be verified.")
 
     revocation_list_file_content = pkgutil.get_data('insights', 'revoked_playbooks.yaml')  # type: bytes
-    revocation_list = get_play_revocation_list(revocation_list_file_content)  # type: list[dict[str, str]]
+    revocation_list = get_play_revocation_list(revocation_list_file_content, session)  # type: list[dict[str, str]]
     logger.debug("List of revoked playbooks was loaded.")
 
-    verified, play_hash = verify_play(play)  # type: ..., str
+    verified, play_hash = verify_play(play, session)  # type: ..., str
 
     if not verified:
         raise PlaybookVerificationError(message="Play '{0}' has invalid signature".format(play_name))
@@ -276,3 +356,19 @@ def verify(play):
 
     logger.info("Play '{name}' passed verification.".format(name=play_name))
     return play
+
+
+def verify_plays(plays):
+    """Verify all the GPG-signed plays of an Ansible playbook.
+
+    The plays are verified in one :class:`VerificationSession`, so the public
+    key is imported once for the whole playbook.
+
+    :param plays: Unverified Ansible plays.
+    :type plays: list[dict]
+    :returns: Verified Ansible plays.
+    :rtype: list[dict]
+    :raises PlaybookVerificationError: An error occurred when trying to verify a play.
+    """
+    with VerificationSession() as session:
+        return [verify(play, session) for play in plays]
@@ -1,7 +1,7 @@
 import os
 import sys
 from insights.client.constants import InsightsConstants as constants
-from insights.client.apps.ansible.playbook_verifier import verify, load_playbook_yaml, PlaybookVerificationError
+from insights.client.apps.ansible.playbook_verifier import verify_plays, load_playbook_yaml, PlaybookVerificationError
 
 
 def read_playbook():
@@ -19,8 +19,7 @@ try:
         exit(0)
 
     plays = load_playbook_yaml(raw_playbook)  # type: list[dict]
-    for play in plays:
-        _ = verify(play)
+    _ = verify_plays(plays)
 except PlaybookVerificationError as err:
     sys.stderr.write(err.message + "\n")
     sys.exit(constants.sig_kill_bad)
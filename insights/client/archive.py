@@ -5,6 +5,7 @@ Handle adding files and preparing the archive for upload
 from __future__ import absolute_import
 
 import atexit
+import hashlib
 import logging
 import os
 import shlex
@@ -22,6 +23,16 @@ from insights.client.utilities import determine_hostname, _expand_paths, write_d
 
 logger = logging.getLogger(__name__)
 
+COMPRESSION_FLAGS = {"gz": "z", "xz": "J", "bz2": "j", "none": ""}
+
+
+def get_tar_file_name(archive_dir, compressor):
+    """
+    Path of the tar file of the archive directory
+    """
+    ext = "" if compressor == "none" else ".%s" % compressor
+    return archive_dir.rstrip("/") + ".tar" + ext
+
 
 class InsightsArchive(object):
     """
@@ -144,7 +155,7 @@ class InsightsArchive(object):
         return path
 
     def get_compression_flag(self, compressor):
-        return {"gz": "z", "xz": "J", "bz2": "j", "none": ""}.get(compressor, "z")
+        return COMPRESSION_FLAGS.get(compressor, "z")
 
     def create_tar_file(self):
         """
@@ -153,9 +164,7 @@ class InsightsArchive(object):
         if not self.tmp_dir:
             # we should never get here but bail out if we do
             raise RuntimeError('Archive temporary directory not defined.')
-        tar_file_name = os.path.join(self.tmp_dir, self.archive_name)
-        ext = "" if self.compressor == "none" else ".%s" % self.compressor
-        tar_file_name = tar_file_name + ".tar" + ext
+        tar_file_name = get_tar_file_name(os.path.join(self.tmp_dir, self.archive_name), self.compressor)
         logger.debug("Tar File: " + tar_file_name)
         # change cwd to compress the archive directory inside the temporary directory
         # with the correct structure
@@ -260,3 +269,74 @@ class InsightsArchive(object):
             # file exists already
             logger.error('ERROR: Could not stored archive to %s', self.archive_stored)
             raise
+
+
+class TarStream(object):
+    """
+    The tar file of an archive directory, read while tar creates it
+
+    Iterating over a TarStream runs tar and yields the compressed data in
+    chunks as tar writes it.  Each chunk is also hashed and written to the
+    tar file, which spools the archive so it can be sent again without
+    compressing it again.  The archive directory is removed once all of it
+    has been read.
+
+    Attributes:
+        archive_dir     - the archive directory
+        name            - path of the tar file the archive is spooled to
+        sha256          - hex SHA256 digest of the tar file, once it's complete
+        size            - number of bytes read so far
+    """
+    chunk_size = 64 * 1024
+
+    def __init__(self, archive_dir, compressor="gz"):
+        self.archive_dir = archive_dir.rstrip("/")
+        self.compressor = compressor
+        self.name = get_tar_file_name(self.archive_dir, compressor)
+        self.sha256 = None
+        self.size = 0
+        self._chunks = self._read()
+
+    def _read(self):
+        logger.debug("Tar File: %s", self.name)
+        flag = COMPRESSION_FLAGS.get(self.compressor, "z")
+        errors = tempfile.TemporaryFile()
+        proc = subprocess.Popen(
+            ["tar", "c%sfS" % flag, "-", os.path.basename(self.archive_dir)],
+            stdout=subprocess.PIPE,
+            stderr=errors,
+            cwd=os.path.dirname(self.archive_dir),
+        )
+        sha = hashlib.sha256()
+        try:
+            with open(self.name, "wb") as spool:
+                for chunk in iter(lambda: proc.stdout.read(self.chunk_size), b""):
+                    sha.update(chunk)
+                    spool.write(chunk)
+                    self.size += len(chunk)
+                    yield chunk
+        finally:
+            proc.stdout.close()
+            return_code = proc.wait()
+            errors.seek(0)
+            message = errors.read().decode("utf-8", "replace").strip()
+            errors.close()
+        if return_code != 0:
+            raise RuntimeError("Could not create %s: %s" % (self.name, message or return_code))
+        self.sha256 = sha.hexdigest()
+        shutil.rmtree(self.archive_dir, True)
+        logger.debug("Tar File Size: %s", self.size)
+        logger.debug("Tar File SHA256: %s", self.sha256)
+
+    def __iter__(self):
+        return self._chunks
+
+    def finish(self):
+        """
+        Read what is left of the archive into the tar file and return its path
+        """
+        for _ in self._chunks:
+            pass
+        if self.sha256 is None:
+            raise RuntimeError("Could not create %s." % self.name)
+        return self.name
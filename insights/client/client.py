@@ -19,6 +19,7 @@ from .utilities import (
     determine_hostname,
     get_version_info,
 )
+from .archive import TarStream
 from .collection_rules import InsightsUploadConf
 from .core_collector import CoreCollector
 from .connection import InsightsConnection
@@ -399,6 +400,11 @@ def _legacy_upload(config, pconn, tar_file, content_type, collection_duration=No
 
 
 def upload(config, pconn, tar_file, content_type, collection_duration=None):
+    if config.stream_upload and os.path.isdir(tar_file):
+        # compress the collected archive while it is uploaded
+        tar_file = TarStream(tar_file, config.compressor)
+        if config.legacy_upload:
+            tar_file = tar_file.finish()
     if config.legacy_upload:
         return _legacy_upload(config, pconn, tar_file, content_type, collection_duration)
     logger.info('Uploading Insights data.')
@@ -409,6 +415,10 @@ def upload(config, pconn, tar_file, content_type, collection_duration=None):
         except Exception as e:
             display_upload_error_and_retry(config, tries, str(e))
             continue
+        finally:
+            if isinstance(tar_file, TarStream):
+                # the retries upload the tar file written by the first attempt
+                tar_file = tar_file.finish()
 
         if upload.status_code in (200, 202):
             # Write to last upload file
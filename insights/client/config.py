@@ -380,6 +380,20 @@ DEFAULT_OPTS = {
         'action': 'store_true',
         'group': 'debug',
     },
+    'stream_archive': {
+        # compress the archive while the data is collected
+        'default': False,
+        'opt': ['--stream-archive'],
+        'help': argparse.SUPPRESS,
+        'action': 'store_true',
+    },
+    'stream_upload': {
+        # compress the archive while it is uploaded
+        'default': False,
+        'opt': ['--stream-upload'],
+        'help': argparse.SUPPRESS,
+        'action': 'store_true',
+    },
     'support': {
         'default': False,
         'opt': ['--support'],
@@ -11,6 +11,7 @@ import platform
 import sys
 import warnings
 import errno
+import uuid
 # import io
 from tempfile import TemporaryFile
 # from datetime import datetime, timedelta
@@ -23,9 +24,10 @@ from .utilities import (determine_hostname,
                         write_unregistered_file,
                         write_registered_file,
                         os_release_info,
-                        largest_spec_in_archive,
+                        specs_by_size,
                         size_in_mb,
                         _get_rhsm_identity)
+from .archive import TarStream
 from .cert_auth import rhsmCertificate
 from .constants import InsightsConstants as constants
 from insights import cleaner, package_info
@@ -871,8 +873,16 @@ class InsightsConnection(object):
         logger.info("Archive is {fsize} MB which is larger than the maximum allowed size of {flimit} MB.".format(
             fsize=archive_filesize, flimit=constants.archive_filesize_max))
 
-        biggest_file = largest_spec_in_archive(archive_file)
-        logger.info("The largest file in the archive is %s at %s MB.", biggest_file[0], size_in_mb(biggest_file[1]))
+        logger.info("Checking for large files...")
+        # the largest file can be in any spec, not only in those with the most data
+        specs = specs_by_size(archive_file, n=None)
+        if not specs:
+            return
+        biggest = max(specs, key=lambda s: s["largest_size"])
+        logger.info("The largest file in the archive is %s at %s MB.",
+                    biggest["largest_file"], size_in_mb(biggest["largest_size"]))
+        logger.info("The specs with the most data in the archive are:\n%s", "\n".join(
+            "  %s: %.2f MB" % (s["name"], size_in_mb(s["size"])) for s in specs[:10]))
         logger.info("Please add the following spec to /etc/insights-client/file-redaction.yaml."
         "According to the documentation https://access.redhat.com/articles/4511681\n\n"
         "****  /etc/insights-client/file-redaction.yaml ****\n"
@@ -881,7 +891,7 @@ class InsightsConnection(object):
         "# Files can be specified either by full filename or\n"
         "#   by the specs listed in insights/specs/default.py\n"
         "files:\n"
-        "- %s \n**** ****", biggest_file[2])
+        "- %s \n**** ****", biggest["name"])
 
     # -LEGACY-
     def _legacy_upload_archive(self, data_collected, duration):
@@ -928,13 +938,35 @@ class InsightsConnection(object):
         logger.debug("Upload duration: %s", upload.elapsed)
         return upload
 
+    @staticmethod
+    def _multipart_stream(boundary, file_name, tar_stream, content_type, metadata):
+        """
+        Yield the multipart/form-data body of an upload, with the archive
+        read from the tar stream while it's being compressed
+        """
+        yield ('--{0}\r\n'
+               'Content-Disposition: form-data; name="file"; filename="{1}"\r\n'
+               'Content-Type: {2}\r\n\r\n').format(boundary, file_name, content_type).encode('utf-8')
+        for chunk in tar_stream:
+            yield chunk
+        yield ('\r\n--{0}\r\n'
+               'Content-Disposition: form-data; name="metadata"\r\n\r\n'
+               '{1}\r\n'
+               '--{0}--\r\n').format(boundary, metadata).encode('utf-8')
+
     def upload_archive(self, data_collected, content_type, duration=None):
         """
         Do an HTTPS Upload of the archive
+
+        data_collected is the path of the archive, or a TarStream to send the
+        archive as it's compressed, with chunked transfer encoding
         """
 
         if self.config.legacy_upload:
             return self._legacy_upload_archive(data_collected, duration)
+        tar_stream = data_collected if isinstance(data_collected, TarStream) else None
+        if tar_stream:
+            data_collected = tar_stream.name
         file_name = os.path.basename(data_collected)
         upload_url = self.upload_url
         c_facts = {}
@@ -956,16 +988,25 @@ class InsightsConnection(object):
         c_facts = json.dumps(self._clean_facts(c_facts))
         logger.debug('Canonical facts collected:\n%s', c_facts)
 
-        files = {
-            'file': (file_name, open(data_collected, 'rb'), content_type),
-            'metadata': c_facts
-        }
         logger.debug('content-type: %s', content_type)
         logger.debug("Uploading %s to %s", data_collected, upload_url)
-        try:
-            upload = self.post(upload_url, files=files, headers={})
-        except Exception:
-            raise
+        if tar_stream:
+            boundary = uuid.uuid4().hex
+            body = self._multipart_stream(boundary, file_name, tar_stream, content_type, c_facts)
+            headers = {'Content-Type': 'multipart/form-data; boundary=%s' % boundary}
+            try:
+                upload = self.post(upload_url, data=body, headers=headers)
+            except Exception:
+                raise
+        else:
+            files = {
+                'file': (file_name, open(data_collected, 'rb'), content_type),
+                'metadata': c_facts
+            }
+            try:
+                upload = self.post(upload_url, files=files, headers={})
+            except Exception:
+                raise
 
         logger.debug('Request ID: %s', upload.headers.get('x-rh-insights-request-id', None))
         if upload.status_code in (200, 202):
@@ -986,6 +1027,8 @@ class InsightsConnection(object):
                 upload.status_code)
             if upload.status_code == 413:
                 # let the user know what file is bloating the archive
+                if tar_stream:
+                    tar_stream.finish()
                 self._archive_too_big(data_collected)
             return upload
         logger.debug("Upload duration: %s", upload.elapsed)
@@ -7,7 +7,7 @@ from __future__ import absolute_import
 import logging
 
 from insights import collect
-from insights.client.archive import InsightsArchive
+from insights.client.archive import InsightsArchive, get_tar_file_name
 from insights.client.constants import InsightsConstants as constants
 from insights.client.utilities import systemd_notify_init_thread
 
@@ -37,12 +37,19 @@ class CoreCollector(object):
         logger.debug('Beginning to run core collection ...')
 
         self.config.rhsm_facts_file = constants.rhsm_facts_file
-        collect.collect(
+        stream = bool(self.config.stream_archive and not self.config.output_dir)
+        result = collect.collect(
             tmp_path=self.archive.tmp_dir,
             archive_name=self.archive.archive_name,
             rm_conf=rm_conf or {},
             client_config=self.config,
+            compress=stream,
+            compressor=self.config.compressor,
+            stream=stream,
         )
+        if stream:
+            # the archive was written during collection
+            self.archive.tar_file = result[0]
 
         logger.debug('Core collection finished.')
 
@@ -68,5 +75,12 @@ class CoreCollector(object):
         """
         if self.config.output_dir:
             return self.archive.archive_dir
+        elif self.config.stream_archive and self.archive.tar_file:
+            return self.archive.tar_file
+        elif self.config.stream_upload and not (self.config.no_upload or self.config.output_file):
+            # the archive is compressed while it is uploaded, the tar file
+            # is written next to it for the retries and --keep-archive
+            self.archive.tar_file = get_tar_file_name(self.archive.archive_dir, self.config.compressor)
+            return self.archive.archive_dir
         else:
             return self.archive.create_tar_file()
@@ -1,4 +1,5 @@
 from __future__ import print_function
+import copy
 import functools
 from os.path import isfile
 import json
@@ -53,6 +54,76 @@ def get_phases():
     }]
 
 
+def _core_egg_state():
+    try:
+        st = os.stat(constants.insights_core_newest)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime)
+
+
+def run_phases(names=None):
+    """
+    Run the phases in this process instead of each in a process of its own,
+    so python, the egg and the configuration are only loaded once.
+
+    The configuration is loaded once.  Each phase gets a client of its own
+    set up with its own copy of the loaded configuration, so changes made by
+    a phase, to the configuration or the connection, aren't seen by the next
+    ones, as when each phase runs in its own process.
+    A phase that stops the run, e.g. for ``--version`` or on failure, exits
+    this process with the same code as when it runs in its own process.
+
+    The phases after ``update`` must run with the core it installs, which
+    can't be swapped in a running process.  So when a phase installs a new
+    core egg, the remaining phases aren't run here and are returned instead,
+    for the caller to run in new processes as usual.
+
+    Args:
+        names (list): The names of the phases to run, all of them by default.
+
+    Returns:
+        list: The names of the phases left to run with the new core, empty
+        when all the phases ran.
+    """
+    names = names or [p['name'] for p in get_phases()]
+    phases = []
+    for name in names:
+        func = globals().get(name)
+        if not callable(getattr(func, '__wrapped__', None)):
+            raise ValueError("Unknown phase: %s" % name)
+        phases.append(func.__wrapped__)
+
+    try:
+        snapshot = InsightsConfig().load_all()
+    except (ValueError, OSError) as e:
+        sys.stderr.write('ERROR: ' + str(e) + '\n')
+        sys.exit(constants.sig_kill_bad)
+
+    for i, func in enumerate(phases):
+        try:
+            config = copy.deepcopy(snapshot)
+            client = InsightsClient(config)
+        except (ValueError, OSError) as e:
+            sys.stderr.write('ERROR: ' + str(e) + '\n')
+            sys.exit(constants.sig_kill_bad)
+        core = _core_egg_state()
+        try:
+            func(client, config)
+        except SystemExit as e:
+            # a phase exiting with 0 lets the next phases run
+            if e.code:
+                raise
+        except Exception:
+            logger.exception("Fatal error")
+            sys.exit(1)
+
+        if _core_egg_state() != core and names[i + 1:]:
+            logger.debug("A new core was installed, the phases %s must run with it.", ", ".join(names[i + 1:]))
+            return names[i + 1:]
+    return []
+
+
 @phase
 def pre_update(client, config):
 
@@ -31,6 +31,7 @@ from .collection_rules import InsightsUploadConf, load_yaml
 from insights.client import cert_auth
 
 from insights.core.context import Context
+from insights.core.serde import SIZES_FILE, rank_by_size
 from insights.parsers.os_release import OsRelease
 from insights.parsers.redhat_release import RedhatRelease
 from insights.util.hostname import determine_hostname  # noqa: F401
@@ -532,38 +533,72 @@ def get_rhel_version():
     return version
 
 
+def specs_by_size(archive_file, n=10):
+    """
+    Returns the `n` specs with the most data in the archive, or all of them
+    if `n` is None, ranked by :py:func:`insights.core.serde.rank_by_size`.
+
+    The report saved to the "meta_data" of the archive during collection is
+    used when there is one. Otherwise the sizes of the files under "data" are
+    matched with the results in "meta_data". Either way the archive is read
+    once.
+    """
+    sizes = {}
+    docs = []
+    report = None
+    with tarfile.open(archive_file, 'r') as tar_file:
+        for member in tar_file:
+            if not member.isfile():
+                continue
+            # <archive name>/<data or meta_data>/<relative path>
+            parts = os.path.normpath(member.name).split(os.sep)
+            if len(parts) < 3:
+                continue
+            top, rel = parts[1], "/".join(parts[2:])
+            if top == "data":
+                sizes[rel] = member.size
+            elif top == "meta_data":
+                content = tar_file.extractfile(member).read()
+                if rel == SIZES_FILE:
+                    report = content
+                else:
+                    docs.append(content)
+
+    if report is not None:
+        try:
+            return json.loads(report)["specs"][:n]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.debug("Could not load %s: %s", SIZES_FILE, str(e))
+
+    found = {}
+    for content in docs:
+        try:
+            doc = json.loads(content)
+            name = doc["name"]
+        except (ValueError, KeyError, TypeError):
+            continue
+        results = doc.get("results") or []
+        if not isinstance(results, list):
+            # specs with only one resulting file are not in list form
+            results = [results]
+        for result in results:
+            rel = (result.get("object") or {}).get("relative_path")
+            if rel in sizes:
+                found[rel] = (sizes[rel], name)
+    return rank_by_size(found, n)
+
+
 def largest_spec_in_archive(archive_file):
+    """
+    Returns a tuple of the relative path and size of the largest file in the
+    archive and the name of its spec.
+    """
     logger.info("Checking for large files...")
-    tar_file = tarfile.open(archive_file, 'r')
-    largest_fsize = 0
-    largest_file_name = ""
-    largest_spec = ""
-    # get the name of the archive
-    name = os.path.basename(archive_file).split(".tar.gz")[0]
-    # get the archives from inside meta_data directory
-    metadata_top = os.path.join(name, "meta_data/")
-    data_top = os.path.join(name, "data")
-    for file in tar_file.getmembers():
-        if metadata_top in file.name:
-            file_extract = tar_file.extractfile(file.name)
-            specs_metadata = json.load(file_extract)
-            results = specs_metadata.get("results", [])
-            if not results:
-                continue
-            if not isinstance(results, list):
-                # specs with only one resulting file are not in list form
-                results = [results]
-            for result in results:
-                # get the path of the spec result and check its filesize
-                fname = result.get("object", {}).get("relative_path")
-                abs_fname = os.path.join('.', data_top, fname)
-                # get the archives from inside data directory
-                data_file = tar_file.getmember(abs_fname)
-                if data_file.size > largest_fsize:
-                    largest_fsize = data_file.size
-                    largest_file_name = fname
-                    largest_spec = specs_metadata["name"]
-    return (largest_file_name, largest_fsize, largest_spec)
+    specs = specs_by_size(archive_file, n=None)
+    if not specs:
+        return ("", 0, "")
+    spec = max(specs, key=lambda s: s["largest_size"])
+    return (spec["largest_file"], spec["largest_size"], spec["name"])
 
 
 def size_in_mb(num_bytes):
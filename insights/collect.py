@@ -10,6 +10,7 @@ runs all datasources in ``insights.specs.Specs`` and
 from __future__ import print_function
 
 import argparse
+import json
 import logging
 import os
 import sys
@@ -17,12 +18,17 @@ import tempfile
 import yaml
 
 from datetime import datetime, timezone
+from glob import glob
 
-from insights import apply_configs, apply_default_enabled, get_pool
+from insights import apply_configs, apply_default_enabled, get_nvr, get_pool
 from insights.cleaner import Cleaner
+from insights.cleaner.cache import ContentCache
 from insights.core import blacklist, dr, filters
-from insights.core.serde import Hydration
-from insights.core.spec_factory import SAFE_ENV
+from insights.core.archives import TarWriter
+from insights.core.exceptions import CalledProcessTimeout, TimeoutException
+from insights.core.profiling import PROFILE_FILE, Profiler
+from insights.core.serde import SIZES_FILE, Hydration
+from insights.core.spec_factory import SAFE_ENV, RegistryPoint
 from insights.specs.manifests import manifests
 from insights.util import fs
 from insights.util.hostname import determine_hostname
@@ -141,6 +147,140 @@ def get_to_persist(persisters):
     return results
 
 
+def load_history(path):
+    """
+    Loads the collection history saved by :func:`save_history`. It maps the
+    names of persisted components to a list with an entry for each run. The
+    entry is a ``[duration, timed_out]`` pair, or ``None`` if the component
+    was skipped. An empty history is returned if the file can't be read.
+    """
+    try:
+        with open(path) as f:
+            history = json.load(f)
+        if isinstance(history, dict):
+            return history
+        log.warning("Ignoring invalid collection history: %s", path)
+    except (IOError, OSError, ValueError) as e:
+        log.debug("Could not load collection history: %s", str(e))
+    return {}
+
+
+def save_history(path, history):
+    """
+    Saves the collection history to path.
+    """
+    fs.ensure_path(os.path.dirname(path) or ".")
+    with open(path, "w") as f:
+        json.dump(history, f, sort_keys=True)
+
+
+def _timed_out(exceptions):
+    for ex in exceptions:
+        if isinstance(ex, (TimeoutException, CalledProcessTimeout)):
+            return True
+    return False
+
+
+def _timed_out_recently(entries, runs):
+    recent = entries[-runs:]
+    ran = [e for e in recent if e is not None]
+    return len(recent) == runs and bool(ran) and all(e[1] for e in ran)
+
+
+def update_history(history, broker, meta_root, skipped=None, runs=3):
+    """
+    Adds the components persisted to meta_root by the last run to the
+    history and keeps the last ``runs`` entries of each. The duration of a
+    component is its execution and serialization time, the same as when an
+    archive is hydrated.
+
+    Args:
+        history (dict): The history loaded by :func:`load_history`.
+        broker (Broker): The broker used for the collection.
+        meta_root (str): The "meta_data" directory of the collection.
+        skipped (set): Names of the components skipped by
+            :func:`get_history_configs`.
+        runs (int): The number of runs to keep.
+
+    Returns:
+        dict: The updated history.
+    """
+    timed_out = set(
+        dr.get_name(c) for c, exs in broker.exceptions.items() if _timed_out(exs)
+    )
+    history = dict(history)
+    for path in glob(os.path.join(meta_root, "*.json")):
+        if os.path.basename(path) in (PROFILE_FILE, SIZES_FILE):
+            continue
+        try:
+            with open(path) as f:
+                doc = json.load(f)
+            name = doc["name"]
+            duration = (doc.get("exec_time") or 0) + (doc.get("ser_time") or 0)
+        except Exception as ex:
+            log.debug("Could not read %s: %s", path, str(ex))
+            continue
+        entries = history.get(name, []) + [[duration, name in timed_out]]
+        history[name] = entries[-runs:]
+    for name in skipped or []:
+        history[name] = (history.get(name, []) + [None])[-runs:]
+    return history
+
+
+def get_history_configs(history, runs=3, on_timeout="skip"):
+    """
+    Creates plugin configs for the components that timed out in each of the
+    last ``runs`` runs they weren't skipped in.
+
+    A component that is skipped for ``runs`` runs in a row is tried again.
+
+    Args:
+        history (dict): The history loaded by :func:`load_history`.
+        runs (int): The number of runs to consider.
+        on_timeout (str or int): "skip" to disable the components, or the
+            number of seconds to lower their timeout to.
+
+    Returns:
+        (list, set): The configs for :func:`insights.apply_configs` and the
+        names of the skipped components.
+    """
+    configs = []
+    skipped = set()
+    for name in sorted(history):
+        if not _timed_out_recently(history[name], runs):
+            continue
+        comp = dr.get_component_by_name(name)
+        if comp is None:
+            continue
+        names = [name]
+        if isinstance(comp, RegistryPoint):
+            # the implementations do the work and have the timeouts
+            names.extend(sorted(dr.get_name(d) for d in dr.get_dependencies(comp)))
+        if on_timeout == "skip":
+            log.warning("Skipping %s since it timed out in the last %d runs", name, runs)
+            configs.extend({"name": n, "enabled": False} for n in names)
+            skipped.add(name)
+        else:
+            log.warning("Lowering the timeout of %s to %s seconds", name, on_timeout)
+            # not "enabled", so that components disabled by the user stay so
+            configs.extend({"name": n, "timeout": on_timeout} for n in names)
+    return configs, skipped
+
+
+def get_history_weights(history):
+    """
+    Returns the average duration of the components in the history for
+    :func:`insights.core.dr.run_all` to start the slowest ones first.
+    """
+    weights = {}
+    for name, entries in history.items():
+        times = [e[0] for e in entries if e is not None]
+        comp = dr.get_component_by_name(name)
+        if times and comp is not None:
+            weights[comp] = sum(times) / len(times)
+    return weights
+
+
 def create_archive(path, remove_path=True):
     """
     Creates a tar.gz of the path using the path basename + "tar.gz"
@@ -174,6 +314,11 @@ def collect(
     archive_name=None,
     compress=False,
     manifest=None,
+    profile=False,
+    history=None,
+    cache=None,
+    compressor="gz",
+    stream=False,
 ):
     """
     This is the collection entry point. It accepts a manifest, a temporary
@@ -196,6 +341,22 @@ def collect(
             collection manifest. See default_manifest for an example.  This
             option works only for `insights-collect` where 'client_config'
             is not filled.
+        profile (boolean): True to record the resources used by each
+            component and save them to the "meta_data" directory of the
+            output, along with the specs with the most data. See
+            :mod:`insights.core.profiling`.
+        history (str): The file in which to keep how long components took
+            across runs. It overrides the "path" of the "history" section of
+            the manifest's "client" section.
+        cache (str): The directory in which to cache the cleaned content of
+            files, so unchanged files aren't read and cleaned again. It
+            overrides the "path" of the "cache" section of the manifest's
+            "client" section. Only used when the content is cleaned.
+        compressor (str): The compression of the archive, one of "gz",
+            "bz2", "xz" or "none". Only used with `stream`.
+        stream (boolean): True to compress the output while it's collected
+            instead of after collection, removing the files of each spec
+            once they are in the archive. Only used with `compress`.
 
     Returns:
         (str, dict): The full path to the created tar.gz or workspace.
@@ -216,6 +377,17 @@ def collect(
     plugins = manifest.get("plugins", {})
 
     load_packages(plugins.get("packages", []))
+
+    history_cfg = client.get("history") or {}
+    history_path = history or history_cfg.get("path")
+    history_runs = history_cfg.get("runs", 3)
+    on_timeout = history_cfg.get("on_timeout")
+    past = load_history(history_path) if history_path else {}
+    skipped = set()
+    if past and on_timeout is not None:
+        configs, skipped = get_history_configs(past, history_runs, on_timeout)
+        plugins = dict(plugins, configs=plugins.get("configs", []) + configs)
+
     apply_default_enabled(plugins)
     apply_configs(plugins)
     # process blacklist
@@ -246,10 +418,15 @@ def collect(
     broker = dr.Broker()
     ctx = create_context(client.get("context", {}))
     cleaner = Cleaner(client_config, black_list) if client_config else None
+    cache_path = cache or (client.get("cache") or {}).get("path")
+    if cleaner and cache_path:
+        cleaner.cache = ContentCache(cache_path, version=get_nvr())
     broker[ctx.__class__] = ctx
     broker['cleaner'] = cleaner
     broker['redact_config'] = black_list
     broker['client_config'] = client_config
+    if profile:
+        broker.profiler = Profiler()
 
     # run in "serial" mode by default
     run_strategy = client.get("run_strategy", {"name": "serial"})
@@ -260,16 +437,47 @@ def collect(
         log.warning("Parallel collection is not supported when 'obfuscate' is enabled")
         parallel = False
 
+    sink = TarWriter(output_path, compressor) if compress and stream else None
     pool_args = run_strategy.get("args", {})
-    with get_pool(parallel, "insights-collector-pool", pool_args) as pool:
-        h = Hydration(output_path, ctx, pool=pool)
-        broker.add_observer(h.make_persister(to_persist))
-        dr.run_all(broker=broker, pool=pool)
+    try:
+        with get_pool(parallel, "insights-collector-pool", pool_args) as pool:
+            h = Hydration(
+                output_path, ctx, pool=pool, sink=sink, dedup=client.get("dedup", False), record_sizes=profile
+            )
+            broker.add_observer(h.make_persister(to_persist))
+            weights = get_history_weights(past) if pool and past else None
+            dr.run_all(broker=broker, pool=pool, weights=weights)
+    except BaseException:
+        # don't leave the compressor running or a partial archive behind
+        if sink is not None:
+            sink.abort()
+        raise
+
+    if broker.profiler is not None:
+        fs.ensure_path(h.meta_root)
+        broker.profiler.dump(h.meta_root)
+        h.dump_sizes()
+
+    if cleaner and cleaner.cache:
+        log.info("Reused %d cached files", cleaner.cache.hits)
+        try:
+            cleaner.cache.save()
+        except (IOError, OSError) as e:
+            log.warning("Could not save the content cache: %s", str(e))
+
+    if history_path:
+        try:
+            past = update_history(past, broker, h.meta_root, skipped, history_runs)
+            save_history(history_path, past)
+        except (IOError, OSError) as e:
+            log.warning("Could not save collection history: %s", str(e))
 
     collect_errors = _parse_broker_exceptions(broker, EXCEPTIONS_TO_REPORT)
 
     cleaner.generate_report(archive_name) if cleaner else None
 
+    if sink is not None:
+        return sink.close(), collect_errors
     if compress:
         return create_archive(output_path), collect_errors
     return output_path, collect_errors
@@ -323,6 +531,9 @@ def main():
     p.add_argument("-v", "--verbose", help="Verbose output.", action="store_true")
     p.add_argument("-d", "--debug", help="Debug output.", action="store_true")
     p.add_argument("-c", "--compress", help="Compress", action="store_true")
+    p.add_argument("-s", "--stream", help="Compress while collecting. Implies -c.", action="store_true")
+    p.add_argument("-p", "--profile", help="Record the resources used by each spec.", action="store_true")
+    p.add_argument("--history", help="File to keep spec durations across runs.")
     args = p.parse_args(args=collect_args)
 
     level = logging.WARNING
@@ -340,7 +551,10 @@ def main():
         manifest=args.manifest,
         tmp_path=out_path,
         archive_name=generate_archive_name(),
-        compress=args.compress,
+        compress=args.compress or args.stream,
+        profile=args.profile,
+        history=args.history,
+        stream=args.stream,
     )
     print(archive)
 
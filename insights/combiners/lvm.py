@@ -89,9 +89,12 @@ def get_shared_data(component):
         list: List of component data.
     """
     if component:
-        return (copy.deepcopy(component.data)
+        rows = (component.data
                 if 'content' not in component.data
-                else copy.deepcopy(component.data['content']))
+                else component.data['content'])
+        # The values are strings, so copying the rows is enough to keep
+        # the data of the parsers unchanged.
+        return [copy.copy(row) for row in rows]
     else:
         return []
 
@@ -208,8 +211,6 @@ class Lvm(object):
             avoids the case where logical volume names are the same
             across volume groups."""
 
-        self.logical_volumes = set_defaults(self.logical_volumes)
-
         # Since name is not used as the key we need to create the name list
         self.physical_volume_names = set([p['PV'] for p in self.physical_volumes.values()])
 
@@ -271,7 +272,5 @@ class LvmAll(Lvm):
             avoids the case where logical volume names are the same
             across volume groups."""
 
-        self.logical_volumes = set_defaults(self.logical_volumes)
-
         # Since name is not used as the key we need to create the name list
         self.physical_volume_names = set([p['PV'] for p in self.physical_volumes.values()])
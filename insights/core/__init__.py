@@ -375,8 +375,9 @@ class ConfigCombiner(ConfigComponent):
                 for inc in includes:
                     node.children.extend(inc.doc.children)
 
-        # flatten all content from nested includes into a main doc
-        self.doc = Entry(children=flatten(self.main.doc.children, include_finder))
+        # flatten all content from nested includes into a main doc. Rules
+        # query the combined tree many times, so index it by name.
+        self.doc = Entry(children=flatten(self.main.doc.children, include_finder)).use_index()
 
     def find_matches(self, confs, pattern):
         results = [c for c in confs if fnmatch(c.file_path, pattern)]
@@ -757,12 +758,29 @@ class XMLParser(LegacyItemAccess, Parser):
         return self.dom.findall(real_element)
 
 
-class _PatchedSafeLoader(SafeLoader):
-    yaml_implicit_resolvers = SafeLoader.yaml_implicit_resolvers.copy()
-
+def _patch_resolvers(loader):
     # Patch the SafeLoader to allow ``=`` to be resolved as a normal str.
     # See https://github.com/yaml/pyyaml/issues/89 for more info.
-    yaml_implicit_resolvers.pop("=", None)
+    loader.yaml_implicit_resolvers = loader.yaml_implicit_resolvers.copy()
+    loader.yaml_implicit_resolvers.pop("=", None)
+    return loader
+
+
+@_patch_resolvers
+class _PatchedSafeLoader(SafeLoader):
+    """
+    The loader used by :class:`YAMLParser`. It's based on the libyaml
+    ``CSafeLoader`` when PyYAML is built with it.
+    """
+    pass
+
+
+@_patch_resolvers
+class _PatchedPySafeLoader(yaml.SafeLoader):
+    """
+    The pure python equivalent of :class:`_PatchedSafeLoader`.
+    """
+    pass
 
 
 class YAMLParser(Parser, LegacyItemAccess):
@@ -782,7 +800,8 @@ class YAMLParser(Parser, LegacyItemAccess):
         try:
             if type(content) is list:
                 ignore_lines = tuple(self.ignore_lines)
-                content = [l for l in content if not l.lstrip().lower().startswith(ignore_lines)]
+                if ignore_lines:
+                    content = [l for l in content if not l.lstrip().lower().startswith(ignore_lines)]
                 self.data = yaml.load('\n'.join(content), Loader=_PatchedSafeLoader)
             else:
                 self.data = yaml.load(content, Loader=_PatchedSafeLoader)
@@ -2,11 +2,16 @@
 
 import logging
 import os
+import queue
+import subprocess
+import tarfile
 import tempfile
+import threading
 
 from contextlib import contextmanager
 
-from insights.core.exceptions import InvalidContentType
+from insights.core.exceptions import CalledProcessError, InvalidContentType
+from insights.core.spec_factory import SAFE_ENV
 from insights.util import fs, subproc, which
 from insights.util.content_type import from_file as content_type_from_file
 
@@ -66,6 +71,176 @@ class TarExtractor(object):
         return self
 
 
+class TarWriter(object):
+    """
+    Writes a directory to a compressed tar archive while files are still
+    being created in it, so that compression overlaps with whatever produces
+    them. Files are written to the archive by a thread in the order they are
+    added and then removed from the directory, which bounds the space the
+    uncompressed directory takes. Files must not change once they're added.
+    Files that can't be read are skipped, but a failure while a file is
+    written to the archive leaves it broken, so the archive is removed and
+    the error is raised by :py:meth:`close`.
+
+    The archive is compressed in a separate process, by ``pigz``,
+    ``pbzip2`` or ``xz -T0`` when they are installed since they use every
+    cpu, or by ``gzip`` or ``bzip2``. The python modules are used when none
+    of them are found.
+
+    Args:
+        root (str): The directory to archive. Its basename is the top
+            directory in the archive.
+        compressor (str): One of "gz", "bz2", "xz" or "none".
+        path (str): The archive to write. Defaults to the root with a
+            ".tar.<compressor>" extension.
+    """
+    COMMANDS = {
+        "gz": [["pigz", "-c"], ["gzip", "-c"]],
+        "bz2": [["pbzip2", "-c"], ["bzip2", "-c"]],
+        "xz": [["xz", "-T0", "-c"]],
+        "none": [],
+    }
+
+    def __init__(self, root, compressor="gz", path=None):
+        if compressor not in self.COMMANDS:
+            raise ValueError("Unsupported compressor: %s" % compressor)
+        self.root = root.rstrip(os.sep)
+        ext = "" if compressor == "none" else "." + compressor
+        self.path = path or self.root + ".tar" + ext
+        self._base = os.path.dirname(self.root)
+        self._name = os.path.basename(self.root)
+        self._added = set()
+        self._queue = queue.Queue()
+        self._cmd = None
+        self._proc = None
+        self._error = None
+        self._out = open(self.path, "wb")
+
+        for cmd in self.COMMANDS[compressor]:
+            exe = which(cmd[0], env=SAFE_ENV)
+            if exe:
+                self._cmd = [exe] + cmd[1:]
+                self._proc = subprocess.Popen(self._cmd, stdin=subprocess.PIPE, stdout=self._out, env=SAFE_ENV)
+                self._tar = tarfile.open(fileobj=self._proc.stdin, mode="w|")
+                break
+        else:
+            mode = "w|" if compressor == "none" else "w|" + compressor
+            self._tar = tarfile.open(fileobj=self._out, mode=mode)
+
+        self._thread = threading.Thread(target=self._write, name="insights-tar-writer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _add(self, path):
+        rel = os.path.relpath(path, self._base)
+        if rel in self._added:
+            return False
+        if rel != self._name and not rel.startswith(self._name + os.sep):
+            return False
+        parent = os.path.dirname(path)
+        if parent != self._base:
+            self._add(parent)
+        try:
+            info = self._tar.gettarinfo(path, arcname=rel)
+            f = open(path, "rb") if info is not None and info.isreg() else None
+        except (IOError, OSError) as e:
+            logger.debug("Could not add %s to %s: %s", path, self.path, str(e))
+            return False
+        if info is None:
+            logger.debug("Could not add %s to %s: unsupported type", path, self.path)
+            return False
+        try:
+            self._tar.addfile(info, f)
+        finally:
+            if f is not None:
+                f.close()
+        self._added.add(rel)
+        return True
+
+    def _write(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self._error is not None:
+                continue
+            path, remove = item
+            try:
+                added = self._add(path)
+            except Exception as e:
+                self._error = e
+                continue
+            if added and remove and not os.path.isdir(path):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.debug("Could not remove %s: %s", path, str(e))
+
+    def add(self, path, remove=True):
+        """
+        Queues the file at path to be added to the archive along with the
+        directories above it, and removed unless `remove` is False. Paths
+        outside the root and paths already added are skipped.
+        """
+        self._queue.put((path, remove))
+
+    def close(self):
+        """
+        Adds everything left under the root, finishes the archive and removes
+        the root. Returns the path of the archive. If a file couldn't be
+        written to the archive, the archive is removed and the error raised.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            if self._error is not None:
+                raise self._error
+            for dirpath, dirnames, filenames in os.walk(self.root):
+                self._add(dirpath)
+                for name in sorted(dirnames + filenames):
+                    self._add(os.path.join(dirpath, name))
+            self._tar.close()
+        except Exception:
+            self._discard()
+            raise
+        rc = 0
+        if self._proc is not None:
+            self._proc.stdin.close()
+            rc = self._proc.wait()
+        self._out.close()
+        if rc:
+            raise CalledProcessError(rc, self._cmd)
+        fs.remove(self.root)
+        return self.path
+
+    def abort(self):
+        """
+        Stops writing the archive and removes it. The root is left as it is.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        self._discard()
+
+    def _discard(self):
+        if self._proc is not None:
+            self._proc.kill()
+            try:
+                self._proc.stdin.close()
+            except (IOError, OSError):
+                pass
+            self._proc.wait()
+        self._out.close()
+        try:
+            # only marks the tar stream closed, there's nowhere to write to
+            self._tar.close()
+        except (IOError, OSError, ValueError):
+            pass
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            logger.debug("Could not remove %s: %s", self.path, str(e))
+
+
 class Extraction(object):
     def __init__(self, tmp_dir, content_type):
         self.tmp_dir = tmp_dir
@@ -1,13 +1,16 @@
 #!/usr/bin/env python
 import itertools
 import os
-from collections import defaultdict
+from array import array
+from collections import OrderedDict, defaultdict
 
+import numpy as np
 import pandas as pd
 
 from ansible.parsing.dataloader import DataLoader
 from ansible.inventory.manager import InventoryManager
 
+from insights import get_pool
 from insights.core import dr, plugins
 from insights.core.archives import extract
 from insights.core.hydration import create_context
@@ -16,6 +19,12 @@ from insights.specs import Specs
 
 ID_GENERATOR = itertools.count()
 
+MAX_WORKERS = 4
+"""
+The number of archives evaluated at once by :func:`process_cluster` in
+parallel. Each holds its extracted files and broker until it's evaluated.
+"""
+
 
 class ClusterMeta(dict):
     def __init__(self, num_members, kwargs):
@@ -46,50 +55,140 @@ def attach_machine_id(result, mid):
     return result
 
 
-def process_archives(graph, archives):
-    for archive in archives:
-        if os.path.isfile(archive):
-            with extract(archive) as ex:
-                ctx = create_context(ex.tmp_dir)
-                broker = dr.Broker()
-                broker[ctx.__class__] = ctx
-                yield dr.run(broker=broker)
-        else:
-            ctx = create_context(archive)
+class FactTable(object):
+    """
+    The rows of a fact for all the hosts of a cluster, kept by column. A
+    column of ints or floats is kept in an array of machine values until a
+    value of another type is added to it, so the facts of many hosts take
+    much less memory than lists of dicts would. Rows missing a column get
+    None for it.
+    """
+
+    TYPECODES = {int: "q", float: "d"}
+
+    def __init__(self):
+        self.columns = OrderedDict()
+        self.num_rows = 0
+
+    def _new_column(self, value):
+        typecode = self.TYPECODES.get(type(value))
+        if typecode and not self.num_rows:
+            return array(typecode)
+        return [None] * self.num_rows
+
+    def append(self, row):
+        for name, value in row.items():
+            col = self.columns.get(name)
+            if col is None:
+                col = self.columns[name] = self._new_column(value)
+            if isinstance(col, array):
+                if type(value) in self.TYPECODES and (type(value) is int or col.typecode == "d"):
+                    try:
+                        col.append(value)
+                        continue
+                    except OverflowError:
+                        pass
+                col = self.columns[name] = col.tolist()
+            col.append(value)
+        self.num_rows += 1
+        for name, col in self.columns.items():
+            if len(col) < self.num_rows:
+                if isinstance(col, array):
+                    col = self.columns[name] = col.tolist()
+                col.append(None)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return self.num_rows
+
+    def to_frame(self):
+        """
+        Returns a DataFrame with the columns of the table.
+        """
+        return pd.DataFrame(OrderedDict(
+            (name, np.asarray(col) if isinstance(col, array) else col)
+            for name, col in self.columns.items()
+        ))
+
+
+def process_archive(graph, archive):
+    """
+    Returns the broker of the evaluation of the graph against an archive
+    file or directory.
+    """
+    if os.path.isfile(archive):
+        with extract(archive) as ex:
+            ctx = create_context(ex.tmp_dir)
             broker = dr.Broker()
             broker[ctx.__class__] = ctx
-            yield dr.run(graph, broker=broker)
+            return dr.run(graph, broker=broker)
+    ctx = create_context(archive)
+    broker = dr.Broker()
+    broker[ctx.__class__] = ctx
+    return dr.run(graph, broker=broker)
+
+
+def process_archives(graph, archives):
+    for archive in archives:
+        yield process_archive(graph, archive)
+
+
+def get_facts(broker):
+    """
+    Returns the rows of each fact of a host broker, with its machine id.
+    """
+    mid = broker[machine_id]
+    facts = {}
+    for k, v in broker.get_by_type(plugins.fact).items():
+        r = attach_machine_id(v, mid)
+        facts[k] = r if isinstance(r, list) else [r]
+    return facts
+
+
+def archive_facts(graph, archive):
+    """
+    Returns the facts of an archive. The broker is released once they're
+    extracted.
+    """
+    return get_facts(process_archive(graph, archive))
 
 
 def extract_facts(brokers):
-    results = defaultdict(list)
+    results = defaultdict(FactTable)
     for b in brokers:
-        mid = b[machine_id]
-        for k, v in b.get_by_type(plugins.fact).items():
-            r = attach_machine_id(v, mid)
-            if isinstance(r, list):
-                results[k].extend(r)
-            else:
-                results[k].append(r)
+        for k, rows in get_facts(b).items():
+            results[k].extend(rows)
     return results
 
 
 def process_facts(facts, meta, broker, cluster_graph):
     broker[ClusterMeta] = meta
     for k, v in facts.items():
-        broker[k] = pd.DataFrame(v)
+        broker[k] = v.to_frame() if isinstance(v, FactTable) else pd.DataFrame(v)
     return dr.run(cluster_graph, broker=broker)
 
 
-def process_cluster(graph, archives, broker, inventory=None):
+def process_cluster(graph, archives, broker, inventory=None, parallel=False):
     host_graph = dict((k, v) for k, v in graph.items() if k in dr.COMPONENTS[dr.GROUPS.single])
     host_graph[machine_id] = dr.DELEGATES[machine_id].dependencies
     cluster_graph = dict((k, v) for k, v in graph.items() if k not in host_graph)
 
     inventory = parse_inventory(inventory) if inventory else {}
 
-    brokers = process_archives(host_graph, archives)
-    facts = extract_facts(brokers)
+    # the facts of each archive are added to the tables as soon as it's
+    # evaluated, and its broker is released
+    facts = defaultdict(FactTable)
+    with get_pool(parallel, "insights-cluster-pool", {"max_workers": MAX_WORKERS}) as pool:
+        if pool:
+            results = pool.map(lambda a: archive_facts(host_graph, a), archives)
+        else:
+            results = (archive_facts(host_graph, a) for a in archives)
+        for archive_result in results:
+            for k, rows in archive_result.items():
+                facts[k].extend(rows)
     meta = ClusterMeta(len(archives), inventory)
 
     return process_facts(facts, meta, broker, cluster_graph)
@@ -711,6 +711,11 @@ class ComponentType(object):
     group: ``GROUPS.single`` or ``GROUPS.cluster``. Used to organize components
     into "groups" that run together with :func:`insights.core.dr.run`.
     """
+    evictable = True
+    """
+    whether the value of the component can be released from a broker with
+    ``evict`` set once all of its dependents have been evaluated.
+    """
 
     def __init__(self, *deps, **kwargs):
         """
@@ -817,6 +822,57 @@ class ComponentType(object):
         COMPONENTS[group][self.component].add(dep)
 
 
+class LazyTraceback(object):
+    """
+    The traceback of the exception being handled when it's created. The
+    frames are captured without the text of their source lines, and the
+    traceback is formatted the first time it's converted to a string.
+    """
+
+    __slots__ = ("_exc", "_text")
+
+    def __init__(self):
+        self._exc = traceback.TracebackException(*sys.exc_info(), lookup_lines=False)
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = "".join(self._exc.format())
+            self._exc = None
+        return self._text
+
+
+class Tracebacks(dict):
+    """
+    A dictionary of exceptions to their text tracebacks. A
+    :class:`LazyTraceback` is formatted when its value is read.
+
+    Only the methods of the dictionary format them. Code that reads it
+    directly, like ``dict(tracebacks)``, ``{**tracebacks}`` or
+    ``json.dumps``, gets the :class:`LazyTraceback` values, so use
+    :meth:`copy` or ``items`` to get the text of every traceback.
+    """
+
+    def __getitem__(self, ex):
+        tb = dict.__getitem__(self, ex)
+        if isinstance(tb, LazyTraceback):
+            tb = str(tb)
+            dict.__setitem__(self, ex, tb)
+        return tb
+
+    def get(self, ex, default=None):
+        return self[ex] if ex in self else default
+
+    def values(self):
+        return [self[ex] for ex in self]
+
+    def items(self):
+        return [(ex, self[ex]) for ex in self]
+
+    def copy(self):
+        return dict(self.items())
+
+
 class Broker(object):
     """
     The Broker is a fancy dictionary that keeps up with component instances as
@@ -840,23 +896,39 @@ class Broker(object):
             exception except :class:`SkipComponent` during evaluation. The key
             is the component, and the value is a list of exceptions. It's a
             list because some components produce multiple instances.
-        tracebacks (dict): keys are exceptions and values are their text
-            tracebacks.
+        tracebacks (Tracebacks): keys are exceptions and values are their
+            text tracebacks.
         exec_times (dict): component -> float dictionary where values are the
             number of seconds the component took to execute. Calculated using
             :func:`time.time`. For components that produce multiple instances,
             the execution time here is the sum of their individual execution
             times.
         store_skips (bool): Weather to store skips in the broker or not.
+        profiler (Profiler): Records the resources used by each component
+            that's evaluated if set. See :mod:`insights.core.profiling`.
+        evict (bool): Whether to release the value of a component once all of
+            its dependents have been evaluated to save memory. Values of
+            components that aren't ``evictable`` are kept.
+        parse_cache (ParseCache): Reuses the results of parsers for content
+            they parsed before if set. It's shared with the brokers seeded
+            from this one. See :mod:`insights.core.parse_cache`.
+        lazy_tracebacks (bool): Whether to format the tracebacks of exceptions
+            only when they're read from ``tracebacks``. It saves formatting
+            the tracebacks of the many components that are expected to fail.
+            See :meth:`Broker.capture_traceback`.
     """
 
     def __init__(self, seed_broker=None):
         self.instances = dict(seed_broker.instances) if seed_broker else {}
         self.missing_requirements = {}
         self.exceptions = defaultdict(list)
-        self.tracebacks = {}
+        self.tracebacks = Tracebacks()
         self.exec_times = {}
         self.store_skips = False
+        self.profiler = seed_broker.profiler if seed_broker else None
+        self.evict = seed_broker.evict if seed_broker else False
+        self.parse_cache = seed_broker.parse_cache if seed_broker else None
+        self.lazy_tracebacks = seed_broker.lazy_tracebacks if seed_broker else False
 
         self.observers = defaultdict(set)
         if seed_broker is not None:
@@ -915,6 +987,14 @@ class Broker(object):
                     except Exception as e:
                         log.exception(e)
 
+    def capture_traceback(self):
+        """
+        Returns the traceback of the exception being handled to pass to
+        :meth:`add_exception`. It's a :class:`LazyTraceback` if
+        ``lazy_tracebacks`` is set and its text otherwise.
+        """
+        return LazyTraceback() if self.lazy_tracebacks else traceback.format_exc()
+
     def add_exception(self, component, ex, tb=None):
         if isinstance(ex, MissingRequirements):
             self.missing_requirements[component] = ex.requirements
@@ -1047,6 +1127,44 @@ def run_order(graph):
     return toposort_flatten(graph, sort=False)
 
 
+def depth_first_run_order(graph):
+    """
+    Returns components in an order that satisfies their dependency
+    relationships and that evaluates the dependencies of each component
+    that has no dependents just before it. This lets a broker with ``evict``
+    set release values as soon as possible.
+    """
+    dependents = _count_dependents(graph)
+    roots = [c for c in graph if not dependents.get(c)]
+    order = []
+    seen = set()
+    active = set()
+    for root in roots:
+        if root in seen:
+            continue
+        seen.add(root)
+        active.add(root)
+        stack = [(root, iter(graph.get(root, ())))]
+        while stack:
+            node, deps = stack[-1]
+            for dep in deps:
+                if dep in active:
+                    # leave cycles to toposort to report
+                    return run_order(graph)
+                if dep not in seen:
+                    seen.add(dep)
+                    active.add(dep)
+                    stack.append((dep, iter(graph.get(dep, ()))))
+                    break
+            else:
+                stack.pop()
+                active.remove(node)
+                order.append(node)
+    if any(c not in seen for c in graph):
+        return run_order(graph)
+    return order
+
+
 def determine_components(components):
     if isinstance(components, dict):
         return components
@@ -1070,6 +1188,40 @@ def determine_components(components):
 _determine_components = determine_components
 
 
+def _count_dependents(components):
+    counts = defaultdict(int)
+    for deps in components.values():
+        for dep in deps:
+            counts[dep] += 1
+    return counts
+
+
+def _release_dependencies(component, components, dependents, evaluated, broker):
+    """
+    Releases the values of the dependencies of component that have no other
+    dependents left to evaluate in the graph.
+
+    Only the values of components evaluated in this run are removed from the
+    broker, since values it was seeded with, like contexts, may be shared
+    with other graphs. Content providers of both that can load their content
+    again unload it.
+    """
+    for dep in components.get(component, ()):
+        dependents[dep] -= 1
+        if dependents[dep]:
+            continue
+        delegate = DELEGATES.get(dep)
+        if delegate is None or not delegate.evictable or dep not in broker:
+            continue
+        value = broker[dep]
+        for v in value if isinstance(value, list) else [value]:
+            unload = getattr(v, "unload", None)
+            if callable(unload):
+                unload()
+        if dep in evaluated:
+            del broker.instances[dep]
+
+
 def run_components(ordered_components, components, broker):
     """
     Runs a list of preordered components using the provided broker.
@@ -1077,8 +1229,12 @@ def run_components(ordered_components, components, broker):
     This function allows callers to order components themselves and cache the
     result so they don't incur the toposort overhead on every run.
     """
+    profiler = broker.profiler
+    dependents = _count_dependents(components) if broker.evict else None
+    evaluated = set()
     for component in ordered_components:
         start = time.time()
+        snapshots = None
         try:
             if (
                 component not in broker
@@ -1087,12 +1243,15 @@ def run_components(ordered_components, components, broker):
                 and is_enabled(component)
             ):
                 log.info("Trying %s" % get_name(component))
+                if profiler is not None:
+                    snapshots = profiler.start()
                 result = DELEGATES[component].process(broker)
                 broker[component] = result
+                evaluated.add(component)
         except BlacklistedSpec as bs:
             for x in get_registry_points(component):
                 BLACKLISTED_SPECS.append(str(x).split('.')[-1])
-            broker.add_exception(component, bs, traceback.format_exc())
+            broker.add_exception(component, bs, broker.capture_traceback())
         except MissingRequirements as mr:
             if log.isEnabledFor(logging.DEBUG):
                 name = get_name(component)
@@ -1102,18 +1261,24 @@ def run_components(ordered_components, components, broker):
         except SkipComponent as sc:
             if broker.store_skips:
                 log.debug(sc)
-                broker.add_exception(component, sc, traceback.format_exc())
+                broker.add_exception(component, sc, broker.capture_traceback())
             else:
                 pass
         except Exception as ex:
             log.debug(ex)
-            tb = traceback.format_exc()
+            tb = broker.capture_traceback()
             broker.add_exception(component, ex, tb)
             for reg_spec in get_registry_points(component):
                 broker.add_exception(reg_spec, ex, tb)
         finally:
             broker.exec_times[component] = time.time() - start
             broker.fire_observers(component)
+            if snapshots is not None:
+                # include the observers since collected content is loaded
+                # lazily when it's persisted
+                profiler.stop(component, snapshots)
+            if dependents is not None:
+                _release_dependencies(component, components, dependents, evaluated, broker)
 
     return broker
 
@@ -1145,7 +1310,8 @@ def run(components=None, broker=None):
             if comp in broker:
                 for dep in components[comp]:
                     components.pop(dep, None)
-    return run_components(run_order(components), components, broker)
+    order = depth_first_run_order(components) if broker.evict else run_order(components)
+    return run_components(order, components, broker)
 
 
 def generate_incremental(components=None, broker=None):
@@ -1178,10 +1344,30 @@ def run_incremental(components=None, broker=None):
         yield run(graph, broker=_broker)
 
 
-def run_all(components=None, broker=None, pool=None):
+def run_all(components=None, broker=None, pool=None, weights=None):
+    """
+    Executes all disjoint subgraphs of the components, in parallel if a pool
+    is given.
+
+    Keyword Args:
+        components: See :func:`run`.
+        broker (Broker): See :func:`run_incremental`.
+        pool (Executor): Optional pool in which to run the subgraphs.
+        weights (dict): Optional expected durations of components. The
+            subgraphs expected to take longest are submitted to the pool first.
+    Returns:
+        list: The brokers used to evaluate each subgraph.
+    """
     if pool:
         futures = []
-        for graph, _broker in generate_incremental(components, broker):
+        graphs = generate_incremental(components, broker)
+        if weights:
+            graphs = sorted(
+                graphs,
+                key=lambda g: sum(weights.get(c, 0) for c in g[0]),
+                reverse=True,
+            )
+        for graph, _broker in graphs:
             futures.append(pool.submit(run, graph, _broker))
         return [f.result() for f in futures]
     else:
@@ -1,5 +1,7 @@
 import logging
 import sys
+import threading
+import time
 
 from collections import defaultdict
 from datetime import datetime, timezone
@@ -118,6 +120,24 @@ class SingleEvaluator(Evaluator):
 
         return r
 
+    def make_result(self, plugin, r):
+        """
+        Returns the entry of the response for the result of a rule.
+        """
+        response_id = "%s_id" % r.response_type
+        key = r.get_key()
+        return self.format_result(
+            {
+                response_id: "{0}|{1}".format(get_simple_module_name(plugin), key),
+                "component": dr.get_name(plugin),
+                "type": r["type"],
+                "key": key,
+                "details": r,
+                "tags": list(dr.get_tags(plugin)),
+                "links": dr.get_delegate(plugin).links or {},
+            }
+        )
+
     def handle_result(self, plugin, r):
         type_ = r["type"]
 
@@ -128,21 +148,81 @@ class SingleEvaluator(Evaluator):
         elif type_ == "metadata_key":
             self.metadata_keys[r.get_key()] = r["value"]
         else:
-            response_id = "%s_id" % r.response_type
-            key = r.get_key()
-            self.results[type_].append(
-                self.format_result(
-                    {
-                        response_id: "{0}|{1}".format(get_simple_module_name(plugin), key),
-                        "component": dr.get_name(plugin),
-                        "type": type_,
-                        "key": key,
-                        "details": r,
-                        "tags": list(dr.get_tags(plugin)),
-                        "links": dr.get_delegate(plugin).links or {},
-                    }
-                )
-            )
+            self.results[type_].append(self.make_result(plugin, r))
+
+
+class StreamingEvaluator(SingleEvaluator):
+    """
+    A :class:`SingleEvaluator` that writes the result of each rule to the
+    stream once the rule is evaluated instead of keeping it for the response.
+    Only the metadata is kept. It's written last, in the response without
+    the results.
+
+    Subclasses implement :meth:`dump` to serialize a result or the response.
+    Writes are buffered, and the buffer is written and the stream flushed
+    once it has ``buffer_size`` characters or ``flush_interval`` seconds
+    have passed since the last flush, so results can be read while the
+    evaluation runs.
+    """
+
+    buffer_size = 64 * 1024
+    flush_interval = 1.0
+
+    def __init__(self, broker=None, stream=sys.stdout, incremental=False):
+        super(StreamingEvaluator, self).__init__(broker, stream=stream, incremental=incremental)
+        self._buffer = []
+        self._buffered = 0
+        self._flushed = time.time()
+        self._lock = threading.Lock()
+
+    def dump(self, obj):
+        """
+        Returns the text of a result or of the response.
+        """
+        raise NotImplementedError()
+
+    def is_shown(self, type_):
+        """
+        Whether to write the results of the given type.
+        """
+        return True
+
+    def write(self, obj):
+        text = self.dump(obj)
+        with self._lock:
+            self._buffer.append(text)
+            self._buffered += len(text)
+            if self._buffered >= self.buffer_size or time.time() - self._flushed >= self.flush_interval:
+                self.flush()
+
+    def flush(self):
+        self.stream.write("".join(self._buffer))
+        self.stream.flush()
+        self._buffer = []
+        self._buffered = 0
+        self._flushed = time.time()
+
+    def handle_result(self, plugin, r):
+        type_ = r["type"]
+
+        if type_ == "metadata":
+            self.append_metadata(r)
+        elif type_ == "metadata_key":
+            self.metadata_keys[r.get_key()] = r["value"]
+        elif self.is_shown(type_):
+            self.write(r if type_ == "skip" else self.make_result(plugin, r))
+
+    def get_response(self):
+        r = super(StreamingEvaluator, self).get_response()
+        # the results were written already
+        for k in ["reports", "fingerprints", "skips"] + list(self.results):
+            r.pop(k, None)
+        return r
+
+    def postprocess(self):
+        self.write(self.get_response())
+        with self._lock:
+            self.flush()
 
 
 class InsightsEvaluator(SingleEvaluator):
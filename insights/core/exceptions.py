@@ -38,6 +38,15 @@ class CalledProcessError(Exception):
         return '<{}({}, {!r}, {!r})>'.format(name, rc, cmd, output)
 
 
+class CalledProcessTimeout(CalledProcessError):
+    """
+    Raised if a command doesn't complete before its timeout. The command is
+    stopped with the signal given for the timeout.
+    """
+
+    pass
+
+
 class InvalidArchive(Exception):
     """
     Raised when execution context initialization fails for a given archive (path).
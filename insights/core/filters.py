@@ -35,8 +35,15 @@ for those classes.
 Filtering can be disabled globally by setting the environment variable
 ``INSIGHTS_FILTERS_ENABLED=False``. This means that no datasources will be
 filtered even if filters are defined for them.
+
+The filters of a release can also be compiled, see :func:`dumps_compiled`.
+The compiled filters hold the filters of every datasource with those of its
+dependents already merged, in JSON, so loading them needs neither a YAML
+parser nor a walk of the dependency graph for each datasource.
 """
 
+import hashlib
+import json
 import os
 import pkgutil
 import yaml as ser
@@ -89,8 +96,8 @@ def add_filter(component, patterns, max_match=MAX_MATCH):
         return dict((k, none_max(da.get(k), db.get(k))) for k in set(da.keys()).union(db.keys()))
 
     def inner(comp, patterns):
-        if comp in _CACHE:
-            del _CACHE[comp]
+        # the cached filters of a datasource include those of its dependents
+        _CACHE.clear()
 
         if not isinstance(patterns, (str, list, set)):
             raise TypeError("Filter patterns must be of type string, list, or set.")
@@ -211,8 +218,10 @@ def apply_filters(target, lines):
 
 
 _filename = ".".join(["filters", ser.__name__])
+_compiled_filename = "filters.json"
 _dumps = ser.dump
 _loads = ser.safe_load
+COMPILED_VERSION = 1
 
 
 def loads(string):
@@ -222,17 +231,67 @@ def loads(string):
         FILTERS[dr.get_component(k) or k] = v
 
 
+def _digest(data):
+    if not isinstance(data, bytes):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def loads_compiled(string):
+    """
+    Loads the compiled filters given a string. See :func:`dumps_compiled`.
+    """
+    _load_compiled(json.loads(string))
+
+
+def _load_compiled(d):
+    if d.get("version") != COMPILED_VERSION:
+        raise ValueError("Unsupported version of compiled filters: %s" % d.get("version"))
+    filters, datasources = d["filters"], d["datasources"]
+    for k, v in filters.items():
+        FILTERS[dr.get_component(k) or k] = v
+    if ENABLED:
+        for k, v in datasources.items():
+            comp = dr.get_component(k)
+            if comp is not None:
+                _CACHE[comp] = v
+
+
+def _load_default():
+    try:
+        data = pkgutil.get_data(insights.__name__, _filename)
+    except (IOError, OSError):
+        data = None
+    try:
+        compiled = pkgutil.get_data(insights.__name__, _compiled_filename)
+    except (IOError, OSError):
+        compiled = None
+    if compiled:
+        # the compiled filters are only used if they were made along with
+        # the filters file, and the filters file is loaded if they're broken
+        try:
+            d = json.loads(compiled)
+            if data is None or d.get("source") == _digest(data):
+                return _load_compiled(d)
+        except (ValueError, KeyError):
+            if data is None:
+                raise
+    if data is None:
+        raise IOError("No filters file: %s" % _filename)
+    return loads(data) if data else None
+
+
 def load(stream=None):
     """
     Loads filters from a stream, normally an open file. If one is
     not passed, filters are loaded from a default location within
-    the project.
+    the project, from the compiled filters if they were made from the
+    filters file there.
     """
     if stream:
         loads(stream.read())
     else:
-        data = pkgutil.get_data(insights.__name__, _filename)
-        return loads(data) if data else None
+        return _load_default()
 
 
 def dumps():
@@ -243,6 +302,43 @@ def dumps():
     return _dumps(d)
 
 
+def dumps_compiled():
+    """
+    Returns the compiled filters: a JSON document with the ``FILTERS``
+    dictionary as :func:`dumps` has it and, for every datasource that's
+    filtered, the filters returned by :func:`get_filters` with their max
+    matches. It also has the digest of :func:`dumps`, so the compiled
+    filters are only used with the filters file they were made with.
+    """
+    ds = {}
+    for comp in dr.DELEGATES:
+        if plugins.is_datasource(comp):
+            f = get_filters(comp, True)
+            if f:
+                ds[dr.get_name(comp)] = dict(sorted(f.items()))
+    d = {
+        "version": COMPILED_VERSION,
+        "source": _digest(dumps()),
+        "filters": dict((dr.get_name(k), dict(sorted(v.items()))) for k, v in FILTERS.items()),
+        "datasources": ds,
+    }
+    return json.dumps(d, sort_keys=True)
+
+
+def dump_compiled(stream=None):
+    """
+    Dumps the compiled filters to a stream, normally an open file. If none
+    is passed, they're dumped to a default location within the project,
+    next to the filters file.
+    """
+    if stream:
+        stream.write(dumps_compiled())
+    else:
+        path = os.path.join(os.path.dirname(insights.__file__), _compiled_filename)
+        with open(path, "w") as f:
+            f.write(dumps_compiled())
+
+
 def dump(stream=None):
     """
     Dumps a string representation of `FILTERS` to a stream, normally an
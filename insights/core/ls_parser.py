@@ -148,40 +148,194 @@ def parse_rhel8_selinux(parts):
     return result
 
 
+def _name_of(parts, rhel8):
+    """
+    Returns the name of the entry in the parts of an ls line split like in
+    :py:func:`parse_entry` without parsing the rest of the line. The numbers
+    in the line are converted, so that a malformed line raises the same
+    ValueError as when it's parsed.
+    """
+    if not parts[1][0].isdigit():
+        return parse_path(parts[-1])[0]
+    int(parts[1])
+    last = parts[4]
+    if rhel8:
+        last = last.split(None, 1)[1]
+        device = "," in last
+    else:
+        device = "," in last[:4]
+    if device:
+        major, minor, rest = last.split(None, 2)
+        int(major.rstrip(","))
+        int(minor)
+    else:
+        size, rest = last.split(None, 1)
+        int(size)
+    return parse_path(rest[13:])[0]
+
+
+def parse_entry(line, rhel8, directory):
+    """
+    Parse an ls output line into a dictionary.
+
+    Args:
+        line (str): The ls output line.
+        rhel8 (bool): Whether lines with a link count have a RHEL8 selinux
+            context.
+        directory (str): The name of the directory of the entry.
+
+    Returns:
+        A dict containing type, perms and dir, and the fields described in
+        :py:func:`parse_non_selinux`, :py:func:`parse_selinux` or
+        :py:func:`parse_rhel8_selinux` depending on the format of the line.
+    """
+    # we can't split(None, 5) here b/c rhel 6/7 selinux lines only have
+    # 4 parts before the path, and the path itself could contain spaces.
+    parts = line.split(None, 4)
+    perms = parts[0]
+    entry = {"type": perms[0], "perms": perms[1:]}
+    if parts[1][0].isdigit():
+        if rhel8:
+            entry.update(parse_rhel8_selinux(parts[1:]))
+        else:
+            entry.update(parse_non_selinux(parts[1:]))
+    else:
+        entry.update(parse_selinux(parts[1:]))
+    entry["dir"] = directory
+    return entry
+
+
+def _parsed_first(method):
+    """
+    Wraps a dict method of :py:class:`Entries` that needs all the entries.
+    """
+    def _f(self, *args, **kwargs):
+        self._parse_all()
+        return method(self, *args, **kwargs)
+    _f.__name__ = method.__name__
+    _f.__doc__ = method.__doc__
+    return _f
+
+
+class Entries(dict):
+    """
+    The entries of a :py:class:`Directory` by name. It keeps the lines of
+    the entries and parses each of them the first time it's looked up, so
+    that large listings only pay for the entries that are used. Everything
+    else that needs all the values, like ``items``, ``copy``, comparisons,
+    changes or ``json.dumps``, parses the remaining entries first.
+
+    Args:
+        directory (str): The name of the directory.
+        lines (list): The entry lines of the directory.
+        index (dict): The position in ``lines`` of each entry by name.
+        rhel8 (bool): Whether lines with a link count have a RHEL8 selinux
+            context.
+    """
+
+    def __init__(self, directory, lines, index, rhel8):
+        super(Entries, self).__init__()
+        self.directory = directory
+        self.lines = lines
+        self.index = index
+        self.rhel8 = rhel8
+        # C code like the json encoder checks the size of a dict before it
+        # asks a subclass for its items, so it must not look empty.
+        for name in index:
+            self[name]
+            break
+
+    def __missing__(self, name):
+        if self.index is None or name not in self.index:
+            raise KeyError(name)
+        entry = parse_entry(self.lines[self.index[name]], self.rhel8, self.directory)
+        dict.__setitem__(self, name, entry)
+        return entry
+
+    def _parse_all(self):
+        """
+        Parses the entries that haven't been looked up yet, after which it's
+        a plain dict of the entries in the order of the lines.
+        """
+        if self.index is not None:
+            entries = [(name, self[name]) for name in self.index]
+            dict.clear(self)
+            dict.update(self, entries)
+            self.lines = self.index = None
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def __contains__(self, name):
+        return dict.__contains__(self, name) if self.index is None else name in self.index
+
+    def __iter__(self):
+        return dict.__iter__(self) if self.index is None else iter(self.index)
+
+    def __len__(self):
+        return dict.__len__(self) if self.index is None else len(self.index)
+
+    def keys(self):
+        return dict.keys(self) if self.index is None else self.index.keys()
+
+    def __eq__(self, other):
+        self._parse_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        self._parse_all()
+        return dict.__ne__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._parse_all()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        self._parse_all()
+        return (dict, (dict(dict.items(self)),))
+
+    items = _parsed_first(dict.items)
+    values = _parsed_first(dict.values)
+    copy = _parsed_first(dict.copy)
+    __setitem__ = _parsed_first(dict.__setitem__)
+    __delitem__ = _parsed_first(dict.__delitem__)
+    pop = _parsed_first(dict.pop)
+    popitem = _parsed_first(dict.popitem)
+    setdefault = _parsed_first(dict.setdefault)
+    update = _parsed_first(dict.update)
+    clear = _parsed_first(dict.clear)
+
+
 class Directory(dict):
+    """
+    A stanza of ls output, with the name, total, entries, and the names of
+    the files, dirs and specials of the directory. The format of the lines
+    is detected once for the stanza and the entries are parsed on first
+    access, see :py:class:`Entries`.
+    """
+
     def __init__(self, name, total, body):
         dirs = []
-        ents = {}
         files = []
         specials = []
-        for line in body:
-            # we can't split(None, 5) here b/c rhel 6/7 selinux lines only have
-            # 4 parts before the path, and the path itself could contain
-            # spaces. Unfortunately, this means we have to split the line again
-            # below
+        index = {}
+        rhel8 = None
+        for i, line in enumerate(body):
             parts = line.split(None, 4)
-            perms = parts[0]
-            typ = perms[0]
-            entry = {"type": typ, "perms": perms[1:]}
-            if parts[1][0].isdigit():
+            if rhel8 is None and parts[1][0].isdigit():
                 # We have to split the line again to see if this is a RHEL8
                 # selinux stanza. This assumes that the context section will
                 # always have at least two pieces separated by ':'.
                 # '?' as the whole RHEL8 security context is also acceptable.
                 rhel8_selinux_ctx = line.split()[4].strip()
-                if ":" in rhel8_selinux_ctx or '?' == rhel8_selinux_ctx:
-                    rest = parse_rhel8_selinux(parts[1:])
-                else:
-                    rest = parse_non_selinux(parts[1:])
-            else:
-                rest = parse_selinux(parts[1:])
-
-            # Update our entry and put it into the correct buckets
-            # based on its type.
-            entry.update(rest)
-            entry["dir"] = name
-            nm = entry["name"]
-            ents[nm] = entry
+                rhel8 = ":" in rhel8_selinux_ctx or '?' == rhel8_selinux_ctx
+
+            # Put the name into the correct buckets based on its type.
+            typ = parts[0][0]
+            nm = _name_of(parts, rhel8)
+            index[nm] = i
             if typ not in "bcd":
                 files.append(nm)
             elif typ == "d":
@@ -192,7 +346,7 @@ class Directory(dict):
         super(Directory, self).__init__(
             {
                 "dirs": dirs,
-                "entries": ents,
+                "entries": Entries(name, body, index, rhel8),
                 "files": files,
                 "name": name,
                 "specials": specials,
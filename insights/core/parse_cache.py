@@ -0,0 +1,173 @@
+"""
+Parse Result Cache
+==================
+
+A cache of parser results that can be shared by the brokers of many
+archives, so that content seen before isn't parsed again. It's meant for
+services that analyze many archives in one process.
+
+Set the :py:attr:`insights.core.dr.Broker.parse_cache` of a broker to a
+:py:class:`ParseCache` to use it. A parser result is cached by the name of
+its class, the version of the cache and the digest of the relative path,
+arguments and content of the input, so two inputs share a result only if a
+parser can't tell them apart. Parsers have no version of their own, so the
+version of the cache should change with the code of the parsers.
+
+Cached results are shared by every broker using the cache, so the cache only
+suits parsers whose results aren't changed after parsing. A combiner or rule
+that changes an attribute of a parser result would change it for every later
+archive too. When that can't be ruled out, create the cache with ``copy`` set
+so that every broker gets its own copy of a result, at the cost of copying
+it. Parsers that stream their content aren't cached since that would mean
+loading it in memory to compute its digest.
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+
+from collections import OrderedDict
+
+from insights.core import StreamParser, dr
+from insights.core.spec_factory import ContentProvider
+from insights.util import fs
+
+logger = logging.getLogger(__name__)
+
+
+class ParseCache(object):
+    """
+    Class to keep parser results in memory, least recently used first out,
+    and optionally on disk.
+
+    Args:
+        maxsize (int): The number of results kept in memory.
+        path (str): The directory of an optional on-disk store of the
+            results. It's created if it doesn't exist.
+        version (str): Identifies the code of the parsers, e.g. the version
+            of insights-core and the plugins. Results cached by another
+            version are never used. It's required with a `path`, since the
+            results on disk outlive the code that parsed them.
+
+    Raises:
+        ValueError: If there's a `path` but no `version`.
+        copy (bool): Whether :py:meth:`parse` returns a deep copy of each
+            result instead of the result shared with other brokers.
+    """
+
+    def __init__(self, maxsize=1024, path=None, version=None, copy=False):
+        if path and version is None:
+            raise ValueError("A version is required to cache parser results on disk")
+        self.maxsize = maxsize
+        self.path = path
+        self.version = version
+        self.copy = copy
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, component, ctx):
+        """
+        Returns the key for the result of the parser component for the
+        context, or None if the result can't be cached.
+        """
+        if not isinstance(ctx, ContentProvider):
+            return None
+        if isinstance(component, type) and issubclass(component, StreamParser):
+            return None
+        content = ctx.content
+        if not isinstance(content, list):
+            return None
+        sha = hashlib.sha256()
+        last_run = getattr(ctx, "last_client_run", None)
+        head = [
+            self.version,
+            dr.get_name(component),
+            ctx.relative_path,
+            getattr(ctx, "args", None),
+            str(last_run) if last_run is not None else None,
+        ]
+        try:
+            sha.update(json.dumps(head).encode("utf-8"))
+            for line in content:
+                sha.update(b"\n")
+                sha.update(line.encode("utf-8", "surrogateescape"))
+        except (TypeError, AttributeError, ValueError):
+            return None
+        return sha.hexdigest()
+
+    def _object_path(self, key):
+        return os.path.join(self.path, key[:2], key)
+
+    def get(self, key):
+        """
+        Returns the result cached for the key or None.
+        """
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return self._results[key]
+        if self.path:
+            try:
+                with open(self._object_path(key), "rb") as f:
+                    result = pickle.load(f)
+                self._remember(key, result)
+                with self._lock:
+                    self.hits += 1
+                return result
+            except (IOError, OSError):
+                pass
+            except Exception as e:
+                logger.debug("Could not load %s from the parse cache: %s", key, str(e))
+        with self._lock:
+            self.misses += 1
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def put(self, key, result):
+        """
+        Caches the result for the key in memory and, if there's a path, on
+        disk. Results that can't be pickled are only kept in memory.
+        """
+        self._remember(key, result)
+        if not self.path:
+            return
+        dst = self._object_path(key)
+        if os.path.exists(dst):
+            return
+        try:
+            data = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+            fs.ensure_path(os.path.dirname(dst), mode=0o700)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dst))
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.rename(tmp, dst)
+        except Exception as e:
+            logger.debug("Could not add %s to the parse cache: %s", key, str(e))
+
+    def parse(self, component, ctx):
+        """
+        Returns the result of the parser component for the context from the
+        cache, or parses the context and caches the result. The result is a
+        copy of the cached one if ``copy`` is set.
+        """
+        key = self.key(component, ctx)
+        if key is None:
+            return component(ctx)
+        result = self.get(key)
+        if result is None:
+            result = component(ctx)
+            if result is not None:
+                self.put(key, result)
+        return copy.deepcopy(result) if self.copy else result
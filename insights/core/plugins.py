@@ -29,6 +29,7 @@ from __future__ import print_function
 
 import logging
 import signal
+import threading
 import traceback
 
 from pprint import pformat
@@ -69,11 +70,11 @@ class PluginType(dr.ComponentType):
             return super(PluginType, self).invoke(broker)
         except ContentException as ce:
             log.debug(ce)
-            broker.add_exception(self.component, ce, traceback.format_exc())
+            broker.add_exception(self.component, ce, broker.capture_traceback())
             raise SkipComponent()
         except CalledProcessError as cpe:
             log.debug(cpe)
-            broker.add_exception(self.component, cpe, traceback.format_exc())
+            broker.add_exception(self.component, cpe, broker.capture_traceback())
             raise SkipComponent()
 
 
@@ -103,8 +104,10 @@ class datasource(PluginType):
 
     def invoke(self, broker):
         # Grab the timeout from the decorator, or use the default of 120.
-
-        if HostContext in broker:
+        # Signal handlers can only be set in the main thread, so datasources
+        # run by a parallel collection rely on the command timeouts.
+        alarm = HostContext in broker and threading.current_thread() is threading.main_thread()
+        if alarm:
             self.timeout = getattr(self, "timeout", 120)
             signal.signal(signal.SIGALRM, self._handle_timeout)
             signal.alarm(self.timeout)
@@ -112,24 +115,24 @@ class datasource(PluginType):
             return self.component(broker)
         except ContentException as ce:
             log.debug(ce)
-            ce_tb = traceback.format_exc()
+            ce_tb = broker.capture_traceback()
             for reg_spec in dr.get_registry_points(self.component):
                 broker.add_exception(reg_spec, ce, ce_tb)
             raise SkipComponent()
         except CalledProcessError as cpe:
             log.debug(cpe)
-            cpe_tb = traceback.format_exc()
+            cpe_tb = broker.capture_traceback()
             for reg_spec in dr.get_registry_points(self.component):
                 broker.add_exception(reg_spec, cpe, cpe_tb)
             raise SkipComponent()
         except TimeoutException as te:
             log.debug(te)
-            te_tb = traceback.format_exc()
+            te_tb = broker.capture_traceback()
             for reg_spec in dr.get_registry_points(self.component):
                 broker.add_exception(reg_spec, te, te_tb)
             raise SkipComponent()
         finally:
-            if HostContext in broker:
+            if alarm:
                 signal.alarm(0)
 
 
@@ -157,20 +160,26 @@ class parser(PluginType):
         self.continue_on_error = kwargs.get('continue_on_error', True)
         super(parser, self).__init__(*args, group=group)
 
+    def _parse(self, ctx, broker):
+        cache = getattr(broker, "parse_cache", None)
+        if cache is not None:
+            return cache.parse(self.component, ctx)
+        return self.component(ctx)
+
     def invoke(self, broker):
         dep_value = broker[self.requires[0]]
         exception = False
 
         if not isinstance(dep_value, list):
             try:
-                return self.component(dep_value)
+                return self._parse(dep_value, broker)
             except ContentException as ce:
                 log.debug(ce)
-                broker.add_exception(self.component, ce, traceback.format_exc())
+                broker.add_exception(self.component, ce, broker.capture_traceback())
                 exception = True
             except CalledProcessError as cpe:
                 log.debug(cpe)
-                broker.add_exception(self.component, cpe, traceback.format_exc())
+                broker.add_exception(self.component, cpe, broker.capture_traceback())
                 exception = True
 
         if exception:
@@ -179,24 +188,24 @@ class parser(PluginType):
         results = []
         for d in dep_value:
             try:
-                r = self.component(d)
+                r = self._parse(d, broker)
                 if r is not None:
                     results.append(r)
             except ContentException as ce:
                 log.debug(ce)
-                broker.add_exception(self.component, ce, traceback.format_exc())
+                broker.add_exception(self.component, ce, broker.capture_traceback())
                 if not self.continue_on_error:
                     exception = True
                     break
             except SkipComponent as sc:
                 if broker.store_skips:
                     log.warning(sc)
-                    broker.add_exception(component, sc, traceback.format_exc())
+                    broker.add_exception(component, sc, broker.capture_traceback())
                 else:
                     pass
             except CalledProcessError as cpe:
                 log.debug(cpe)
-                broker.add_exception(self.component, cpe, traceback.format_exc())
+                broker.add_exception(self.component, cpe, broker.capture_traceback())
                 if not self.continue_on_error:
                     exception = True
                     break
@@ -329,6 +338,7 @@ class rule(PluginType):
 
     content = None
     links = None
+    evictable = False
 
     def __init__(self, *args, **kwargs):
         super(rule, self).__init__(*args, **kwargs)
@@ -379,7 +389,7 @@ class fact(PluginType):
     is converted to a pandas Dataframe
     """
 
-    pass
+    evictable = False
 
 
 def is_type(component, _type):
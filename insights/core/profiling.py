@@ -0,0 +1,145 @@
+"""
+The profiling module records the resources each component uses while a
+:py:class:`insights.core.dr.Broker` evaluates it. Assign a :py:class:`Profiler`
+to ``broker.profiler`` before a run to enable it.
+
+Measurements around each component are taken by pluggable meters. A meter
+has a ``start`` method that returns a snapshot and a ``stop`` method that
+accepts the snapshot and returns a dictionary of metrics. The measurements
+include the broker's observers, since the content of collected specs is only
+loaded when it's persisted. The default meters record the CPU time of the
+component and the CPU time of the child processes it waited on.
+
+During collection with a profiler, :py:class:`insights.core.serde.Hydration`
+has the content providers of the components it persists record statistics
+about the data they save, and adds them to the profile of the component
+along with ``ser_time``, the time spent serializing it. Providers record
+nothing otherwise:
+
+- ``source_bytes``: the size of a file before it's filtered.
+- ``lines_read`` and ``bytes_read``: the size of the content after it's
+  filtered and before it's cleaned.
+- ``clean_time``: the time spent redacting and obfuscating the content.
+- ``lines_written`` and ``bytes_written``: the size of the content that's
+  saved to the archive.
+- ``cache_hits``: the number of files whose cleaned content was reused from
+  the :py:class:`insights.cleaner.cache.ContentCache`.
+
+The profile is saved as json to ``PROFILE_FILE`` in the archive's
+``meta_data`` directory.
+"""
+import json
+import os
+import threading
+import time
+
+from collections import defaultdict
+
+from insights.core import dr
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+PROFILE_FILE = "insights_profile.json"
+"""The name of the profile in the ``meta_data`` directory of an archive."""
+
+_thread_time = getattr(time, "thread_time", time.process_time)
+
+
+class CpuMeter(object):
+    """
+    Records the CPU time spent by the thread evaluating a component as
+    ``cpu_time``.
+    """
+
+    def start(self):
+        return _thread_time()
+
+    def stop(self, snapshot):
+        return {"cpu_time": _thread_time() - snapshot}
+
+
+class ChildRusageMeter(object):
+    """
+    Records the user and system time of child processes that finished while
+    a component was evaluated as ``child_user_time`` and
+    ``child_system_time``. The usage is process wide, so it includes children
+    of other components that run concurrently in parallel mode.
+    """
+
+    def start(self):
+        return resource.getrusage(resource.RUSAGE_CHILDREN) if resource else None
+
+    def stop(self, snapshot):
+        if snapshot is None:
+            return {}
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return {
+            "child_user_time": usage.ru_utime - snapshot.ru_utime,
+            "child_system_time": usage.ru_stime - snapshot.ru_stime,
+        }
+
+
+class Profiler(object):
+    """
+    Accumulates metrics for each component.
+
+    Args:
+        meters (list): The meters to take measurements around each component.
+            Defaults to :py:class:`CpuMeter` and :py:class:`ChildRusageMeter`.
+    """
+
+    def __init__(self, meters=None):
+        self.meters = meters if meters is not None else [CpuMeter(), ChildRusageMeter()]
+        self.stats = defaultdict(lambda: defaultdict(float))
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Returns the snapshots of all meters before a component is evaluated.
+        """
+        return [m.start() for m in self.meters]
+
+    def stop(self, component, snapshots):
+        """
+        Records the metrics of all meters after a component is evaluated.
+        """
+        for meter, snapshot in zip(self.meters, snapshots):
+            self.add(component, **meter.stop(snapshot))
+
+    def add(self, component, **metrics):
+        """
+        Adds metrics to those already recorded for the component.
+        """
+        with self._lock:
+            stats = self.stats[component]
+            for k, v in metrics.items():
+                stats[k] += v
+
+    def to_dict(self):
+        """
+        Returns the profile as a dictionary of component names to metrics.
+        """
+        with self._lock:
+            return dict((dr.get_name(c), dict(v)) for c, v in self.stats.items())
+
+    def top(self, metric, n=10):
+        """
+        Returns the ``(name, value)`` of the ``n`` components with the
+        largest values of the metric.
+        """
+        with self._lock:
+            res = [(dr.get_name(c), v[metric]) for c, v in self.stats.items() if metric in v]
+        return sorted(res, key=lambda x: x[1], reverse=True)[:n]
+
+    def dump(self, root):
+        """
+        Saves the profile to ``PROFILE_FILE`` in the directory root and
+        returns its path.
+        """
+        path = os.path.join(root, PROFILE_FILE)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, sort_keys=True)
+        return path
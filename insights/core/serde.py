@@ -6,9 +6,12 @@ load objects from the file system. The Hydration class includes a
 :py:func`Hydration.make_persister` method that returns a function appropriate
 to register as an observer on a :py:class:`Broker`.
 """
+import hashlib
 import json as ser
 import logging
 import os
+import shutil
+import threading
 import time
 import traceback
 
@@ -17,10 +20,17 @@ from functools import partial
 
 from insights.core import dr
 from insights.core.exceptions import ContentException
+from insights.core.profiling import PROFILE_FILE
 from insights.util import fs
 
 log = logging.getLogger(__name__)
 
+SIZES_FILE = "insights_sizes.json"
+"""
+The name of the report of the largest specs in the ``meta_data`` directory
+of an archive.
+"""
+
 SERIALIZERS = {}
 DESERIALIZERS = {}
 
@@ -127,6 +137,40 @@ def marshal(comp, broker, root=None, pool=None):
     return call_serializer(ser_func, v, exc_func)
 
 
+def rank_by_size(sizes, n=10):
+    """
+    Ranks components by the total size of their files.
+
+    Args:
+        sizes (dict): Maps the relative path of each file to a tuple of its
+            size and the name of the component it belongs to.
+        n (int): The number of components to return, or None for all of
+            them.
+
+    Returns:
+        list: Dicts with the "name" of the component, the total "size" of its
+        files and the relative path and size of its largest file as
+        "largest_file" and "largest_size", largest first.
+    """
+    specs = {}
+    for rel, (size, name) in sizes.items():
+        spec = specs.setdefault(name, {"name": name, "size": 0, "largest_file": None, "largest_size": -1})
+        spec["size"] += size
+        if size > spec["largest_size"]:
+            spec["largest_file"], spec["largest_size"] = rel, size
+    return sorted(specs.values(), key=lambda s: (-s["size"], s["name"]))[:n]
+
+
+def _files(results):
+    """
+    Returns the serialized objects of the results that have a file beneath
+    the data root.
+    """
+    results = results or []
+    objs = [r.get("object") for r in (results if isinstance(results, list) else [results])]
+    return [o for o in objs if isinstance(o, dict) and o.get("relative_path")]
+
+
 def unmarshal(data, root=None, ctx=None, ds=None):
     if data is None:
         return
@@ -141,8 +185,20 @@ class Hydration(object):
     components. It puts metadata about a component's evaluation in a metadata
     file for the component and allows the serializer for a component to put raw
     data beneath a working directory.
+
+    If a `sink` like :py:class:`insights.core.archives.TarWriter` is given,
+    the files of each component are added to it as soon as the component is
+    saved.
+
+    If `dedup` is True, a file with the same content as one saved before is
+    removed and its result records the relative path of the first one as
+    "same_as". The file is restored from that one when it's hydrated.
+
+    If `record_sizes` is True, the size of each file saved is recorded for
+    :py:meth:`dump_sizes`.
     """
-    def __init__(self, root=None, ctx=None, meta_root="meta_data", data_root="data", pool=None):
+    def __init__(self, root=None, ctx=None, meta_root="meta_data", data_root="data", pool=None, sink=None,
+                 dedup=False, record_sizes=False):
         self.root = root
         self.ctx = ctx
         self.meta_root = os.path.join(root, meta_root) if root else None
@@ -150,6 +206,12 @@ class Hydration(object):
         self.ser_name = dr.get_base_module_name(ser)
         self.created = False
         self.pool = pool
+        self.sink = sink
+        self.dedup = dedup
+        self.record_sizes = record_sizes
+        self.sizes = {}
+        self._digests = {}
+        self._lock = threading.Lock()
 
     def _hydrate_one(self, doc):
         """ Returns (component, results, errors, duration) """
@@ -160,6 +222,7 @@ class Hydration(object):
             raise ValueError("{} is not a loaded component.".format(name))
         exec_time = doc["exec_time"]
         ser_time = doc["ser_time"]
+        self._restore_duplicates(doc["results"])
         results = unmarshal(doc["results"], root=self.data_root, ctx=self.ctx, ds=key)
         return (key, results, exec_time, ser_time)
 
@@ -171,6 +234,8 @@ class Hydration(object):
 
         broker = broker or dr.Broker()
         for path in glob(os.path.join(self.meta_root, "*")):
+            if os.path.basename(path) in (PROFILE_FILE, SIZES_FILE):
+                continue
             try:
                 with open(path) as f:
                     doc = ser.load(f)
@@ -207,9 +272,16 @@ class Hydration(object):
             # but not list of strings.
             errors = [broker.tracebacks[e] for e in broker.exceptions.get(comp, [])]
 
+            profiler = getattr(broker, "profiler", None)
+            if profiler is not None:
+                self._record_stats(comp, broker)
             start = time.time()
             results, ms_errors = marshal(comp, broker, root=self.data_root, pool=self.pool)
             errors.extend(ms_errors if isinstance(ms_errors, list) else [ms_errors]) if ms_errors else None
+            if self.dedup and results:
+                self._remove_duplicates(results)
+            if results and self.record_sizes:
+                self._record_sizes(name, results)
 
             doc = {
                 "name": name,
@@ -218,6 +290,8 @@ class Hydration(object):
                 "results": results if results else None,
                 "ser_time": time.time() - start
             }
+            if (results or errors) and profiler is not None:
+                self._profile(comp, broker, doc["ser_time"])
         except Exception as ex:
             log.exception(ex)
         else:
@@ -231,6 +305,113 @@ class Hydration(object):
                     log.error("Could not serialize %s to %s: %r" % (name, self.ser_name, boom))
                     if path:
                         fs.remove(path)
+                else:
+                    if self.sink is not None:
+                        self._sink(doc, path)
+
+    def _sink(self, doc, path):
+        """
+        Adds the data files of the results and the metadata file to the sink.
+        The metadata file is kept on disk since it's read again after
+        collection.
+        """
+        for obj in _files(doc["results"]):
+            if not obj.get("same_as"):
+                self.sink.add(os.path.join(self.data_root, obj["relative_path"]))
+        self.sink.add(path, remove=False)
+
+    def _record_sizes(self, name, results):
+        """
+        Records the size of each file of the results along with the name of
+        the component.
+        """
+        for obj in _files(results):
+            if not obj.get("same_as"):
+                path = os.path.join(self.data_root, obj["relative_path"])
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    continue
+                with self._lock:
+                    self.sizes[obj["relative_path"]] = (size, name)
+
+    def dump_sizes(self, n=None):
+        """
+        Saves the components ranked by :py:func:`rank_by_size`, all of them
+        unless `n` is given, to ``SIZES_FILE`` in the metadata directory and
+        returns its path.
+        """
+        ranked = rank_by_size(self.sizes, n)
+        fs.ensure_path(self.meta_root, mode=0o770)
+        path = os.path.join(self.meta_root, SIZES_FILE)
+        with open(path, "w") as f:
+            ser.dump({"specs": ranked}, f)
+        return path
+
+    def _remove_duplicates(self, results):
+        """
+        Removes the files of the results with the same content as a file
+        saved before and points their results to that file.
+        """
+        for obj in _files(results):
+            rel = obj["relative_path"]
+            path = os.path.join(self.data_root, rel)
+            if os.path.islink(path) or not os.path.isfile(path):
+                continue
+            sha = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(65536), b""):
+                    sha.update(chunk)
+            with self._lock:
+                first = self._digests.setdefault(sha.hexdigest(), rel)
+            if first != rel:
+                os.remove(path)
+                obj["same_as"] = first
+
+    def _restore_duplicates(self, results):
+        """
+        Restores the files removed as duplicates from the files they are the
+        same as.
+        """
+        for obj in _files(results):
+            if not obj.get("same_as"):
+                continue
+            real_root = os.path.realpath(self.data_root) + os.sep
+            dst = os.path.join(self.data_root, obj["relative_path"])
+            src = os.path.join(self.data_root, obj["same_as"])
+            if os.path.exists(dst):
+                continue
+            if not all(os.path.realpath(p).startswith(real_root) for p in (src, dst)):
+                raise ValueError("Relative path points outside the root: %s" % obj["same_as"])
+            fs.ensure_path(os.path.dirname(dst))
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copyfile(src, dst)
+
+    def _record_stats(self, comp, broker):
+        """
+        Makes the content providers of the component record statistics while
+        they're written, which they only do for the profiler.
+        """
+        value = broker.get(comp)
+        for v in (value if isinstance(value, list) else [value]):
+            record_stats = getattr(v, "record_stats", None)
+            if callable(record_stats):
+                record_stats()
+
+    def _profile(self, comp, broker, ser_time):
+        """
+        Adds the serialization time and the statistics content providers
+        recorded while being written to the profile of the component.
+        """
+        profiler = broker.profiler
+        profiler.add(comp, ser_time=ser_time)
+        value = broker.get(comp)
+        for v in (value if isinstance(value, list) else [value]):
+            stats = getattr(v, "stats", None)
+            if stats:
+                profiler.add(comp, **stats)
 
     def make_persister(self, to_persist):
         """
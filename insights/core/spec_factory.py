@@ -4,6 +4,7 @@ import os
 import re
 import shlex
 import signal
+import time
 import traceback
 
 from collections import defaultdict
@@ -11,6 +12,7 @@ from glob import glob
 from subprocess import call
 
 from insights.cleaner import DEFAULT_OBFUSCATIONS
+from insights.cleaner.cache import RACY_SECONDS
 from insights.cleaner.filters import AllowFilter
 from insights.core import blacklist, dr, filters
 from insights.core.context import ExecutionContext, FSRoots, HostContext
@@ -49,6 +51,11 @@ PATH_ENV_OVERRIDER = "PATH=%s:$PATH" % SAFE_ENV["PATH"]
 
 
 class ContentProvider(object):
+    reloadable = True
+    """
+    Whether ``load`` can read the content again after it's unloaded.
+    """
+
     def __init__(self):
         self.cmd = None
         self.args = None
@@ -61,10 +68,34 @@ class ContentProvider(object):
         self._exception = None
         self._filterable = False
         self._filters = dict()
+        self.stats = None
 
     def load(self):
         raise NotImplementedError()
 
+    def record_stats(self):
+        """
+        Starts recording statistics about the content in ``stats`` for the
+        profiler. See :mod:`insights.core.profiling`.
+        """
+        if self.stats is None:
+            self.stats = dict()
+
+    def _record(self, **stats):
+        if self.stats is not None:
+            self.stats.update(stats)
+
+    def unload(self):
+        """
+        Drops the loaded content to free memory. It's loaded again if it's
+        accessed later. The content of providers that aren't ``reloadable``
+        is kept.
+        """
+        if not self.reloadable:
+            return
+        self._content = None
+        self.loaded = False
+
     def stream(self):
         """
         Returns a generator of lines instead of a list of lines.
@@ -82,6 +113,9 @@ class ContentProvider(object):
         collecting data.
         """
         content = self.content  # load first for debugging info order
+        if self.stats is not None:
+            self.stats["lines_read"] = len(content)
+            self.stats["bytes_read"] = sum(len(l) + 1 for l in content)
         if content and isinstance(self.ctx, HostContext) and self.ds and self.cleaner:
             cleans = []
             # Redacting?
@@ -98,6 +132,7 @@ class ContentProvider(object):
             # Cleaning - Entry
             if cleans:
                 log.debug("Cleaning (%s) %s", "/".join(cleans), self.relative_path)
+                start = time.time() if self.stats is not None else None
                 content = self.cleaner.clean_content(
                     content,
                     no_obfuscate=no_obf,
@@ -105,6 +140,8 @@ class ContentProvider(object):
                     no_redact=no_red,
                     width=self.relative_path.endswith("netstat_-neopa"),
                 )
+                if start is not None:
+                    self.stats["clean_time"] = time.time() - start
                 if len(content) == 0:
                     log.debug("Skipping %s due to empty after cleaning", self.path)
                     raise ContentException("Empty after cleaning: %s" % self.path)
@@ -139,10 +176,12 @@ class ContentProvider(object):
     def write(self, dst):
         fs.ensure_path(os.path.dirname(dst))
         # Clean Spec Content when writing it down to disk before uploading
-        content = "\n".join(self._clean_content())
+        lines = self._clean_content()
+        content = "\n".join(lines)
         content = content.encode("utf-8")
         with open(dst, "wb") as f:
             f.write(content)
+        self._record(lines_written=len(lines), bytes_written=len(content))
 
         self.loaded = False
 
@@ -158,6 +197,9 @@ class ContentProvider(object):
 
 
 class DatasourceProvider(ContentProvider):
+    # the content is only held in memory
+    reloadable = False
+
     def __init__(
         self,
         content,
@@ -263,6 +305,8 @@ class RawFileProvider(FileProvider):
     def write(self, dst):
         fs.ensure_path(os.path.dirname(dst))
         call([which("cp", env=SAFE_ENV), self.path, dst], env=SAFE_ENV)
+        if self.stats is not None and os.path.exists(dst):
+            self.stats["bytes_read"] = self.stats["bytes_written"] = os.path.getsize(dst)
 
 
 class TextFileProvider(FileProvider):
@@ -285,6 +329,8 @@ class TextFileProvider(FileProvider):
 
     def load(self):
         self.loaded = True
+        fsize = os.stat(self.path).st_size
+        self._record(source_bytes=fsize)
         args = self.create_args()
         if args:
             # "keep_rc = True" to ignore failure of 'grep'
@@ -292,7 +338,6 @@ class TextFileProvider(FileProvider):
             self.rc = rc
             return out
 
-        fsize = os.stat(self.path).st_size
         with open(self.path, "r", encoding="utf-8", errors="surrogateescape") as f:
             if fsize > MAX_CONTENT_SIZE:
                 # read the last ``MAX_CONTENT_SIZE`` MB only
@@ -306,6 +351,49 @@ class TextFileProvider(FileProvider):
                 content = AllowFilter.filter_content(content, self._filters)
             return content
 
+    def _cache_key(self, cache):
+        """
+        Returns the key of the cleaned content in the cache, or None if it
+        can't be cached.
+        """
+        if not (isinstance(self.ctx, HostContext) and self.ds):
+            return None
+        no_obf = getattr(self.ds, 'no_obfuscate', [])
+        no_red = getattr(self.ds, 'no_redact', False)
+        config = self.cleaner.fingerprint(no_obfuscate=no_obf, no_redact=no_red)
+        if config is None:
+            return None
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        if time.time() - st.st_mtime < RACY_SECONDS:
+            # it may change again within the resolution of its mtime
+            return None
+        return cache.key(
+            self.path,
+            st.st_dev,
+            st.st_ino,
+            st.st_size,
+            st.st_mtime_ns,
+            sorted(self._filters.items()),
+            self._filterable,
+            config,
+        )
+
+    def write(self, dst):
+        cache = getattr(self.cleaner, "cache", None)
+        key = self._cache_key(cache) if cache is not None else None
+        if key is not None:
+            size = cache.restore(key, dst)
+            if size is not None:
+                log.debug("Reusing cleaned content of %s", self.relative_path)
+                self._record(bytes_written=size, cache_hits=1)
+                return
+        super(TextFileProvider, self).write(dst)
+        if key is not None:
+            cache.store(key, dst)
+
     def _stream(self):
         """
         Returns a generator of lines instead of a list of lines.
@@ -343,6 +431,9 @@ class CommandOutputProvider(ContentProvider):
     Class used in datasources to return output from commands.
     """
 
+    # loading runs the command again
+    reloadable = False
+
     def __init__(
         self,
         cmd,
@@ -200,6 +200,21 @@ def render(comp, val):
     return func(comp, val) if func else str(val)
 
 
+def is_type_shown(type_, missing=True, show_rules=None):
+    """
+    Whether results of the type are shown with the "-m" and "-S" options,
+    like :func:`get_response_of_types` shows them, for formatters that
+    write each result on its own.
+    """
+    if type_ == "skip":
+        return missing
+    if not show_rules:
+        return type_ != "none"
+    if type_ in ("rule", "info", "pass", "none", "fingerprint"):
+        return type_ in show_rules
+    return True
+
+
 def get_response_of_types(response, missing=True, show_rules=None):
     # Check the "-m" option:
     #  - When "-m" is specified, show the "skips" rules
@@ -0,0 +1,40 @@
+import json
+import sys
+
+from insights.core import dr
+from insights.core.evaluators import StreamingEvaluator
+from insights.formats import EvaluatorFormatterAdapter, get_response_of_types, is_type_shown, render
+
+
+class JsonLinesFormat(StreamingEvaluator):
+    """
+    Writes each rule result as a JSON document on a line of its own while
+    the rules are evaluated. The last line is the response without the
+    results: the system metadata and the analysis metadata.
+    """
+
+    def __init__(self, broker=None, missing=False, render_content=False, show_rules=None, stream=sys.stdout):
+        super(JsonLinesFormat, self).__init__(broker, stream=stream)
+        self.missing = missing
+        self.render_content = render_content
+        self.show_rules = [] if show_rules is None else show_rules
+
+    def dump(self, obj):
+        return json.dumps(obj) + "\n"
+
+    def is_shown(self, type_):
+        return is_type_shown(type_, self.missing, self.show_rules)
+
+    def make_result(self, plugin, r):
+        result = super(JsonLinesFormat, self).make_result(plugin, r)
+        if self.render_content:
+            result["rendered_content"] = render(dr.get_name(plugin), r)
+        return result
+
+    def get_response(self):
+        response = super(JsonLinesFormat, self).get_response()
+        return get_response_of_types(response, self.missing, self.show_rules)
+
+
+class JsonLinesFormatterAdapter(EvaluatorFormatterAdapter):
+    Impl = JsonLinesFormat
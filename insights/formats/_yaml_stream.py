@@ -0,0 +1,39 @@
+import sys
+import yaml
+
+from insights.core.evaluators import StreamingEvaluator
+from insights.formats import EvaluatorFormatterAdapter, get_response_of_types, is_type_shown
+# registers the representers of the results
+from insights.formats import _yaml  # noqa: F401
+
+
+class YamlStreamFormat(StreamingEvaluator):
+    """
+    Writes each rule result as a YAML document while the rules are
+    evaluated. The last document is the response without the results: the
+    system metadata and the analysis metadata.
+    """
+
+    def __init__(self,
+            broker=None,
+            missing=False,
+            render_content=False,
+            show_rules=None,
+            stream=sys.stdout):
+        super(YamlStreamFormat, self).__init__(broker, stream=stream)
+        self.missing = missing
+        self.show_rules = [] if show_rules is None else show_rules
+
+    def dump(self, obj):
+        return yaml.dump(obj, explicit_start=True)
+
+    def is_shown(self, type_):
+        return is_type_shown(type_, self.missing, self.show_rules)
+
+    def get_response(self):
+        response = super(YamlStreamFormat, self).get_response()
+        return get_response_of_types(response, self.missing, self.show_rules)
+
+
+class YamlStreamFormatterAdapter(EvaluatorFormatterAdapter):
+    Impl = YamlStreamFormat
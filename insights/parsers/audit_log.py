@@ -3,7 +3,7 @@ audit_log - File ``/var/log/audit/audit.log``
 =============================================
 """
 
-import shlex
+import re
 from datetime import date
 from .. import LogFileOutput, parser, add_filter
 from insights.specs import Specs
@@ -17,6 +17,46 @@ filter_list = [
 add_filter(Specs.audit_log, filter_list)
 
 
+# The tokens of a record split like ``shlex.split`` does: words of unquoted
+# text, single quoted text, double quoted text and escaped characters.
+_WHITESPACE = re.compile(r'[ \t\r\n]+')
+_TOKEN = re.compile(r'''(?:[^ \t\r\n'"\\]+|'[^']*'|"(?:[^"\\]|\\[\s\S])*"|\\[\s\S])+''')
+_PIECE = re.compile(r'''([^'"\\]+)|'([^']*)'|"((?:[^"\\]|\\[\s\S])*)"|\\([\s\S])''')
+_DQ_ESCAPE = re.compile(r'\\(["\\])')
+
+
+def _piece(match):
+    plain, single, double, escaped = match.groups()
+    if plain is not None:
+        return plain
+    if single is not None:
+        return single
+    if double is not None:
+        return _DQ_ESCAPE.sub(r'\1', double) if '\\' in double else double
+    return escaped
+
+
+def _unquote(token):
+    if '"' in token or "'" in token or '\\' in token:
+        return ''.join(_piece(m) for m in _PIECE.finditer(token))
+    return token
+
+
+def _split(line):
+    """
+    Splits the line into the same tokens as ``shlex.split`` and raises
+    ``ValueError`` for the same unbalanced quotes and trailing escapes.
+    """
+    if '"' not in line and "'" not in line and '\\' not in line:
+        line = line.strip(' \t\r\n')
+        return _WHITESPACE.split(line) if line else []
+    # anything but whitespace between the tokens is a quote or an escape
+    # that isn't closed
+    if _TOKEN.sub('', line).strip(' \t\r\n'):
+        raise ValueError("No closing quotation or escaped character")
+    return [_unquote(t) for t in _TOKEN.findall(line)]
+
+
 @parser(Specs.audit_log)
 class AuditLog(LogFileOutput):
     """
@@ -52,7 +92,7 @@ class AuditLog(LogFileOutput):
 
         Parsing logic:
 
-            * First, use `shlex.split` to split by empty.
+            * First, split by whitespace like `shlex.split` does.
             * Next, assert the first two key-value pair is 'type' and 'msg'.
             * Next, parse the remained string reversly to get key-value pair data as more as possible.
             * The left unparsed string will be stored at "unparsed".
@@ -77,7 +117,7 @@ class AuditLog(LogFileOutput):
             possible are pulled from the line.
         """
         info = {'raw_message': line, 'is_valid': False}
-        linesp = shlex.split(line)
+        linesp = _split(line)
 
         if (len(linesp) < 2 or
                 not (linesp[0] and linesp[0].startswith('type=')) or
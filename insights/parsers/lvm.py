@@ -68,6 +68,17 @@ def map_keys(pvs, keys):
     return rs
 
 
+def group_by(rows, key):
+    """
+    Returns a dictionary of the lists of rows by their value of ``key``,
+    keeping the order of the rows.
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.get(key), []).append(row)
+    return groups
+
+
 def find_warnings(content):
     """Look for lines containing warning/error/info strings instead of data."""
     keywords = [
@@ -143,7 +154,23 @@ class Lvm(CommandParser):
             if idx not in _warning_indexs and not l.startswith("File descriptor ")
         ]
         d["content"] = list(map_keys(parse_keypair_lines(content), self.KEYS))
+        for row in d["content"]:
+            self._update_row(row)
         self.data = d if d else None
+        # Index the rows once so that lookups by name or volume group don't
+        # scan every row, which matters with thousands of volumes. The first
+        # row with a name is the one found by name, rows without one can't
+        # be found by name.
+        self._by_vg = group_by(d["content"], "VG")
+        self._by_key = {}
+        for row in d["content"]:
+            key = row.get(self.PRIMARY_KEY)
+            if key is not None:
+                self._by_key.setdefault(key, row)
+
+    def _update_row(self, row):
+        """Called with each row before it's indexed to add or fix values."""
+        pass
 
     def __iter__(self):
         return iter(self.data["content"])
@@ -154,10 +181,7 @@ class Lvm(CommandParser):
     def __getitem__(self, key):
         if isinstance(key, int):
             return self.data["content"][key]
-        for i in self.data["content"]:
-            if i[self.PRIMARY_KEY] == key:
-                return i
-        return None
+        return self._by_key.get(key)
 
     @property
     def locking_disabled(self):
@@ -232,16 +256,14 @@ class Pvs(Lvm):
 
     PRIMARY_KEY = "PV"
 
-    def parse_content(self, content):
-        super(Pvs, self).parse_content(content)
-        for pv in self.data["content"]:
-            pv_name = pv.get("PV") if pv.get("PV") is not None else "no_name"
-            pv_uuid = pv.get("PV_UUID") if pv.get("PV_UUID") is not None else "no_uuid"
-            pv.update({"PV_KEY": "+".join([pv_name, pv_uuid])})
+    def _update_row(self, pv):
+        pv_name = pv.get("PV") if pv.get("PV") is not None else "no_name"
+        pv_uuid = pv.get("PV_UUID") if pv.get("PV_UUID") is not None else "no_uuid"
+        pv.update({"PV_KEY": "+".join([pv_name, pv_uuid])})
 
     def vg(self, name):
         """Return all physical volumes assigned to the given volume group"""
-        return [i for i in self.data["content"] if i["VG"] == name]
+        return list(self._by_vg.get(name, []))
 
 
 @parser(Specs.pvs_noheadings_all)
@@ -328,10 +350,11 @@ class PvsHeadings(LvmHeadings):
             pv_name = pv.get("PV") if pv.get("PV") is not None else "no_name"
             pv_uuid = pv.get("PV_UUID") if pv.get("PV_UUID") is not None else "no_uuid"
             pv.update({"PV_KEY": "+".join([pv_name, pv_uuid])})
+        self._by_vg = group_by(self.data, "VG")
 
     def vg(self, name):
         """Return all physical volumes assigned to the given volume group"""
-        return [i for i in self.data if i["VG"] == name]
+        return list(self._by_vg.get(name, []))
 
 
 @parser(Specs.vgs_noheadings)
@@ -644,19 +667,17 @@ class Lvs(Lvm):
 
     PRIMARY_KEY = "LV"
 
-    def parse_content(self, content):
-        super(Lvs, self).parse_content(content)
-        for item in self.data["content"]:
-            lv_name = item["LV"]
-            if "/" in lv_name:
-                # Reduce full name to just the name
-                # This is due to the lvs command having *two identical keys*
-                # with different values
-                item["LV"] = lv_name.split("/")[1]
+    def _update_row(self, item):
+        lv_name = item["LV"]
+        if "/" in lv_name:
+            # Reduce full name to just the name
+            # This is due to the lvs command having *two identical keys*
+            # with different values
+            item["LV"] = lv_name.split("/")[1]
 
     def vg(self, name):
         """Return all logical volumes in the given volume group"""
-        return [i for i in self.data["content"] if i["VG"] == name]
+        return list(self._by_vg.get(name, []))
 
 
 @parser(Specs.lvs_noheadings_all)
@@ -27,6 +27,8 @@ SsTUPNA - command ``ss -tupna``
 -------------------------------
 """
 
+import re
+
 from collections import defaultdict
 
 from insights.core import CommandParser, LegacyItemAccess, Parser
@@ -66,6 +68,45 @@ NETSTAT_SECTION_ID = {
 }
 
 
+# The process names in the ``Process`` column of ``ss``, e.g.
+# ``users:(("rpcbind",pid=1139,fd=5),("systemd",pid=1,fd=41))``
+_SS_PROCESS_NAME = re.compile(r'\("(.*?)",')
+# Characters and words of the ``Process`` column around the names
+_SS_PROCESS_SYNTAX = re.compile(r'["(),=:]')
+_SS_PROCESS_WORDS = ("users", "pid", "fd")
+
+
+def port_of(address):
+    """
+    Returns the port of an ``address:port`` string as an integer, or None
+    when it has no numeric port, e.g. for ``*:*``.
+    """
+    if not address or ':*' in address:
+        return None
+    port = address.rsplit(':', 1)[-1]
+    return int(port) if port.isdigit() else None
+
+
+def index_rows(rows, keys_of):
+    """
+    Returns a dictionary of the positions of the rows, in order, by each of
+    the keys that ``keys_of`` returns for a row.
+    """
+    index = defaultdict(list)
+    for pos, row in enumerate(rows):
+        for key in keys_of(row):
+            index[key].append(pos)
+    return dict(index)
+
+
+def _ss_process_names(row):
+    process = row.get("Process")
+    if not process:
+        return []
+    # None stands for a process without recognized names
+    return set(_SS_PROCESS_NAME.findall(process)) or [None]
+
+
 @parser(Specs.netstat_s)
 class NetstatS(LegacyItemAccess, CommandParser):
     """
@@ -505,6 +546,8 @@ class Netstat(CommandParser):
         self.lines = dict((s.name, s.lines) for s in sections)
         self.datalist = dict((s.name, s.datalist) for s in sections)
         self._dataobjs = dict((s.name, s) for s in sections)
+        self._running_processes = None
+        self._listening_pid = None
 
     @property
     def running_processes(self):
@@ -519,11 +562,13 @@ class Netstat(CommandParser):
         # Is it possible to have a machine that has no active connections?
         if ACTIVE_INTERNET_CONNECTIONS not in self.data:
             return set()
-        return set(
-            pg.split('/', 1)[1].strip()
-            for pg in self.data[ACTIVE_INTERNET_CONNECTIONS]['PID/Program name']
-            if '/' in pg
-        )
+        if self._running_processes is None:
+            self._running_processes = set(
+                pg.split('/', 1)[1].strip()
+                for pg in self.data[ACTIVE_INTERNET_CONNECTIONS]['PID/Program name']
+                if '/' in pg
+            )
+        return set(self._running_processes)
 
     @property
     def listening_pid(self):
@@ -536,20 +581,22 @@ class Netstat(CommandParser):
 
                 {'pid': ("addr": ip_address, 'port': port, 'name': process_name)}
         """
-        pids = {}
         # Is it possible to have a machine that has no active connections?
         if ACTIVE_INTERNET_CONNECTIONS not in self.datalist:
-            return pids
-        connlist = self.datalist[ACTIVE_INTERNET_CONNECTIONS]
-        for line in connlist:
-            if line['State'] != 'LISTEN':
-                continue
-            if not (':' in line['Local Address'] and '/' in line['PID/Program name']):
-                continue
-            addr, port = line['Local Address'].strip().split(":", 1)
-            pid, name = line['PID/Program name'].strip().split('/', 1)
-            pids[pid] = {'addr': addr, 'port': port, 'name': name}
-        return pids
+            return {}
+        if self._listening_pid is None:
+            pids = {}
+            connlist = self.datalist[ACTIVE_INTERNET_CONNECTIONS]
+            for line in connlist:
+                if line['State'] != 'LISTEN':
+                    continue
+                if not (':' in line['Local Address'] and '/' in line['PID/Program name']):
+                    continue
+                addr, port = line['Local Address'].strip().split(":", 1)
+                pid, name = line['PID/Program name'].strip().split('/', 1)
+                pids[pid] = {'addr': addr, 'port': port, 'name': name}
+            self._listening_pid = pids
+        return dict((pid, dict(info)) for pid, info in self._listening_pid.items())
 
     def get_original_line(self, section_id, index):
         """
@@ -702,6 +749,10 @@ class SsTUPNA(CommandParser, list):
         False
         >>> rpcbind == ss.get_localport('111')  # Only local port or address searched
         True
+
+    The rows are indexed by local port, peer port and process name the
+    first time they're searched by them, so that the searches don't scan
+    every socket of busy hosts.
     """
 
     SS_TABLE_HEADER = ["Netid State Recv-Q Send-Q Local-Address-Port Peer-Address-Port Process"]
@@ -710,29 +761,49 @@ class SsTUPNA(CommandParser, list):
         # Use headings without spaces and colons
         self.extend(parse_delimited_table(self.SS_TABLE_HEADER + content[1:]))
         del content
+        self._indexes = {}
+
+    def _index(self, name):
+        """
+        Returns the index of the rows by local port, peer port or process
+        name, building it on first use.
+        """
+        if name not in self._indexes:
+            if name == 'Process':
+                self._indexes[name] = index_rows(self, _ss_process_names)
+            else:
+                self._indexes[name] = index_rows(
+                    self, lambda l: [p for p in [port_of(l.get(name))] if p is not None]
+                )
+        return self._indexes[name]
 
     def get_service(self, service):
-        return [l for l in self if l.get("Process", None) and service in l["Process"]]
+        """
+        Returns the rows of the sockets whose ``Process`` contains
+        ``service``, usually the name of a process.
+        """
+        if (
+            not service
+            or service.isdigit()
+            or _SS_PROCESS_SYNTAX.search(service)
+            or any(service in word for word in _SS_PROCESS_WORDS)
+        ):
+            # It could match outside the process names
+            return [l for l in self if l.get("Process", None) and service in l["Process"]]
+        positions = set()
+        for name, rows in self._index('Process').items():
+            if name is None:
+                # The rows without recognized names are searched as before
+                positions.update(pos for pos in rows if service in self[pos]["Process"])
+            elif service in name:
+                positions.update(rows)
+        return [self[pos] for pos in sorted(positions)]
 
     def get_localport(self, port):
-        list_conn = []
-        for line in self:
-            local_port = line.get('Local-Address-Port')
-            if (
-                local_port
-                and ':*' not in local_port
-                and int(port) == int(local_port.split(':')[-1])
-            ):
-                list_conn.append(line)
-        return list_conn
+        return [self[pos] for pos in self._index('Local-Address-Port').get(int(port), [])]
 
     def get_peerport(self, port):
-        list_conn = []
-        for line in self:
-            peer_port = line.get('Peer-Address-Port')
-            if peer_port and ':*' not in peer_port and int(port) == int(peer_port.split(':')[-1]):
-                list_conn.append(line)
-        return list_conn
+        return [self[pos] for pos in self._index('Peer-Address-Port').get(int(port), [])]
 
     def get_port(self, port):
         return self.get_localport(port) + self.get_peerport(port)
@@ -768,6 +839,7 @@ class SsTULPN(SsTUPNA):
         content = [line for line in content if (('UNCONN' in line) or ('LISTEN' in line))]
         self.extend(parse_delimited_table(self.SS_TABLE_HEADER + content))
         del content
+        self._indexes = {}
 
 
 @parser(Specs.proc_netstat)
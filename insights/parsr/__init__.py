@@ -43,12 +43,27 @@ Here's an example that evaluates arithmetic expressions.
         expr <= (term + Many(InSet("+-") + term)).map(op)
 
         evaluate = expr << EOF
+
+When a parser is invoked on a string, the leaf parsers that match runs of
+characters (:py:class:`String`, :py:class:`Literal` and
+:py:class:`Many` of an :py:class:`InSet`) are lowered to precompiled regular
+expressions or string comparisons against it. Grammars don't need to change to
+benefit.
+
+Grammars with a lot of backtracking can also enable packrat memoization of
+intermediate results by passing ``memoize=True`` when invoking the top level
+parser:
+
+    .. code-block:: python
+
+        val = evaluate("1 + 2 * (3 - 4)", memoize=True)
 """
 
 from __future__ import print_function
 import functools
 import logging
 import os
+import re
 import string
 import traceback
 
@@ -116,15 +131,14 @@ def render(tree):
 def _debug_hook(func):
     """
     _debug_hook wraps the process function of every parser. It maintains a
-    stack of active parsers during evaluation to help with error reporting and
-    prints diagnostic messages for parsers with debug enabled.
+    stack of active parsers during evaluation to help with error reporting
+    when errors are tracked and prints diagnostic messages for parsers with
+    debug enabled. If memoization
+    is enabled for the current parse, it also caches the results and failures
+    of memoizable parsers by input position.
     """
 
-    @functools.wraps(func)
-    def inner(self, pos, data, ctx):
-        if ctx.function_error is not None:
-            # no point in continuing...
-            raise Exception()
+    def tracked(self, pos, data, ctx):
         ctx.parser_stack.append(self)
         if self._debug:
             line = ctx.line(pos) + 1
@@ -143,9 +157,79 @@ def _debug_hook(func):
         finally:
             ctx.parser_stack.pop()
 
+    @functools.wraps(func)
+    def inner(self, pos, data, ctx):
+        if ctx.function_error is not None:
+            # no point in continuing...
+            raise Exception()
+
+        run = tracked if ctx.track_errors or self._debug else func
+
+        memo = ctx.memo
+        if memo is None or not self._memo:
+            return run(self, pos, data, ctx)
+
+        key = (self, pos)
+        if key in memo:
+            res = memo[key]
+            if res is None:
+                raise Exception()
+            return res
+
+        try:
+            res = memo[key] = run(self, pos, data, ctx)
+        except:
+            memo[key] = None
+            raise
+        return res
+
     return inner
 
 
+def _mark_memoizable(tree):
+    """
+    Marks which parsers in the grammar rooted at tree may have their results
+    memoized. Only parsers with children are memoized since leaves are cheaper
+    to run again than to look up. A parser can't be memoized if it or any
+    parser beneath it depends on the indent or tag stacks of the
+    :py:class:`Context`, since its result then depends on more than its input
+    position.
+    """
+    nodes = []
+    seen = set()
+    stack = [tree]
+    while stack:
+        cur = stack.pop()
+        if cur in seen:
+            continue
+        seen.add(cur)
+        nodes.append(cur)
+        stack.extend(cur.children)
+
+    sensitive = set(n for n in nodes if n._context_sensitive)
+    changed = True
+    while changed:
+        changed = False
+        for n in nodes:
+            if n not in sensitive and any(c in sensitive for c in n.children):
+                sensitive.add(n)
+                changed = True
+
+    for n in nodes:
+        n._memo = bool(n.children) and n not in sensitive
+
+
+def _char_class(chars):
+    """
+    Returns a regular expression character class matching any of the single
+    characters in chars or ``None`` if there aren't any.
+    """
+    chars = sorted(c for c in chars if isinstance(c, str) and len(c) == 1)
+    if not chars:
+        return None
+    return "[" + "".join(re.escape(c) for c in chars) + "]"
+
+
 class Backtrack(Exception):
     """
     Mapped or Lifted functions should Backtrack if they want to fail without
@@ -162,8 +246,17 @@ class Context(object):
     parser. It stores an indention stack to track hanging indents, a tag stack
     for grammars like xml or apache configuration, the active parser stack for
     error reporting, and accumulated errors for the farthest position reached.
+
+    When a parser is invoked on a string, ``text`` holds the original string
+    so leaf parsers can match against it directly, and ``memo`` holds the
+    packrat cache if memoization was requested. The parser stack and errors
+    are only maintained if ``track_errors`` is ``True``.
     """
 
+    text = None
+    memo = None
+    track_errors = True
+
     def __init__(self, lines, src=None):
         self.pos = -1
         self.indents = []
@@ -174,7 +267,7 @@ class Context(object):
         self.errors = []
         self.function_error = None
 
-    def set(self, pos, msg):
+    def set(self, pos, msg, *args):
         """
         Every parser that encounters an error calls set with the current
         position and a message. If the error is at the farthest position
@@ -183,13 +276,20 @@ class Context(object):
         beyond any previous errors, the error list is cleared before the active
         stack and new error are recorded. This is the "farthest failure
         heurstic."
+
+        If args are given, msg is a format string that's only rendered when the
+        error is recorded.
         """
+        if pos < self.pos or not self.track_errors:
+            return
+
         if pos > self.pos:
             self.errors = []
 
-        if pos >= self.pos:
-            self.pos = pos
-            self.errors.append((list(self.parser_stack), msg))
+        self.pos = pos
+        if args:
+            msg = msg.format(*args)
+        self.errors.append((list(self.parser_stack), msg))
 
     def line(self, pos):
         return bisect_left(self.lines, pos)
@@ -217,6 +317,9 @@ class Parser(Node, metaclass=_ParserMeta):
     Parser is the common base class of all Parsers.
     """
 
+    _context_sensitive = False
+    _memo = False
+
     def __init__(self):
         super(Parser, self).__init__()
         self.name = None
@@ -324,7 +427,7 @@ class Parser(Node, metaclass=_ParserMeta):
     def process(self, pos, data, ctx):
         raise NotImplementedError()
 
-    def __call__(self, data, src=None, Ctx=Context):
+    def __call__(self, data, src=None, Ctx=Context, memoize=False):
         """
         Invoke the parser like a function on a regular string of characters.
 
@@ -332,16 +435,38 @@ class Parser(Node, metaclass=_ParserMeta):
         the Context instance. You also can provide a Context subclass if your
         parsers have particular needs not covered by the default
         implementation that provides significant indent and tag stacks.
+
+        Set ``memoize`` to ``True`` to cache the result of every parser that
+        doesn't depend on the indent or tag stacks at each input position it's
+        tried. This makes grammars with heavy backtracking run in linear time
+        at the cost of memory. Error messages may list fewer alternatives since
+        cached failures aren't reported again.
+
+        The input is parsed without tracking errors first since most input is
+        valid. If parsing fails, it's parsed again with error tracking enabled
+        to produce a useful message.
         """
+        text = data if isinstance(data, str) else None
         data = list(data)
         data.append(None)  # add a terminal so we don't overrun
-        ctx = Ctx(data, src=src)
+        if memoize:
+            _mark_memoizable(self)
 
-        try:
-            _, ret = self.process(0, data, ctx)
-            return ret
-        except Exception:
-            pass
+        for track_errors in (False, True):
+            ctx = Ctx(data, src=src)
+            ctx.text = text
+            ctx.track_errors = track_errors
+            if memoize:
+                ctx.memo = {}
+
+            try:
+                _, ret = self.process(0, data, ctx)
+                return ret
+            except Exception:
+                pass
+
+            if ctx.function_error is not None:
+                break
 
         if ctx.function_error is not None:
             pos, msg = ctx.function_error
@@ -397,9 +522,8 @@ class Char(Parser):
     def process(self, pos, data, ctx):
         if data[pos] == self.char:
             return (pos + 1, self.char)
-        msg = "Expected {0}.".format(self.char)
-        ctx.set(pos, msg)
-        raise Exception(msg)
+        ctx.set(pos, "Expected {0}.", self.char)
+        raise Exception()
 
     def __repr__(self):
         if self.name is None:
@@ -427,14 +551,21 @@ class InSet(Parser):
         super(InSet, self).__init__()
         self.values = set(s)
         self.name = name
+        self._regex = None
+
+    def _run_regex(self):
+        # matches a run of zero or more characters in the set. Used by Many.
+        if self._regex is None:
+            cls = _char_class(self.values)
+            self._regex = re.compile(cls + "*" if cls else "")
+        return self._regex
 
     def process(self, pos, data, ctx):
         c = data[pos]
         if c in self.values:
             return (pos + 1, c)
-        msg = "Expected {0}.".format(self)
-        ctx.set(pos, msg)
-        raise Exception(msg)
+        ctx.set(pos, "Expected {0}.", self)
+        raise Exception()
 
     def __repr__(self):
         if self.name is None:
@@ -463,8 +594,34 @@ class String(Parser):
         self.chars = set(chars)
         self.echars = set(echars) if echars else set()
         self.min_length = min_length
+        self._regex = None
+        self._unescape = None
+
+    def _compile(self):
+        cls = _char_class(self.chars)
+        esc = _char_class(self.echars)
+        alts = []
+        if esc:
+            alts.append(r"\\" + esc)
+            self._unescape = re.compile(r"\\(" + esc + ")")
+        if cls:
+            alts.append(cls)
+        self._regex = re.compile("(?:" + "|".join(alts) + ")*" if alts else "")
 
     def process(self, pos, data, ctx):
+        text = ctx.text
+        if text is not None:
+            if self._regex is None:
+                self._compile()
+            m = self._regex.match(text, pos)
+            res = m.group()
+            if self._unescape is not None:
+                res = self._unescape.sub(r"\1", res)
+            if len(res) >= self.min_length:
+                return m.end(), res
+            ctx.set(pos, "Expected {0} of {1}.", self.min_length, sorted(self.chars))
+            raise Exception()
+
         results = []
         p = data[pos]
         old = pos
@@ -479,9 +636,8 @@ class String(Parser):
                 break
             p = data[pos]
         if len(results) < self.min_length:
-            msg = "Expected {0} of {1}.".format(self.min_length, sorted(self.chars))
-            ctx.set(old, msg)
-            raise Exception(msg)
+            ctx.set(old, "Expected {0} of {1}.", self.min_length, sorted(self.chars))
+            raise Exception()
         return pos, "".join(results)
 
 
@@ -528,17 +684,29 @@ class Literal(Parser):
         self.value = value
         self.ignore_case = ignore_case
         self.name = "Literal{0!r}".format(self.chars)
+        self._ascii = all(ord(c) < 128 for c in self.chars)
 
     def process(self, pos, data, ctx):
+        text = ctx.text
+        if text is not None:
+            # failures fall through to the character loop for error reporting
+            end = pos + len(self.chars)
+            if not self.ignore_case:
+                if text.startswith(self.chars, pos):
+                    return end, (self.chars if self.value is self._NULL else self.value)
+            elif self._ascii:
+                s = text[pos:end]
+                if len(s) == len(self.chars) and s.lower() == self.chars:
+                    return end, (s if self.value is self._NULL else self.value)
+
         old = pos
         if not self.ignore_case:
             for c in self.chars:
                 if data[pos] == c:
                     pos += 1
                 else:
-                    msg = "Expected {0!r}.".format(self.chars)
-                    ctx.set(old, msg)
-                    raise Exception(msg)
+                    ctx.set(old, "Expected {0!r}.", self.chars)
+                    raise Exception()
             return pos, (self.chars if self.value is self._NULL else self.value)
         else:
             result = []
@@ -547,9 +715,8 @@ class Literal(Parser):
                     result.append(data[pos])
                     pos += 1
                 else:
-                    msg = "Expected case insensitive {0!r}.".format(self.chars)
-                    ctx.set(old, msg)
-                    raise Exception(msg)
+                    ctx.set(old, "Expected case insensitive {0!r}.", self.chars)
+                    raise Exception()
             return pos, ("".join(result) if self.value is self._NULL else self.value)
 
 
@@ -725,18 +892,27 @@ class Many(Parser):
 
     def process(self, pos, data, ctx):
         orig = pos
-        results = []
         p = self.children[0]
-        while True:
-            try:
-                pos, res = p.process(pos, data, ctx)
-                results.append(res)
-            except Exception:
-                break
+        if ctx.text is not None and type(p) is InSet and not p._debug:
+            m = p._run_regex().match(ctx.text, pos)
+            pos = m.end()
+            results = list(m.group())
+            if ctx.track_errors:
+                # record the failure that would have ended the loop
+                ctx.parser_stack.append(p)
+                ctx.set(pos, "Expected {0}.", p)
+                ctx.parser_stack.pop()
+        else:
+            results = []
+            while True:
+                try:
+                    pos, res = p.process(pos, data, ctx)
+                    results.append(res)
+                except Exception:
+                    break
         if len(results) < self.lower:
             child = self.children[0]
-            msg = "Expected at least {0} of {1}.".format(self.lower, child)
-            ctx.set(orig, msg)
+            ctx.set(orig, "Expected at least {0} of {1}.", self.lower, child)
             raise Exception()
 
         return pos, results
@@ -1150,6 +1326,8 @@ class WithIndent(Wrapper):
 
     """
 
+    _context_sensitive = True
+
     def process(self, pos, data, ctx):
         new, _ = WS.process(pos, data, ctx)
         try:
@@ -1172,6 +1350,8 @@ class HangingString(Parser):
 
     """
 
+    _context_sensitive = True
+
     def __init__(self, chars, echars=None, min_length=1):
         super(HangingString, self).__init__()
         p = String(chars, echars=echars, min_length=min_length)
@@ -1204,6 +1384,8 @@ class StartTagName(Wrapper):
     :py:class:`Context` object.
     """
 
+    _context_sensitive = True
+
     def process(self, pos, data, ctx):
         pos, res = self.children[0].process(pos, data, ctx)
         ctx.tags.append(res)
@@ -1218,6 +1400,8 @@ class EndTagName(Wrapper):
     successful.
     """
 
+    _context_sensitive = True
+
     def __init__(self, parser, ignore_case=False):
         super(EndTagName, self).__init__(parser)
         self.ignore_case = ignore_case
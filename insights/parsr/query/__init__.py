@@ -65,11 +65,12 @@ class Entry(object):
     instances. Each instance has a name, attributes, a parent, and children.
     """
 
-    __slots__ = ("_name", "attrs", "children", "parent", "lineno", "src")
+    __slots__ = ("_name", "attrs", "_children", "parent", "lineno", "src", "_index")
 
     def __init__(
         self, name=None, attrs=None, children=None, lineno=None, src=None, set_parents=True
     ):
+        self._index = None
         if type(name) is str:
             self._name = sys.intern(name)
         elif isinstance(name, bytes):
@@ -78,7 +79,7 @@ class Entry(object):
             self._name = name
 
         self.attrs = attrs if isinstance(attrs, (list, tuple)) else tuple()
-        self.children = children if isinstance(children, (list, tuple)) else []
+        self._children = children if isinstance(children, (list, tuple)) else []
         self.parent = None
         self.lineno = lineno
         self.src = src  # insights.core.Parser instance
@@ -112,6 +113,46 @@ class Entry(object):
 
         return res
 
+    @property
+    def children(self):
+        return self._children
+
+    @children.setter
+    def children(self, children):
+        self._children = children
+        self.invalidate_index()
+
+    def use_index(self, enabled=True):
+        """
+        Enables or disables a name index over the entry and all of its
+        descendants. The index is built the first time a query needs it and
+        lets :py:meth:`select`, :py:meth:`find`, item access, and attribute
+        access look up entries by name instead of checking every node.
+
+        Use it on trees that are queried many times. Assigning ``children`` on
+        any entry in the tree invalidates the index, but changes made to a
+        ``children`` list in place require a call to :py:meth:`invalidate_index`.
+        """
+        self._index = True if enabled else None
+        return self
+
+    def invalidate_index(self):
+        """
+        Discards the index of the entry and of all its ancestors so they're
+        rebuilt the next time they're needed.
+        """
+        cur = self
+        while cur is not None:
+            if cur._index is not None:
+                cur._index = True
+            cur = cur.parent
+
+    def _get_index(self):
+        index = self._index
+        if index is True:
+            index = self._index = _Index(self)
+        return index
+
     def get_keys(self):
         """
         Returns the unique names of all the children as a list.
@@ -257,7 +298,7 @@ class Entry(object):
         instances children, and ``kwargs`` on to :py:func:`select`.
         """
         query = compile_queries(*queries)
-        return select(query, self.children, **kwargs)
+        return select(query, self.children, index=self._get_index(), **kwargs)
 
     def find(self, *queries, **kwargs):
         """
@@ -397,8 +438,14 @@ class Entry(object):
     def __getitem__(self, query):
         if isinstance(query, (int, slice)):
             return self.children[query]
+        nodes = self.children
+        index = self._get_index()
+        if index is not None:
+            key = _name_key(query)
+            if key is not None:
+                nodes = index.children(key)
         query = _desugar(query)
-        return Result(children=[c for c in self.children if query(c)])
+        return Result(children=[c for c in nodes if query(c)])
 
     def __bool__(self):
         return bool(self._name or self.attrs or self.children)
@@ -874,6 +921,91 @@ def _desugar(q):
     return _desugar_name(q)
 
 
+def _name_key(q):
+    """
+    Returns the entry name a query requires if it's a plain string so the
+    candidates can be looked up in an :py:class:`_Index`. Returns ``None``
+    otherwise.
+    """
+    if isinstance(q, tuple):
+        q = q[0] if q else None
+    return q if type(q) is str else None
+
+
+class _Index(object):
+    """
+    _Index maps entry names to the descendants of a root entry.
+
+    ``levels`` has a dictionary for each depth beneath the root that maps
+    names to (parent, entry) pairs in the order a level by level traversal
+    visits them, and ``flat`` and ``descendants`` hold all descendants and
+    descendants by name in the order :py:func:`_flatten` produces them.
+    """
+
+    def __init__(self, root):
+        self.nodes = list(root.children)
+        self.levels = []
+        level = [(root, c) for c in root.children]
+        while level:
+            names = defaultdict(list)
+            for pair in level:
+                name = pair[1]._name
+                if type(name) is str:
+                    names[name].append(pair)
+            self.levels.append((level, names))
+            level = [(n, c) for _, n in level for c in n.children]
+
+        self.flat = _flatten(root.children)
+        self.descendants = defaultdict(list)
+        for n in self.flat:
+            if type(n._name) is str:
+                self.descendants[n._name].append(n)
+
+    def children(self, name):
+        """
+        Returns the immediate children of the root with the given name.
+        """
+        if not self.levels or name not in self.levels[0][1]:
+            return []
+        return [n for _, n in self.levels[0][1][name]]
+
+    def query(self, query, deep=False):
+        """
+        Runs a query returned by :py:func:`compile_queries` against the
+        children of the root or, if deep is ``True``, against all of its
+        descendants. Stages that require a plain string name only consider
+        entries with that name.
+        """
+        stages = getattr(query, "stages", None)
+        if not stages:
+            return query(self.flat if deep else self.nodes)
+
+        if deep:
+            key, q = stages[0]
+            nodes = self.flat if key is None else self.descendants.get(key, [])
+            res = [n for n in nodes if q(n)]
+            for key, q in stages[1:]:
+                if not res:
+                    break
+                res = [n for n in chain.from_iterable(r.children for r in res) if q(n)]
+            return Result(children=res)
+
+        res = []
+        parents = None
+        for depth, (key, q) in enumerate(stages):
+            if depth >= len(self.levels):
+                return Result(children=[])
+            level, names = self.levels[depth]
+            pairs = level if key is None else names.get(key, [])
+            if parents is not None:
+                pairs = [p for p in pairs if p[0] in parents]
+            res = [n for _, n in pairs if q(n)]
+            if not res:
+                break
+            parents = set(res)
+        return Result(children=res)
+
+
 def _flatten(nodes):
     """
     Flatten the config tree into a list of nodes.
@@ -900,6 +1032,7 @@ def compile_queries(*queries):
     are `or'd` together and that result is `anded` with the name query. Any
     query that raises an exception is treated as ``False``.
     """
+    keys = [_name_key(q) for q in queries]
     queries = [_desugar(q) for q in queries]
 
     def match(qs, nodes):
@@ -914,10 +1047,11 @@ def compile_queries(*queries):
     def inner(nodes):
         return Result(children=match(queries, nodes))
 
+    inner.stages = list(zip(keys, queries))
     return inner
 
 
-def select(query, nodes, deep=False, roots=False):
+def select(query, nodes, deep=False, roots=False, index=None):
     """
     select runs query, a function returned by :py:func:`compile_queries`,
     against a list of :py:class:`Entry` instances. If you pass ``deep=True``,
@@ -925,8 +1059,14 @@ def select(query, nodes, deep=False, roots=False):
     results of running the query against it. If you pass ``roots=True``,
     select returns the deduplicated set of final ancestors of all successful
     queries. Otherwise, it returns the matching entries.
+
+    If nodes are the children of an entry with an :py:class:`_Index`, pass it
+    as ``index`` to answer the query from the index.
     """
-    results = query(_flatten(nodes)) if deep else query(nodes)
+    if index is not None:
+        results = index.query(query, deep=deep)
+    else:
+        results = query(_flatten(nodes)) if deep else query(nodes)
 
     if not roots:
         return Result(children=results)
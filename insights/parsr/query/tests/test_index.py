@@ -0,0 +1,92 @@
+from insights.parsr.query import Entry, startswith
+
+
+def make_tree():
+    return Entry(name="root", children=[
+        Entry(name="a", attrs=[1], children=[
+            Entry(name="b", attrs=[2]),
+            Entry(name="a", attrs=[3], children=[
+                Entry(name="b", attrs=[4]),
+                Entry(name="c", attrs=[5]),
+            ]),
+            Entry(name="b", attrs=[6], children=[
+                Entry(name="c", attrs=[7]),
+            ]),
+        ]),
+        Entry(name="b", attrs=[8], children=[
+            Entry(name="a", attrs=[9]),
+        ]),
+        Entry(name="a", attrs=[10], children=[
+            Entry(name="b", attrs=[11]),
+        ]),
+        Entry(name=1, attrs=[12]),
+    ])
+
+
+QUERIES = [
+    ("a",),
+    ("b",),
+    ("missing",),
+    ("a", "b"),
+    ("a", "a", "b"),
+    ("a", "b", "c"),
+    (("a", 10), "b"),
+    (startswith("a"), "b"),
+    ("a", None),
+    (None, "c"),
+    (1,),
+]
+
+
+def values(res):
+    return [c.value for c in res]
+
+
+def test_select_matches_unindexed():
+    plain = make_tree()
+    indexed = make_tree().use_index()
+    for q in QUERIES:
+        for deep in (False, True):
+            for roots in (False, True):
+                expected = values(plain.select(*q, deep=deep, roots=roots))
+                assert values(indexed.select(*q, deep=deep, roots=roots)) == expected, (q, deep, roots)
+
+
+def test_find():
+    tree = make_tree().use_index()
+    assert values(tree.find("a", "b")) == [2, 6, 4, 11]
+    assert values(tree.find("c")) == [5, 7]
+    assert tree._index is not True
+
+
+def test_item_access():
+    tree = make_tree().use_index()
+    assert values(tree["a"]) == [1, 10]
+    assert values(tree["a", 10]) == [10]
+    assert values(tree.b) == [8]
+    assert values(tree.a.b) == [2, 6, 11]
+    assert "c" not in tree
+    assert tree[0].value == 1
+
+
+def test_invalidate():
+    tree = make_tree().use_index()
+    assert values(tree.find("c")) == [5, 7]
+
+    a = tree.children[0]
+    a.children = a.children[:1]
+    assert tree._index is True
+    assert values(tree.find("c")) == []
+
+    tree.children.append(Entry(name="c", attrs=[13]))
+    tree.invalidate_index()
+    assert values(tree.c) == [13]
+    assert values(tree.find("c")) == [13]
+
+
+def test_disable():
+    tree = make_tree().use_index()
+    assert values(tree.a) == [1, 10]
+    tree.use_index(False)
+    assert tree._index is None
+    assert values(tree.a) == [1, 10]
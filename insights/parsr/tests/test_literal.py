@@ -1,3 +1,4 @@
+import pytest
 from insights.parsr import Literal
 
 
@@ -19,3 +20,21 @@ def test_literal_ignore_case():
 def test_literal_value_ignore_case():
     p = Literal("true", value=True, ignore_case=True)
     assert p("TRUE") is True
+
+
+def test_literal_fails():
+    p = Literal("true")
+    with pytest.raises(Exception) as ex:
+        p("trUe")
+    assert "Expected 'true'. Got 't'." in str(ex.value)
+
+    p = Literal("true", ignore_case=True)
+    with pytest.raises(Exception):
+        p("tru")
+    with pytest.raises(Exception):
+        p("İrue")  # lowercases to two characters
+
+
+def test_literal_list_input():
+    p = Literal("true", ignore_case=True)
+    assert p(list("tRUE")) == "tRUE"
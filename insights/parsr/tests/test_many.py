@@ -1,5 +1,5 @@
 import pytest
-from insights.parsr import Char, Many
+from insights.parsr import Char, InSet, Many
 
 
 def test_many():
@@ -52,3 +52,14 @@ def test_many1():
 
     ab = Many(a | b, lower=1)
     assert ab("aababb") == ["a", "a", "b", "a", "b", "b"]
+
+
+def test_many_inset():
+    digits = Many(InSet("0123456789"), lower=2)
+    assert digits("1234a") == ["1", "2", "3", "4"]
+    assert digits(list("1234a")) == ["1", "2", "3", "4"]
+    assert Many(InSet("]^-\\"))("^]-\\x") == ["^", "]", "-", "\\"]
+
+    with pytest.raises(Exception) as ex:
+        (digits + Char("x"))("12345a")
+    assert "Got 'a'." in str(ex.value)
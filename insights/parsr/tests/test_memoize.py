@@ -0,0 +1,57 @@
+import pytest
+from insights.parsr import (Char, EOF, Forward, InSet, Letters, LineEnd, Many, Number,
+                            String, WS, WithIndent, HangingString)
+
+
+def make_expr():
+    expr = Forward()
+    atom = WS >> (Number | (Char("(") >> expr << Char(")"))) << WS
+    expr <= (atom + Char("+") + expr) | (atom + Char("-") + expr) | atom
+    return expr << EOF
+
+
+def test_memoize():
+    top = make_expr()
+    data = "(" * 6 + "1 + 2" + ")" * 6
+    assert top(data, memoize=True) == top(data)
+
+
+def test_memoize_deep():
+    # exponential without memoization
+    top = make_expr()
+    data = "(" * 40 + "1" + ")" * 40
+    assert top(data, memoize=True) == 1
+
+
+def test_memoize_error():
+    top = make_expr()
+    with pytest.raises(Exception) as ex:
+        top("(1 + 2", memoize=True)
+    assert "At line 1 column 7" in str(ex.value)
+
+
+def test_memoize_context_sensitive():
+    Key = WS >> String("abcdefgh") << WS
+    Value = WS >> HangingString(set("abcdefgh "))
+    KVPair = WithIndent(Key + (Char("=") >> Value))
+    Doc = Many(KVPair | Many(InSet("\n"), lower=1)) << EOF
+
+    data = """
+a = b
+    c
+d = e
+""".strip()
+    expected = [["a", "b c"], ["d", "e"]]
+    assert Doc(data) == expected
+    assert Doc(data, memoize=True) == expected
+
+    assert not KVPair._memo
+    assert not Doc._memo
+    assert Key._memo
+
+
+def test_memoize_leaves():
+    p = Letters + LineEnd
+    p("abc", memoize=True)
+    assert p._memo
+    assert not LineEnd.children[0].children[0]._memo
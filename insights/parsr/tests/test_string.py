@@ -1,3 +1,4 @@
+import pytest
 import string
 from insights.parsr import InSet, String, DoubleQuotedString, QuotedString
 
@@ -22,3 +23,29 @@ def test_escaped_string():
     "%h %l %u %t \"%r\" %>s %b \"%{Referer}i\" \"%{User-Agent}i\""
     """.strip()
     assert DoubleQuotedString(data)
+
+
+def test_escaped_string_value():
+    p = DoubleQuotedString
+    data = r'"a \"quoted\" \\ value"'
+    assert p(data) == p(list(data)) == r'a "quoted" \\ value'
+
+
+def test_string_matches_list_input():
+    # strings are matched with a regex, lists character by character
+    p = String("ab\\", echars="b")
+    for data in ["", "a", "ab", r"a\b", r"a\c", "a\\", r"\\b", "\\", "c"]:
+        try:
+            expected = p(list(data))
+        except Exception:
+            with pytest.raises(Exception):
+                p(data)
+        else:
+            assert p(data) == expected
+
+
+def test_string_error():
+    p = String("abc", min_length=2)
+    with pytest.raises(Exception) as ex:
+        p("ad")
+    assert "Expected 2 of ['a', 'b', 'c']. Got 'a'." in str(ex.value)
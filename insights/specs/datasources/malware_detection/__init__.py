@@ -3,10 +3,14 @@ import re
 import time
 import json
 import yaml
+import stat
+import heapq
+import hashlib
 import fnmatch
 from sys import exit
 import logging
 from glob import glob
+from io import StringIO
 from datetime import datetime
 from tempfile import NamedTemporaryFile, gettempdir
 try:
@@ -17,6 +21,7 @@ except ImportError:
     # python 3
     from urllib.parse import urlparse, urlunparse, quote as urlencode
 
+from insights import get_pool
 from insights.client.connection import InsightsConnection
 from insights.client.constants import InsightsConstants as constants
 from insights.client.utilities import (
@@ -31,6 +36,7 @@ MALWARE_APP_URL = 'https://console.redhat.com/insights/malware'
 MALWARE_CONFIG_FILE = os.path.join(constants.default_conf_dir, "malware-detection-config.yml")
 LAST_FILESYSTEM_SCAN_FILE = os.path.join(constants.default_conf_dir, '.last_malware-detection_filesystem_scan')
 LAST_PROCESSES_SCAN_FILE = os.path.join(constants.default_conf_dir, '.last_malware-detection_processes_scan')
+FILESYSTEM_SCAN_INDEX_FILE = os.path.join(constants.insights_core_lib_dir, 'malware-detection_filesystem_scan_index')
 RULE_DOWNLOAD_DIR = constants.insights_core_lib_dir
 DEFAULT_MALWARE_CONFIG = """
 # Configuration file for the Red Hat Insights Malware Detection Client app
@@ -122,6 +128,10 @@ processes_scan_exclude:
 # No value means scan all processes regardless of created date
 processes_scan_since:
 
+# Keep an index of the state (inode, size, modification and change times) of the files scanned, so that later
+# scans only scan new and changed files.  All the files are scanned again when the rules change.  Default is false
+filesystem_scan_index: false
+
 # Add extra metadata about each scan match (if possible), eg file type & md5sum, matching line numbers, process name
 # The extra metadata will display in the webUI along with the scan matches
 add_metadata: true
@@ -135,6 +145,11 @@ nice_value: # 19
 # The max number of CPUs threads used by yara when scanning.  Autodetected, but default is 2
 cpu_thread_limit: # 2
 
+# The max number of yara processes scanning the filesystem at the same time.  Default is 1 (one scan at a time)
+# The items to scan are split into this many shards with about the same number of files in each, so the scans
+# finish at about the same time.  Each scan uses up to cpu_thread_limit threads
+parallel_scans: # 1
+
 # The location of the directory containing 3rd party rules to be used in malware scan
 rules_location: /etc/insights-client/signatures
 
@@ -146,10 +161,11 @@ use_remote_rules: true
 # Env vars are initially strings and need to be parsed to their appropriate type to match the yaml types
 ENV_VAR_TYPES = {
     'boolean': ['SCAN_FILESYSTEM', 'SCAN_PROCESSES', 'TEST_SCAN', 'ADD_METADATA',
-                'EXCLUDE_NETWORK_FILESYSTEM_MOUNTPOINTS', 'USE_REMOTE_RULES'],
+                'EXCLUDE_NETWORK_FILESYSTEM_MOUNTPOINTS', 'USE_REMOTE_RULES', 'FILESYSTEM_SCAN_INDEX'],
     'list': ['FILESYSTEM_SCAN_ONLY', 'FILESYSTEM_SCAN_EXCLUDE', 'PROCESSES_SCAN_ONLY', 'PROCESSES_SCAN_EXCLUDE',
              'NETWORK_FILESYSTEM_TYPES'],
-    'integer': ['SCAN_TIMEOUT', 'NICE_VALUE', 'CPU_THREAD_LIMIT', 'STRING_MATCH_LIMIT'],
+    'integer': ['SCAN_TIMEOUT', 'NICE_VALUE', 'CPU_THREAD_LIMIT', 'STRING_MATCH_LIMIT',
+                'PARALLEL_SCANS'],
     'int_or_str': ['FILESYSTEM_SCAN_SINCE', 'PROCESSES_SCAN_SINCE', 'RULES_LOCATION']
 }
 
@@ -169,7 +185,8 @@ class MalwareDetectionClient:
         for option, value in [('nice_value', 19),
                               ('scan_timeout', 3600),
                               ('cpu_thread_limit', 2),
-                              ('string_match_limit', 10)]:
+                              ('string_match_limit', 10),
+                              ('parallel_scans', 1)]:
             try:
                 setattr(self, option, int(self._get_config_option(option, value)))
             except Exception as e:
@@ -197,6 +214,11 @@ class MalwareDetectionClient:
             exit(constants.sig_kill_bad)
         self.disabled_rules = self._get_disabled_rules()
 
+        # Keep track of the files scanned so unchanged files aren't scanned again by later scans with the same rules
+        self.scan_index = None
+        if self.do_filesystem_scan and not self.test_scan and self._get_config_option('filesystem_scan_index', False):
+            self.scan_index = ScanIndex(FILESYSTEM_SCAN_INDEX_FILE, self._get_rules_hash())
+
         # Build the yara command for non-compiled yara files and yara commands for compiled yara files
         # Compiled yara files must always be run separately.
         # _build_yara_command populates self.non_compiled_files / self.compiled_files
@@ -263,6 +285,10 @@ class MalwareDetectionClient:
                 if self.do_filesystem_scan:
                     write_data_to_file(filesystem_scan_start, LAST_FILESYSTEM_SCAN_FILE)
                     os.chmod(LAST_FILESYSTEM_SCAN_FILE, 0o644)
+                    if self.scan_index:
+                        # Files with matches are scanned again, so their matches are reported by every scan
+                        self.scan_index.save(exclude=[match['source'] for rule in self.host_scan.values()
+                                                      for match in rule['matches']])
                 if self.do_process_scan:
                     write_data_to_file(processes_scan_start, LAST_PROCESSES_SCAN_FILE)
                     os.chmod(LAST_PROCESSES_SCAN_FILE, 0o644)
@@ -923,6 +949,18 @@ class MalwareDetectionClient:
         logger.debug("Disabled rules: %s", disabled_rules)
         return sorted(map(lambda x: x.lower(), disabled_rules))
 
+    def _get_rules_hash(self):
+        """
+        Return a hash of the rules files and disabled rules, ie of what a scan of a file could match
+        """
+        rules_hash = hashlib.sha256()
+        for rules_file in sorted(self.rules_files):
+            with open(rules_file, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    rules_hash.update(chunk)
+        rules_hash.update(json.dumps(sorted(self.disabled_rules)).encode('utf-8'))
+        return rules_hash.hexdigest()
+
     def _build_yara_command(self):
         """
         Get all the switches for the yara command to be run, for example:
@@ -989,11 +1027,13 @@ class MalwareDetectionClient:
             exit(constants.sig_kill_bad)
 
         # Limit the number of threads used by yara to limit the CPU load of the scans
-        # If system has 2 or fewer CPUs, then use just one thread
+        # If system has 2 or fewer CPUs, then use just one thread and run one scan at a time
         nproc = call('nproc').strip()
         if not nproc or int(nproc) <= 2:
             self.cpu_thread_limit = 1
+            self.parallel_scans = 1
         logger.debug("Using %s CPU thread(s) for scanning", self.cpu_thread_limit)
+        logger.debug("Running up to %s filesystem scan(s) at a time", self.parallel_scans)
 
         # Construct the (partial) yara command that will be used later for scanning files and processes
         # The argument for the files and processes that will be scanned will be added later
@@ -1065,6 +1105,8 @@ class MalwareDetectionClient:
 
         insights_log_files = glob(constants.default_log_file + '*')
         self.filesystem_scan_exclude_list.extend(list(set(insights_log_files) - set(self.scan_fsobjects)))
+        scan_index_files = glob(FILESYSTEM_SCAN_INDEX_FILE + '*')
+        self.filesystem_scan_exclude_list.extend(list(set(scan_index_files) - set(self.scan_fsobjects)))
 
         # Exclude temp rules files from any concurrent malware scans to prevent false positives.
         # Covers both standard and bootc environments.
@@ -1090,60 +1132,152 @@ class MalwareDetectionClient:
         logger.info("Starting filesystem scan ...")
         fs_scan_start = time.time()
 
-        for toplevel_dir in sorted(scan_dict):
-            # Make a copy of the self.active_cmd list and add to it the thing to scan
-            cmd = self.active_cmd[:]
-            dir_scan_start = time.time()
-
-            specified_log_txt = "specified " if 'include' in scan_dict[toplevel_dir] else ""
-            if self.filesystem_scan_since_dict['timestamp']:
-                logger.info("Scanning %sfiles in %s modified since %s ...", specified_log_txt, toplevel_dir,
-                            self.filesystem_scan_since_dict['datetime'])
-                # Find the recently modified files in the given top level directory
-                scan_list_file = NamedTemporaryFile(prefix='%s_scan_list.' % os.path.basename(toplevel_dir),
-                                                    mode='w', delete=True)
-                if 'include' in scan_dict[toplevel_dir]:
-                    find_modified_include_items(scan_dict[toplevel_dir]['include'], self.filesystem_scan_since_dict['timestamp'], scan_list_file)
-                else:
-                    find_modified_in_directory(toplevel_dir, self.filesystem_scan_since_dict['timestamp'], scan_list_file)
-
-                scan_list_file.flush()
-                cmd.extend(['--scan-list', scan_list_file.name])
-            else:
-                logger.info("Scanning %sfiles in %s ...", specified_log_txt, toplevel_dir)
-                if 'include' in scan_dict[toplevel_dir]:
+        if self.parallel_scans > 1:
+            self._scan_filesystem_shards(scan_dict)
+        else:
+            for toplevel_dir in sorted(scan_dict):
+                # Make a copy of the self.active_cmd list and add to it the thing to scan
+                cmd = self.active_cmd[:]
+                dir_scan_start = time.time()
+
+                specified_log_txt = "specified " if 'include' in scan_dict[toplevel_dir] else ""
+                if self.filesystem_scan_since_dict['timestamp'] or self.scan_index:
+                    if self.filesystem_scan_since_dict['timestamp']:
+                        logger.info("Scanning %sfiles in %s modified since %s ...", specified_log_txt, toplevel_dir,
+                                    self.filesystem_scan_since_dict['datetime'])
+                    else:
+                        logger.info("Scanning %sfiles in %s changed since they were last scanned ...",
+                                    specified_log_txt, toplevel_dir)
+                    # Find the recently modified files in the given top level directory
                     scan_list_file = NamedTemporaryFile(prefix='%s_scan_list.' % os.path.basename(toplevel_dir),
                                                         mode='w', delete=True)
-                    scan_list_file.write('\n'.join(scan_dict[toplevel_dir]['include']))
+                    if 'include' in scan_dict[toplevel_dir]:
+                        find_modified_include_items(scan_dict[toplevel_dir]['include'], self.filesystem_scan_since_dict['timestamp'],
+                                                    scan_list_file, self.scan_index)
+                    else:
+                        find_modified_in_directory(toplevel_dir, self.filesystem_scan_since_dict['timestamp'], scan_list_file,
+                                                   self.scan_index)
+
                     scan_list_file.flush()
                     cmd.extend(['--scan-list', scan_list_file.name])
                 else:
-                    cmd.append(toplevel_dir)
+                    logger.info("Scanning %sfiles in %s ...", specified_log_txt, toplevel_dir)
+                    if 'include' in scan_dict[toplevel_dir]:
+                        scan_list_file = NamedTemporaryFile(prefix='%s_scan_list.' % os.path.basename(toplevel_dir),
+                                                            mode='w', delete=True)
+                        scan_list_file.write('\n'.join(scan_dict[toplevel_dir]['include']))
+                        scan_list_file.flush()
+                        cmd.extend(['--scan-list', scan_list_file.name])
+                    else:
+                        cmd.append(toplevel_dir)
+
+                logger.debug("Yara command: %s", cmd)
+                try:
+                    output = call([cmd]).strip()
+                except CalledProcessError as cpe:  # pragma: no cover
+                    logger.debug("Unable to scan %s: %s", toplevel_dir, cpe.output.strip())
+                    self._forget_scan_list(cmd)
+                    continue
+
+                try:
+                    self.parse_scan_output(output.strip())
+                except Exception as e:  # pragma: no cover
+                    self._forget_scan_list(cmd)
+                    self.potential_matches += 1
+                    logger.exception("Rule match(es) potentially found in %s but problems encountered parsing the results: %s.  Skipping ...",
+                                     toplevel_dir, str(e))
+
+                dir_scan_end = time.time()
+                logger.info("Scan time for %s: %d seconds", toplevel_dir, (dir_scan_end - dir_scan_start))
+                if dir_scan_end - dir_scan_start >= self.scan_timeout - 2:  # pragma: no cover
+                    self._forget_scan_list(cmd)
+                    logger.warning("Scan of %s timed-out after %d seconds and may not have been fully scanned.  "
+                                   "Consider increasing the scan_timeout value in %s",
+                                   toplevel_dir, self.scan_timeout, MALWARE_CONFIG_FILE)
 
+        fs_scan_end = time.time()
+        logger.info("Filesystem scan time: %s", time.strftime("%H:%M:%S", time.gmtime(fs_scan_end - fs_scan_start)))
+        return True
+
+    def _scan_filesystem_shards(self, scan_dict):
+        """
+        Scan the items in scan_dict with up to self.parallel_scans yara processes running at the same time
+        The items are split into shards with about the same number of files in each and each shard is scanned by
+        its own yara process.  The output of each scan is parsed in turn as the scans finish
+        """
+        items = []
+        for toplevel_dir in sorted(scan_dict):
+            if self.filesystem_scan_since_dict['timestamp'] or self.scan_index:
+                logger.info("Finding files in %s to scan ...", toplevel_dir)
+                modified = StringIO()
+                if 'include' in scan_dict[toplevel_dir]:
+                    find_modified_include_items(scan_dict[toplevel_dir]['include'], self.filesystem_scan_since_dict['timestamp'],
+                                                modified, self.scan_index)
+                else:
+                    find_modified_in_directory(toplevel_dir, self.filesystem_scan_since_dict['timestamp'], modified,
+                                               self.scan_index)
+                items.extend((item, 1) for item in modified.getvalue().splitlines())
+            else:
+                items.extend(weigh_scan_items(scan_dict[toplevel_dir].get('include', [toplevel_dir]),
+                                              self.parallel_scans))
+
+        shards = split_scan_items(items, self.parallel_scans)
+        scan_list_files = []
+        for shard in shards:
+            scan_list_file = NamedTemporaryFile(prefix='shard_scan_list.', mode='w', delete=True)
+            scan_list_file.write('\n'.join(shard))
+            scan_list_file.flush()
+            scan_list_files.append(scan_list_file)
+
+        def scan_shard(scan_list_file):
+            cmd = self.active_cmd + ['--scan-list', scan_list_file.name]
             logger.debug("Yara command: %s", cmd)
+            shard_scan_start = time.time()
             try:
                 output = call([cmd]).strip()
             except CalledProcessError as cpe:  # pragma: no cover
-                logger.debug("Unable to scan %s: %s", toplevel_dir, cpe.output.strip())
-                continue
-
-            try:
-                self.parse_scan_output(output.strip())
-            except Exception as e:  # pragma: no cover
-                self.potential_matches += 1
-                logger.exception("Rule match(es) potentially found in %s but problems encountered parsing the results: %s.  Skipping ...",
-                                 toplevel_dir, str(e))
+                output, error = None, cpe.output.strip()
+            else:
+                error = None
+            return cmd, output, error, time.time() - shard_scan_start
 
-            dir_scan_end = time.time()
-            logger.info("Scan time for %s: %d seconds", toplevel_dir, (dir_scan_end - dir_scan_start))
-            if dir_scan_end - dir_scan_start >= self.scan_timeout - 2:  # pragma: no cover
-                logger.warning("Scan of %s timed-out after %d seconds and may not have been fully scanned.  "
-                               "Consider increasing the scan_timeout value in %s",
-                               toplevel_dir, self.scan_timeout, MALWARE_CONFIG_FILE)
+        logger.info("Scanning %d files in %d shards, %d at a time ...",
+                    sum(weight for _, weight in items), len(shards), self.parallel_scans)
+        try:
+            with get_pool(True, "insights-malware-scan", {"max_workers": self.parallel_scans}) as pool:
+                results = pool.map(scan_shard, scan_list_files) if pool else map(scan_shard, scan_list_files)
+                for shard_num, (cmd, output, error, scan_time) in enumerate(results, 1):
+                    if error is not None:  # pragma: no cover
+                        logger.debug("Unable to scan shard %d: %s", shard_num, error)
+                        self._forget_scan_list(cmd)
+                        continue
 
-        fs_scan_end = time.time()
-        logger.info("Filesystem scan time: %s", time.strftime("%H:%M:%S", time.gmtime(fs_scan_end - fs_scan_start)))
-        return True
+                    try:
+                        self.parse_scan_output(output)
+                    except Exception as e:  # pragma: no cover
+                        self._forget_scan_list(cmd)
+                        self.potential_matches += 1
+                        logger.exception("Rule match(es) potentially found in shard %d but problems encountered parsing the results: %s.  Skipping ...",
+                                         shard_num, str(e))
+
+                    logger.info("Scan time for shard %d: %d seconds", shard_num, scan_time)
+                    if scan_time >= self.scan_timeout - 2:  # pragma: no cover
+                        self._forget_scan_list(cmd)
+                        logger.warning("Scan of shard %d timed-out after %d seconds and may not have been fully scanned.  "
+                                       "Consider increasing the scan_timeout value in %s",
+                                       shard_num, self.scan_timeout, MALWARE_CONFIG_FILE)
+        finally:
+            for scan_list_file in scan_list_files:
+                scan_list_file.close()
+
+    def _forget_scan_list(self, cmd):
+        """
+        Remove the files in the scan list of the failed yara command 'cmd' from the scan index, so they are scanned again
+        """
+        if not self.scan_index or '--scan-list' not in cmd:
+            return
+        with open(cmd[cmd.index('--scan-list') + 1]) as f:
+            self.scan_index.forget(f.read().splitlines())
 
     def scan_processes(self):
         if not self.do_process_scan:
@@ -2019,36 +2153,215 @@ def get_scan_since_timestamp(scan_since_option, since):
         exit(constants.sig_kill_bad)
 
 
-def is_recent_mtime(item, timestamp):
+def count_files_in_directory(directory):
+    """
+    Return a dict of the number of files under each directory in 'directory', including 'directory' itself
+    Symlinks aren't followed, the same as when yara scans recursively
+    """
+    counts = {}
+    for root, dirs, files in os.walk(directory, topdown=False):
+        counts[root] = len(files) + sum(counts.get(os.path.join(root, d), 0) for d in dirs)
+    return counts
+
+
+def weigh_scan_items(item_list, shards):
+    """
+    Return a list of (item, number of files) tuples for the given list of items (files/directories)
+    Directories containing more than an even share of the files across 'shards' scans are replaced with their
+    contents, so that the items can be split evenly across the scans
+    """
+    counts = {}
+    for item in item_list:
+        if os.path.isdir(item) and not os.path.islink(item):
+            counts.update(count_files_in_directory(item))
+    share = max(sum(counts.get(item, 1) for item in item_list) // shards, 1)
+
+    weighed = []
+    # item_list may be a set, so sort it for a stable order
+    pending = sorted(item_list, reverse=True)
+    while pending:
+        item = pending.pop()
+        if counts.get(item, 1) > share and item in counts:
+            try:
+                contents = sorted(os.listdir(item))
+            except OSError:  # pragma: no cover
+                contents = []
+            contents = [os.path.join(item, c) for c in contents]
+            # Only regular files and directories, yara could hang reading the likes of pipes
+            contents = [c for c in contents if not os.path.islink(c) and (os.path.isfile(c) or os.path.isdir(c))]
+            if contents:
+                pending.extend(reversed(contents))
+                continue
+        weighed.append((item, counts.get(item, 1)))
+    return weighed
+
+
+def split_scan_items(weighed_items, shards):
     """
-    Return True if the given 'item' has a modification time that is newer than 'timestamp'
-    Return False otherwise, or if the the 'item' is a link or another non-file type (eg pipes)
+    Split the list of (item, number of files) tuples into at most 'shards' lists of items with about the same
+    number of files in each.  The biggest items are added first, each to the shard with the fewest files so far
     """
-    if os.path.exists(item) and not os.path.islink(item) and os.path.isfile(item):
-        return os.path.getmtime(item) > timestamp
-    return False  # pragma: no cover
+    heap = [(0, i, []) for i in range(shards)]
+    for item, count in sorted(weighed_items, key=lambda x: -x[1]):
+        total, i, shard = heapq.heappop(heap)
+        shard.append(item)
+        heapq.heappush(heap, (total + count, i, shard))
+    return [shard for _, _, shard in sorted(heap, key=lambda x: x[1]) if shard]
 
 
-def find_modified_in_directory(directory, timestamp, output_file):
+def walk_regular_files(directory):
     """
-    Find files in 'directory' that have been created/modified since 'timestamp'
-    and write their names to 'output_file'
+    Yield (path, stat result) for each regular file under 'directory', stat'ing each entry just once
+    Symlinks aren't followed and other non-file types (eg pipes) are skipped
     """
-    for root, dirs, files in os.walk(directory):
-        for afile in files:
-            path = os.path.join(root, afile)
-            if is_recent_mtime(path, timestamp):
-                output_file.write(path + "\n")
+    pending = [directory]
+    while pending:
+        try:
+            entries = list(os.scandir(pending.pop()))
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                st = entry.stat(follow_symlinks=False)
+            except OSError:  # pragma: no cover
+                continue
+            if stat.S_ISREG(st.st_mode):
+                yield entry.path, st
+        pending.extend(reversed(subdirs))
 
 
-def find_modified_include_items(item_list, timestamp, output_file):
+def is_file_to_scan(path, st, timestamp, scan_index):
     """
-    Find files in the given list of items (files/directories) that have been created/modified since 'timestamp'
-    and write their names to 'output_file'
+    Return True if the file 'path' with the stat result 'st' was modified since 'timestamp', if there is one,
+    and has changed since it was last scanned according to 'scan_index', if there is one
+    """
+    if timestamp and st.st_mtime <= timestamp:
+        if scan_index is not None:
+            scan_index.keep(path, st)
+        return False
+    return scan_index is None or scan_index.changed(path, st)
+
+
+def find_modified_in_directory(directory, timestamp, output_file, scan_index=None):
+    """
+    Find files in 'directory' that have been created/modified since 'timestamp', and if there is a 'scan_index',
+    changed since they were last scanned, and write their names to 'output_file'
+    """
+    for path, st in walk_regular_files(directory):
+        if is_file_to_scan(path, st, timestamp, scan_index):
+            output_file.write(path + "\n")
+
+
+def find_modified_include_items(item_list, timestamp, output_file, scan_index=None):
+    """
+    Find files in the given list of items (files/directories) that have been created/modified since 'timestamp',
+    and if there is a 'scan_index', changed since they were last scanned, and write their names to 'output_file'
     """
     for item in item_list:
         if os.path.isdir(item):
-            find_modified_in_directory(item, timestamp, output_file)
+            find_modified_in_directory(item, timestamp, output_file, scan_index)
         else:
-            if is_recent_mtime(item, timestamp):  # pragma: no cover
+            try:
+                st = os.lstat(item)
+            except OSError:  # pragma: no cover
+                continue
+            if stat.S_ISREG(st.st_mode) and is_file_to_scan(item, st, timestamp, scan_index):
                 output_file.write(item + '\n')
+
+
+class ScanIndex(object):
+    """
+    An on-disk index of the state of the files scanned with a particular set of rules
+
+    A file's state is its inode, size, and modification and change times.  A file whose state hasn't changed since
+    it was last scanned with the same rules doesn't need scanning again.  The index is a JSON lines file, with the
+    hash of the rules on the first line and then a [path, inode, size, mtime, ctime] list for each file
+    """
+    VERSION = 1
+
+    def __init__(self, path, rules_hash):
+        self.path = path
+        self.rules_hash = rules_hash
+        # The state of the files when they were last scanned, and the state of the files found by this scan
+        self.files = self._load()
+        self.scanned = {}
+
+    @staticmethod
+    def file_state(st):
+        mtime = getattr(st, 'st_mtime_ns', None) or int(st.st_mtime * 1e9)
+        ctime = getattr(st, 'st_ctime_ns', None) or int(st.st_ctime * 1e9)
+        return (st.st_ino, st.st_size, mtime, ctime)
+
+    def _load(self):
+        files = {}
+        if not os.path.isfile(self.path):
+            logger.info("No filesystem scan index %s.  Scanning all files ...", self.path)
+            return files
+        try:
+            with open(self.path) as f:
+                header = json.loads(f.readline())
+                if header != {'version': self.VERSION, 'rules': self.rules_hash}:
+                    logger.info("The rules have changed since the filesystem scan index was written.  Scanning all files ...")
+                    return files
+                for line in f:
+                    entry = json.loads(line)
+                    files[entry[0]] = tuple(entry[1:])
+        except Exception as e:
+            logger.warning("Unable to read the filesystem scan index %s: %s.  Scanning all files ...", self.path, str(e))
+            return {}
+        logger.debug("Loaded the state of %d files from the filesystem scan index %s", len(files), self.path)
+        return files
+
+    def changed(self, path, st):
+        """
+        Return True if the file 'path' with the stat result 'st' has changed since it was last scanned
+        The file is expected to be scanned if it has changed, so its state is recorded either way
+        """
+        state = self.file_state(st)
+        self.scanned[path] = state
+        return self.files.get(path) != state
+
+    def keep(self, path, st):
+        """
+        Keep the state of the file 'path' with the stat result 'st' that isn't scanned this time, eg because it wasn't
+        modified since the filesystem_scan_since timestamp, if it hasn't changed since it was last scanned
+        """
+        state = self.file_state(st)
+        if self.files.get(path) == state:
+            self.scanned[path] = state
+
+    def forget(self, paths):
+        """
+        Forget the given files, eg because their scan failed, so they are scanned again next time
+        """
+        for path in paths:
+            self.scanned.pop(path, None)
+
+    def save(self, exclude=()):
+        """
+        Write the state of the files found by this scan to disk, less the 'exclude' files
+        """
+        exclude = set(exclude)
+        f = None
+        try:
+            with NamedTemporaryFile(prefix=os.path.basename(self.path) + '.', mode='w',
+                                    dir=os.path.dirname(self.path), delete=False) as f:
+                f.write(json.dumps({'version': self.VERSION, 'rules': self.rules_hash}, sort_keys=True) + '\n')
+                for path, state in self.scanned.items():
+                    if path in exclude:
+                        continue
+                    try:
+                        line = json.dumps([path] + list(state))
+                    except (TypeError, ValueError, UnicodeError):  # pragma: no cover
+                        continue
+                    f.write(line + '\n')
+            os.chmod(f.name, 0o600)
+            os.rename(f.name, self.path)
+        except Exception as e:  # pragma: no cover
+            logger.warning("Unable to write the filesystem scan index %s: %s", self.path, str(e))
+            if f is not None and os.path.exists(f.name):
+                os.remove(f.name)
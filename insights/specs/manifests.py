@@ -49,6 +49,24 @@ client:
     args:
       max_workers: null
 
+  # Optionally keep how long specs took in a json file. In parallel mode the
+  # slowest specs are started first. "on_timeout" can be "skip" or a number
+  # of seconds to lower the timeout of specs that timed out in each of the
+  # last "runs" runs.
+  # history:
+  #   path: /var/lib/insights/collection_history.json
+  #   runs: 3
+  #   on_timeout: skip
+
+  # Optionally reuse the cleaned content of files that haven't changed since
+  # the previous collection. Content obfuscated with a mapping isn't cached.
+  # cache:
+  #   path: /var/cache/insights/collection
+
+  # Optionally store files with the same content once. Archives collected this
+  # way need a version of insights-core that restores the duplicates.
+  # dedup: true
+
 plugins:
   # disable everything by default
   # defaults to false if not specified.
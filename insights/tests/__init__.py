@@ -11,7 +11,6 @@ from collections import defaultdict
 from functools import wraps
 from io import StringIO
 from operator import eq
-from yaml import SafeLoader
 
 import insights
 
@@ -22,9 +21,9 @@ from insights.core.plugins import make_none
 from insights.specs import Specs
 
 
-# Use yaml.SafeLoader when testing plugins, as the yaml.CSafeLoader
+# Use the pure python loader when testing plugins, as the yaml.CSafeLoader
 # does not work well with coverage test.
-insights.core._PatchedSafeLoader = SafeLoader
+insights.core._PatchedSafeLoader = insights.core._PatchedPySafeLoader
 # we intercept the add_filter call during integration testing so we can ensure
 # that rules add filters to datasources that *should* be filterable
 ADDED_FILTERS = defaultdict(set)
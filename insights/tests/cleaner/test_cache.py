@@ -0,0 +1,145 @@
+import os
+import shutil
+import time
+
+from tempfile import mkdtemp
+
+from insights.cleaner import Cleaner
+from insights.cleaner.cache import INDEX_FILE, ContentCache
+from insights.client.config import InsightsConfig
+from insights.core.context import HostContext
+from insights.core.plugins import datasource
+from insights.core.spec_factory import TextFileProvider
+
+
+@datasource(HostContext)
+def the_file(broker):
+    pass
+
+
+def make_file(root, name, content, age=60):
+    path = os.path.join(root, name)
+    with open(path, "w") as f:
+        f.write(content)
+    past = time.time() - age
+    os.utime(path, (past, past))
+    return path
+
+
+def test_fingerprint():
+    cleaner = Cleaner(InsightsConfig(), {"patterns": ["secret"]})
+    assert cleaner.fingerprint() == '[[["secret"], false], ["password"]]'
+    assert cleaner.fingerprint(no_redact=True) == '[null, ["password"]]'
+    assert cleaner.fingerprint(no_obfuscate=["password"]) == '[[["secret"], false], []]'
+
+    cleaner = Cleaner(InsightsConfig(obfuscate=True), {})
+    assert cleaner.fingerprint() is None
+    assert cleaner.fingerprint(no_obfuscate=["ipv4", "ipv6", "mac"]) == '[null, ["password"]]'
+
+    cleaner = Cleaner(InsightsConfig(), {"keywords": ["foo"]})
+    assert cleaner.fingerprint() is None
+
+
+def test_store_restore_save():
+    tmp = mkdtemp()
+    try:
+        src = make_file(tmp, "src", "one\ntwo")
+        cache = ContentCache(os.path.join(tmp, "cache"), version="1")
+        key = cache.key("src", 1)
+        assert key == cache.key("src", 1)
+        assert key != cache.key("src", 2)
+
+        dst = os.path.join(tmp, "out", "dst")
+        assert cache.restore(key, dst) is None
+        cache.store(key, src)
+        cache.store(cache.key("other"), src)
+        assert cache.restore(key, dst) == 7
+        with open(dst) as f:
+            assert f.read() == "one\ntwo"
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.save()
+        assert os.path.exists(os.path.join(tmp, "cache", INDEX_FILE))
+
+        cache = ContentCache(os.path.join(tmp, "cache"), version="1")
+        assert cache.restore(key, dst) == 7
+        cache.save()
+
+        # only the entries used by the last run are kept
+        cache = ContentCache(os.path.join(tmp, "cache"), version="1")
+        assert cache.restore(cache.key("other"), dst) is None
+        assert cache.restore(key, dst) == 7
+
+        # another version ignores the entries and removes their content
+        cache = ContentCache(os.path.join(tmp, "cache"), version="2")
+        assert cache.restore(key, dst) is None
+        cache.save()
+        objects = [f for _, _, files in os.walk(cache.objects) for f in files]
+        assert objects == []
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_text_file_provider_uses_cache():
+    tmp = mkdtemp()
+    try:
+        make_file(tmp, "sample", "abc\npassword: p4ss\n")
+        cleaner = Cleaner(InsightsConfig(), {})
+        cleaner.cache = ContentCache(os.path.join(tmp, "cache"))
+        dst = os.path.join(tmp, "out", "sample")
+
+        tfp = TextFileProvider("sample", root=tmp, ds=the_file, ctx=HostContext(), cleaner=cleaner)
+        tfp.record_stats()
+        tfp.write(dst)
+        assert tfp.loaded is False
+        assert "cache_hits" not in tfp.stats
+        with open(dst) as f:
+            expected = f.read()
+        assert "p4ss" not in expected
+        os.remove(dst)
+
+        tfp = TextFileProvider("sample", root=tmp, ds=the_file, ctx=HostContext(), cleaner=cleaner)
+        tfp.record_stats()
+        tfp.write(dst)
+        assert tfp.stats["cache_hits"] == 1
+        assert "lines_read" not in tfp.stats
+        with open(dst) as f:
+            assert f.read() == expected
+
+        # a change to the file is a miss
+        make_file(tmp, "sample", "abc\ndef\n")
+        tfp = TextFileProvider("sample", root=tmp, ds=the_file, ctx=HostContext(), cleaner=cleaner)
+        tfp.record_stats()
+        tfp.write(dst)
+        assert "cache_hits" not in tfp.stats
+        with open(dst) as f:
+            assert f.read() == "abc\ndef"
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_text_file_provider_skips_cache():
+    tmp = mkdtemp()
+    try:
+        dst = os.path.join(tmp, "out", "sample")
+
+        # recently modified files
+        make_file(tmp, "sample", "abc\n", age=0)
+        cleaner = Cleaner(InsightsConfig(), {})
+        cleaner.cache = ContentCache(os.path.join(tmp, "cache"))
+        for _ in range(2):
+            tfp = TextFileProvider("sample", root=tmp, ds=the_file, ctx=HostContext(), cleaner=cleaner)
+            tfp.record_stats()
+            tfp.write(dst)
+            assert "cache_hits" not in tfp.stats
+
+        # obfuscated content
+        make_file(tmp, "sample", "abc\n")
+        cleaner = Cleaner(InsightsConfig(obfuscate=True), {})
+        cleaner.cache = ContentCache(os.path.join(tmp, "cache"))
+        for _ in range(2):
+            tfp = TextFileProvider("sample", root=tmp, ds=the_file, ctx=HostContext(), cleaner=cleaner)
+            tfp.record_stats()
+            tfp.write(dst)
+            assert "cache_hits" not in tfp.stats
+    finally:
+        shutil.rmtree(tmp)
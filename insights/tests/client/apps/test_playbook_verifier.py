@@ -17,6 +17,12 @@ from insights.client.apps.ansible import playbook_verifier
 from insights.client.apps.ansible.playbook_verifier import verify, PlaybookVerificationError, get_play_revocation_list, load_playbook_yaml  # noqa
 
 
+@pytest.fixture(autouse=True)
+def clear_revocation_lists():
+    # verified revocation lists are kept for the life of the process
+    playbook_verifier._verified_revocation_lists.clear()
+
+
 class TestErrors:
     @patch("insights.client.apps.ansible.playbook_verifier.get_play_revocation_list", return_value=[])
     def test_vars_not_found_error(self, mock_method):
@@ -196,6 +202,41 @@ class TestErrors:
         assert revoked_error in str(error.value)
 
 
+class TestVerificationSession:
+    @patch('insights.client.apps.ansible.playbook_verifier.get_public_key',
+           wraps=playbook_verifier.get_public_key)
+    @patch('insights.client.apps.ansible.playbook_verifier.contrib.gnupg.GPG.verify_data')
+    def test_verify_plays(self, verify_data, get_public_key):
+        verify_data.return_value = mock.MagicMock(valid=True, status="mocked status")
+        plays = [
+            {
+                'name': name,
+                'vars': {
+                    'insights_signature': 'TFMwdExTMUNSVWRKVGlCUVIxQWdVMGxIVGtGVVZWSkZMUzB0TFMwS0N==',
+                    'insights_signature_exclude': '/vars/insights_signature'
+                }
+            }
+            for name in ("first play", "second play")
+        ]
+
+        temp_dir = tempfile.mkdtemp(dir="/tmp/", prefix="insights_")
+        try:
+            with patch.object(constants, "insights_core_lib_dir", temp_dir):
+                assert playbook_verifier.verify_plays(plays) == plays
+                # the key is imported once for the revocation list and both plays
+                assert get_public_key.call_count == 1
+                assert verify_data.call_count == 3
+                signature_dir = os.path.dirname(verify_data.call_args[0][0])
+                assert not os.path.exists(signature_dir)
+
+                # the verified revocation list is reused
+                assert playbook_verifier.verify_plays(plays[:1]) == plays[:1]
+                assert get_public_key.call_count == 2
+                assert verify_data.call_count == 4
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
 class TestExcludeDynamicElements:
     def test_ok_signature(self):
         source = {
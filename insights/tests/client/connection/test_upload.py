@@ -1,14 +1,160 @@
+import hashlib
+import json
+import os
+import threading
+
+import pytest
+
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from unittest.mock import Mock, patch
+
+from insights.client import client
+from insights.client.archive import TarStream
+from insights.client.config import InsightsConfig
 from insights.client.connection import InsightsConnection
 
 
-@patch('insights.client.connection.largest_spec_in_archive', return_value=("insights/big", 100, "insights.spec-big"))
+SPECS = [
+    {"name": "insights.spec-many", "size": 150, "largest_file": "insights/many/1", "largest_size": 50},
+    {"name": "insights.spec-big", "size": 100, "largest_file": "insights/big", "largest_size": 100},
+]
+
+
+@patch('insights.client.connection.specs_by_size', return_value=SPECS)
 def test_archive_too_big(largest_archive_file):
     config = Mock(base_url="www.example.com", proxy=None)
     connection = InsightsConnection(config)
     with patch("insights.client.connection.os.stat", **{"return_value.st_size": 104857600}):
         with patch('insights.client.connection.logger.info') as mock_logger:
             connection._archive_too_big("archive_file")
-            largest_archive_file.assert_called_once_with("archive_file")
-            assert mock_logger.call_count == 3
-            assert ["insights.spec-big" in args[0][0] for args in mock_logger.call_args_list]
+            largest_archive_file.assert_called_once_with("archive_file", n=None)
+            assert mock_logger.call_count == 5
+            assert mock_logger.call_args_list[2][0][1:] == ("insights/big", 100 / (1024.0 * 1024))
+            assert "insights.spec-many" in mock_logger.call_args_list[3][0][1]
+            assert mock_logger.call_args_list[4][0][1] == "insights.spec-big"
+
+
+@patch('insights.client.connection.specs_by_size', return_value=[])
+def test_archive_too_big_no_specs(specs_by_size):
+    config = Mock(base_url="www.example.com", proxy=None)
+    connection = InsightsConnection(config)
+    with patch("insights.client.connection.os.stat", **{"return_value.st_size": 104857600}):
+        with patch('insights.client.connection.logger.info') as mock_logger:
+            connection._archive_too_big("archive_file")
+            assert mock_logger.call_count == 2
+
+
+@patch('insights.client.connection.specs_by_size')
+def test_archive_too_big_largest_file_past_listing(specs_by_size):
+    # the largest file is in a spec with less data than the ten listed
+    specs = [{"name": "insights.spec-%d" % i, "size": 200 - i, "largest_file": "insights/%d" % i, "largest_size": 20}
+             for i in range(11)]
+    specs[10]["largest_file"], specs[10]["largest_size"] = "insights/big", 150
+    specs_by_size.return_value = specs
+    config = Mock(base_url="www.example.com", proxy=None)
+    connection = InsightsConnection(config)
+    with patch("insights.client.connection.os.stat", **{"return_value.st_size": 104857600}):
+        with patch('insights.client.connection.logger.info') as mock_logger:
+            connection._archive_too_big("archive_file")
+            assert mock_logger.call_args_list[2][0][1] == "insights/big"
+            assert "insights.spec-9:" in mock_logger.call_args_list[3][0][1]
+            assert "insights.spec-10:" not in mock_logger.call_args_list[3][0][1]
+            assert mock_logger.call_args_list[4][0][1] == "insights.spec-10"
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    """
+    Stands in for the ingress service, keeps the uploads it receives
+    """
+    uploads = []
+    status = []
+
+    def do_POST(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            body = b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+                if not size:
+                    break
+        else:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+        message = BytesParser().parsebytes(
+            b"Content-Type: " + self.headers["Content-Type"].encode("utf-8") + b"\r\n\r\n" + body
+        )
+        parts = dict((part.get_param("name", header="content-disposition"), part) for part in message.get_payload())
+        self.uploads.append((self.headers, parts))
+        self.send_response(self.status.pop(0) if self.status else 202)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upload_server():
+    server = HTTPServer(("127.0.0.1", 0), UploadHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    try:
+        yield "http://127.0.0.1:%d/api/ingress/v1/upload" % server.server_port
+    finally:
+        server.shutdown()
+        server.server_close()
+        del UploadHandler.uploads[:]
+        del UploadHandler.status[:]
+
+
+def make_archive_dir(tmpdir):
+    archive_dir = tmpdir.mkdir("insights-archive")
+    archive_dir.mkdir("data").join("uptime").write("up 2 days")
+    return str(archive_dir)
+
+
+@patch("insights.client.connection.InsightsUploadConf.get_rm_conf", Mock(return_value={}))
+@patch("insights.client.connection.get_canonical_facts", Mock(return_value={"fqdn": "test.example.com"}))
+def test_upload_tar_stream(upload_server, tmpdir):
+    config = InsightsConfig(upload_url=upload_server, legacy_upload=False)
+    connection = InsightsConnection(config)
+    stream = TarStream(make_archive_dir(tmpdir), "gz")
+    upload = connection.upload_archive(stream, "application/vnd.redhat.advisor.collection+tgz")
+    assert upload.status_code == 202
+
+    headers, parts = UploadHandler.uploads[0]
+    assert headers["Transfer-Encoding"] == "chunked"
+    assert parts["file"].get_filename() == "insights-archive.tar.gz"
+    assert parts["file"].get_content_type() == "application/vnd.redhat.advisor.collection+tgz"
+    data = parts["file"].get_payload(decode=True)
+    assert hashlib.sha256(data).hexdigest() == stream.sha256
+    with open(stream.name, "rb") as f:
+        assert f.read() == data
+    assert json.loads(parts["metadata"].get_payload())["fqdn"] == "test.example.com"
+
+
+@patch("insights.client.client.write_to_disk", Mock())
+@patch("insights.client.client.os.chmod", Mock())
+@patch("insights.client.client.time.sleep", Mock())
+@patch("insights.client.connection.InsightsUploadConf.get_rm_conf", Mock(return_value={}))
+@patch("insights.client.connection.get_canonical_facts", Mock(return_value={"fqdn": "test.example.com"}))
+def test_upload_tar_stream_retry(upload_server, tmpdir):
+    """
+    A failed streamed upload is retried with the tar file it was spooled to
+    """
+    UploadHandler.status.append(503)
+    config = InsightsConfig(upload_url=upload_server, legacy_upload=False, stream_upload=True, retries=2)
+    connection = InsightsConnection(config)
+    archive_dir = make_archive_dir(tmpdir)
+    client.upload(config, connection, archive_dir, "application/vnd.redhat.advisor.collection+tgz")
+
+    assert not os.path.exists(archive_dir)
+    (first_headers, first), (second_headers, second) = UploadHandler.uploads
+    assert first_headers["Transfer-Encoding"] == "chunked"
+    assert "Transfer-Encoding" not in second_headers
+    assert first["file"].get_payload(decode=True) == second["file"].get_payload(decode=True)
+    with open(archive_dir + ".tar.gz", "rb") as f:
+        assert f.read() == second["file"].get_payload(decode=True)
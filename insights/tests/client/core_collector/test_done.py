@@ -20,3 +20,32 @@ def test_dir_returned(_):
     ret = d.done()
     d.archive.create_tar_file.assert_not_called()
     assert ret == d.archive.archive_dir
+
+
+@patch('insights.client.core_collector.InsightsArchive')
+def test_streamed_archive_returned(_):
+    c = InsightsConfig(stream_archive=True)
+    d = CoreCollector(c)
+    d.archive.tar_file = '/var/tmp/insights.tar.gz'
+    ret = d.done()
+    d.archive.create_tar_file.assert_not_called()
+    assert ret == '/var/tmp/insights.tar.gz'
+
+
+@patch('insights.client.core_collector.InsightsArchive')
+def test_streamed_upload_dir_returned(_):
+    c = InsightsConfig(stream_upload=True)
+    d = CoreCollector(c)
+    d.archive.archive_dir = '/var/tmp/insights/insights-archive'
+    ret = d.done()
+    d.archive.create_tar_file.assert_not_called()
+    assert ret == '/var/tmp/insights/insights-archive'
+    assert d.archive.tar_file == '/var/tmp/insights/insights-archive.tar.gz'
+
+
+@patch('insights.client.core_collector.InsightsArchive')
+def test_streamed_upload_no_upload(_):
+    c = InsightsConfig(stream_upload=True, no_upload=True)
+    d = CoreCollector(c)
+    ret = d.done()
+    assert ret == d.archive.create_tar_file.return_value
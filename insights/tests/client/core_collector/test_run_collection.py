@@ -16,3 +16,18 @@ def test_run_collection(collect, create_archive_dir, systemd_notify_init_thread,
     create_archive_dir.assert_called_once()
     collect.collect.assert_called_once()
     logger.debug.assert_called_with('Core collection finished.')
+
+
+@patch('insights.client.core_collector.systemd_notify_init_thread', return_value=None)
+@patch('insights.client.core_collector.InsightsArchive.create_archive_dir', return_value=None)
+@patch('insights.client.core_collector.collect')
+def test_run_collection_stream_archive(collect, create_archive_dir, systemd_notify_init_thread):
+    collect.collect.return_value = ('/var/tmp/insights.tar.gz', {})
+    conf = InsightsConfig(stream_archive=True, compressor='xz')
+    cc = CoreCollector(conf)
+    cc.run_collection({})
+    kwargs = collect.collect.call_args[1]
+    assert kwargs['stream'] is True
+    assert kwargs['compress'] is True
+    assert kwargs['compressor'] == 'xz'
+    assert cc.archive.tar_file == '/var/tmp/insights.tar.gz'
@@ -0,0 +1,72 @@
+# -*- coding: UTF-8 -*-
+
+from insights.client.config import InsightsConfig
+from insights.client.constants import InsightsConstants as constants
+from insights.client.phase.v1 import run_phases
+from unittest.mock import patch
+from pytest import raises
+
+
+def patch_insights_config(**kwargs):
+    return patch("insights.client.phase.v1.InsightsConfig",
+                 **{"return_value.load_all.return_value": InsightsConfig(**kwargs)})
+
+
+@patch("insights.client.phase.v1.InsightsClient")
+@patch_insights_config(display_name="test")
+def test_run_phases_shared_config(insights_config, insights_client):
+    """
+    The configuration is loaded once for all the phases
+    """
+    assert run_phases(["update", "update"]) == []
+    insights_config.return_value.load_all.assert_called_once()
+    assert insights_client.return_value.update.call_count == 2
+    # each phase gets its own client and copy of the configuration
+    assert insights_client.call_count == 2
+    snapshot = insights_config.return_value.load_all.return_value
+    first, second = [c[0][0] for c in insights_client.call_args_list]
+    assert first is not snapshot
+    assert second is not snapshot
+    assert first is not second
+    assert second.display_name == "test"
+
+
+@patch("insights.client.phase.v1.InsightsClient")
+@patch_insights_config(test_connection=True)
+def test_run_phases_exit(insights_config, insights_client):
+    """
+    A phase stopping the run exits with its code and the next phases don't run
+    """
+    insights_client.return_value.test_connection.return_value = 0
+    with raises(SystemExit) as exc_info:
+        run_phases(["pre_update", "update"])
+    assert exc_info.value.code == constants.sig_kill_ok
+    insights_client.return_value.update.assert_not_called()
+
+
+@patch("insights.client.phase.v1.logger")
+@patch("insights.client.phase.v1.InsightsClient")
+@patch_insights_config()
+def test_run_phases_error(insights_config, insights_client, logger):
+    insights_client.return_value.update.side_effect = RuntimeError("error")
+    with raises(SystemExit) as exc_info:
+        run_phases(["update", "post_update"])
+    assert exc_info.value.code == constants.sig_kill_bad
+
+
+@patch("insights.client.phase.v1._core_egg_state", side_effect=[None, (1, 2, 3)])
+@patch("insights.client.phase.v1.print_egg_versions")
+@patch("insights.client.phase.v1.InsightsClient")
+@patch_insights_config()
+def test_run_phases_core_updated(insights_config, insights_client, print_egg_versions, core_egg_state):
+    """
+    The phases after a new core is installed are left to run with it
+    """
+    assert run_phases(["update", "post_update", "collect_and_output"]) == ["post_update", "collect_and_output"]
+    insights_client.return_value.update.assert_called_once()
+    print_egg_versions.assert_not_called()
+
+
+def test_run_phases_unknown():
+    with raises(ValueError):
+        run_phases(["pre_update", "run_phases"])
@@ -1,5 +1,8 @@
+import hashlib
+import os
+import tarfile
 import time
-from insights.client.archive import InsightsArchive
+from insights.client.archive import InsightsArchive, TarStream
 from insights.client.config import InsightsConfig
 from unittest.mock import patch, Mock, call
 from unittest import TestCase
@@ -258,3 +261,41 @@ class TestInsightsArchive(TestCase):
         with raises(Exception):
             archive.storing_archive()
         logger.error.assert_called_with('ERROR: Could not create %s', archive.keep_archive_dir)
+
+
+def make_archive_dir(tmpdir):
+    archive_dir = tmpdir.mkdir("insights-archive")
+    archive_dir.mkdir("data").join("uptime").write("up 2 days")
+    archive_dir.join("insights_archive.txt").write("")
+    return str(archive_dir)
+
+
+def test_tar_stream(tmpdir):
+    archive_dir = make_archive_dir(tmpdir)
+    stream = TarStream(archive_dir, "gz")
+    assert stream.name == archive_dir + ".tar.gz"
+    data = b"".join(stream)
+    with open(stream.name, "rb") as f:
+        assert f.read() == data
+    assert stream.size == len(data)
+    assert stream.sha256 == hashlib.sha256(data).hexdigest()
+    assert not os.path.exists(archive_dir)
+    with tarfile.open(stream.name) as tf:
+        assert tf.extractfile("insights-archive/data/uptime").read() == b"up 2 days"
+    # the stream was read, the tar file is complete
+    assert stream.finish() == stream.name
+
+
+def test_tar_stream_finish(tmpdir):
+    archive_dir = make_archive_dir(tmpdir)
+    stream = TarStream(archive_dir + "/", "none")
+    assert next(iter(stream))
+    assert stream.finish() == archive_dir + ".tar"
+    with tarfile.open(stream.name) as tf:
+        assert "insights-archive/insights_archive.txt" in tf.getnames()
+
+
+def test_tar_stream_error(tmpdir):
+    stream = TarStream(str(tmpdir.join("missing")), "gz")
+    with raises(RuntimeError):
+        stream.finish()
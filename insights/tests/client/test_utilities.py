@@ -1,4 +1,7 @@
+import io
+import json
 import os
+import shutil
 from tarfile import open as tar_open
 import tarfile
 import tempfile
@@ -11,7 +14,6 @@ from unittest import mock
 from unittest.mock import patch
 import pytest
 import errno
-from json import loads as json_load
 
 
 machine_id = str(uuid.uuid4())
@@ -380,42 +382,79 @@ def test_migrate_tags(path_exists, os_rename):
     os_rename.reset_mock()
 
 
-def mock_open(name, mode, files=[["meta_data/insights.spec-small", 1], ["meta_data/insights.spec-big", 1], ["data/insights/small", 1], ["data/insights/big", 100]]):
-    base_path = "./insights-client"
-    with tempfile.TemporaryFile(suffix='.tar.gz') as f:
-        tarball = tar_open(fileobj=f, mode='w:gz')
-        for file in files:
-            member = tarfile.TarInfo(name=os.path.join(base_path, file[0]))
-            member.size = file[1]
-            tarball.addfile(member, None)
-        return tarball
-
-
-def mock_extract_file(self, filename):
-    if "small" in filename:
-        f = "small"
-    else:
-        f = "big"
-    return f
+def make_archive(tmp, files, name="insights-client"):
+    """
+    Creates a tar.gz named after the archive directory with the given
+    relative paths and contents, like tar does with "./" in front of them.
+    """
+    path = os.path.join(tmp, name + ".tar.gz")
+    with tar_open(path, mode='w:gz') as tarball:
+        for rel, content in files:
+            content = content.encode("utf-8")
+            member = tarfile.TarInfo(name=os.path.join(".", name, rel))
+            member.size = len(content)
+            tarball.addfile(member, io.BytesIO(content))
+    return path
 
 
-def mock_json_load(filename):
-    if "small" in filename:
-        content = json_load('{"name": "insights.spec-small", "results": {"type": "insights.core.spec_factory.CommandOutputProvider", "object": { "relative_path": "insights/small"}}}')
-    else:
-        content = json_load('{"name": "insights.spec-big", "results": {"type": "insights.core.spec_factory.CommandOutputProvider", "object": { "relative_path": "insights/big"}}}')
-    return content
+SMALL_META = '{"name": "insights.spec-small", "results": {"type": "insights.core.spec_factory.CommandOutputProvider", "object": { "relative_path": "insights/small"}}}'
+BIG_META = '{"name": "insights.spec-big", "results": [{"type": "insights.core.spec_factory.CommandOutputProvider", "object": { "relative_path": "insights/big"}}, {"type": "insights.core.spec_factory.CommandOutputProvider", "object": { "relative_path": "insights/big2"}}]}'
 
 
-# TODO: try to pass files as mock_open parameter
-@patch('insights.client.utilities.tarfile.open', mock_open)
-@patch('insights.client.utilities.json.load', mock_json_load)
-@patch('insights.client.utilities.tarfile.TarFile.extractfile', mock_extract_file)
 def test_largest_spec_in_archive():
-    largest_file = util.largest_spec_in_archive("/tmp/insights-client.tar.gz")
-    assert largest_file[0] == "insights/big"
-    assert largest_file[1] == 100
-    assert largest_file[2] == "insights.spec-big"
+    tmp = tempfile.mkdtemp()
+    try:
+        archive = make_archive(tmp, [
+            ("meta_data/insights.spec-small.json", SMALL_META),
+            ("meta_data/insights.spec-big.json", BIG_META),
+            ("data/insights/small", "s"),
+            ("data/insights/big", "b" * 100),
+            ("data/insights/big2", "b" * 10),
+        ])
+        largest_file = util.largest_spec_in_archive(archive)
+        assert largest_file[0] == "insights/big"
+        assert largest_file[1] == 100
+        assert largest_file[2] == "insights.spec-big"
+
+        assert util.specs_by_size(archive) == [
+            {"name": "insights.spec-big", "size": 110, "largest_file": "insights/big", "largest_size": 100},
+            {"name": "insights.spec-small", "size": 1, "largest_file": "insights/small", "largest_size": 1},
+        ]
+        assert len(util.specs_by_size(archive, n=1)) == 1
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_specs_by_size_uses_report():
+    tmp = tempfile.mkdtemp()
+    try:
+        report = {"specs": [{"name": "insights.spec-big", "size": 5, "largest_file": "insights/big", "largest_size": 5}]}
+        archive = make_archive(tmp, [
+            ("meta_data/insights.spec-small.json", SMALL_META),
+            ("meta_data/insights_sizes.json", json.dumps(report)),
+            ("data/insights/small", "s"),
+        ])
+        assert util.specs_by_size(archive) == report["specs"]
+        assert util.largest_spec_in_archive(archive) == ("insights/big", 5, "insights.spec-big")
+
+        # the largest file is in a spec with less data than the top ten
+        report = {"specs": [{"name": "insights.spec-%d" % i, "size": 200 - i, "largest_file": "insights/%d" % i,
+                             "largest_size": 20} for i in range(11)]}
+        report["specs"][10]["largest_size"] = 150
+        archive = make_archive(tmp, [("meta_data/insights_sizes.json", json.dumps(report))])
+        assert len(util.specs_by_size(archive)) == 10
+        assert util.largest_spec_in_archive(archive) == ("insights/10", 150, "insights.spec-10")
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_largest_spec_in_empty_archive():
+    tmp = tempfile.mkdtemp()
+    try:
+        archive = make_archive(tmp, [("insights_archive.txt", "")])
+        assert util.largest_spec_in_archive(archive) == ("", 0, "")
+    finally:
+        shutil.rmtree(tmp)
 
 
 @pytest.mark.parametrize(
@@ -263,6 +263,14 @@ def test_get_shared_data():
     assert data == [PRIMARY_DATA, SECONDARY_DATA]
 
 
+def test_get_shared_data_copies():
+    component = ContentClass()
+    component.data['content'] = [dict(row) for row in PRIMARY_DATA]
+    data = lvm.get_shared_data(component)
+    data[0]['a'] = 'changed'
+    assert component.data['content'] == PRIMARY_DATA
+
+
 def test_to_name_key_dict():
     assert lvm.to_name_key_dict(PRIMARY_DATA, 'name_key') == PRIMARY_KEY_DATA
 
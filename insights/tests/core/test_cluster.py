@@ -0,0 +1,75 @@
+import pytest
+
+from array import array
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("ansible")
+
+from insights.core import dr  # noqa: E402
+from insights.core.cluster import FactTable, machine_id, process_cluster  # noqa: E402
+from insights.core.plugins import fact, make_pass, rule  # noqa: E402
+
+
+@fact(machine_id)
+def host_fact(mid):
+    return [{"name": "a", "count": 1}, {"name": "b", "count": 2}]
+
+
+@rule(host_fact, cluster=True)
+def cluster_report(facts):
+    return make_pass("CLUSTER", rows=len(facts), total=int(facts["count"].sum()))
+
+
+def test_fact_table_columns():
+    table = FactTable()
+    table.extend([{"i": 1, "f": 1.5, "s": "a"}, {"i": 2, "f": 2, "s": "b"}])
+    assert len(table) == 2
+    # numbers are kept in arrays, ints in a float column are floats
+    assert table.columns["i"] == array("q", [1, 2])
+    assert table.columns["f"] == array("d", [1.5, 2.0])
+    assert table.columns["s"] == ["a", "b"]
+    assert list(table.columns) == ["i", "f", "s"]
+
+
+def test_fact_table_fallback_to_list():
+    table = FactTable()
+    table.extend([{"i": 1}, {"i": 1.5}, {"i": "x"}])
+    assert table.columns["i"] == [1, 1.5, "x"]
+
+    table = FactTable()
+    table.extend([{"i": 1}, {"i": 2 ** 64}])
+    assert table.columns["i"] == [1, 2 ** 64]
+
+    table = FactTable()
+    table.extend([{"b": True}, {"b": False}])
+    assert table.columns["b"] == [True, False]
+
+
+def test_fact_table_missing_columns():
+    table = FactTable()
+    table.extend([{"a": 1}, {"b": 2}, {"a": 3, "b": 4}])
+    assert table.columns["a"] == [1, None, 3]
+    assert table.columns["b"] == [None, 2, 4]
+    assert len(table) == 3
+
+
+def test_fact_table_to_frame():
+    table = FactTable()
+    table.extend([{"a": 1, "b": "x"}, {"a": 2}])
+    df = table.to_frame()
+    assert list(df.columns) == ["a", "b"]
+    assert list(df["a"]) == [1, 2]
+    assert list(df["b"]) == ["x", None]
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_process_cluster(tmpdir, parallel):
+    archives = []
+    for name in ("host1", "host2", "host3"):
+        tmpdir.join(name, "insights_archive.txt").ensure()
+        archives.append(str(tmpdir.join(name)))
+    graph = dr.get_dependency_graph(cluster_report)
+    broker = process_cluster(graph, archives, dr.Broker(), parallel=parallel)
+    assert broker[cluster_report]["rows"] == 6
+    assert broker[cluster_report]["total"] == 9
@@ -0,0 +1,155 @@
+import pytest
+
+from insights.core import dr
+from insights.core.context import HostContext
+from insights.core.plugins import datasource, fact, parser, rule, make_pass
+from insights.core.spec_factory import ContentProvider, DatasourceProvider
+
+
+class stage(dr.ComponentType):
+    pass
+
+
+class Provider(ContentProvider):
+    def load(self):
+        self.loaded = True
+        return ["one", "two"]
+
+
+@datasource(HostContext)
+def the_data(broker):
+    return Provider()
+
+
+@stage(the_data)
+def first(data):
+    return len(data.content)
+
+
+@stage(the_data)
+def second(data):
+    return data.content[-1]
+
+
+@stage(first, second)
+def summary(first, second):
+    return "%s %s" % (first, second)
+
+
+@fact(summary)
+def the_fact(s):
+    return [{"summary": s}]
+
+
+@rule(summary, the_fact)
+def report(s, f):
+    return make_pass("EVICT", summary=s)
+
+
+@stage(the_data, evictable=False)
+def kept(data):
+    return data.content[0]
+
+
+@parser(the_data)
+class FakeParser(object):
+    def __init__(self, ctx):
+        self.ctx = ctx
+
+
+def make_broker(evict=True):
+    broker = dr.Broker()
+    broker[HostContext] = HostContext()
+    broker.evict = evict
+    return broker
+
+
+def test_evict():
+    graph = dr.get_dependency_graph(report)
+    broker = dr.run(graph, make_broker())
+
+    assert broker[report]["summary"] == "2 two"
+    assert the_fact in broker
+    # intermediate values are released once all dependents have run
+    for c in (the_data, first, second, summary):
+        assert c not in broker
+    # seeded values are kept
+    assert HostContext in broker
+
+
+def test_no_evict():
+    graph = dr.get_dependency_graph(report)
+    broker = dr.run(graph, make_broker(evict=False))
+    for c in (the_data, first, second, summary, the_fact, report):
+        assert c in broker
+
+
+def test_evict_not_evictable():
+    graph = dr.get_dependency_graph(kept)
+    broker = dr.run(graph, make_broker())
+    # kept has no dependents and the_data has none left
+    assert kept in broker
+    assert the_data not in broker
+
+
+def test_evict_unloads_seeded_providers():
+    provider = Provider()
+    broker = make_broker()
+    broker[the_data] = provider
+    graph = dr.get_dependency_graph(first)
+    broker = dr.run(graph, broker)
+
+    assert broker[first] == 2
+    assert broker[the_data] is provider
+    assert provider._content is None
+    assert provider.loaded is False
+    # the content is loaded again on demand
+    assert provider.content == ["one", "two"]
+
+
+def test_evict_keeps_content_not_reloadable():
+    provider = DatasourceProvider(content=["one", "two"], relative_path="the_data")
+    broker = make_broker()
+    broker[the_data] = provider
+    broker = dr.run(dr.get_dependency_graph(first), broker)
+
+    assert broker[first] == 2
+    assert provider.content == ["one", "two"]
+
+
+def test_evict_does_not_release_too_early():
+    provider = Provider()
+    broker = make_broker()
+    broker[the_data] = provider
+    graph = dr.get_dependency_graph(first)
+    graph.update(dr.get_dependency_graph(FakeParser))
+    broker = dr.run(graph, broker)
+
+    assert broker[first] == 2
+    assert broker[FakeParser].ctx is provider
+
+
+def test_seed_broker():
+    seeded = dr.Broker(make_broker())
+    assert seeded.evict is True
+
+
+def test_depth_first_run_order():
+    graph = dr.get_dependency_graph(report)
+    graph.update(dr.get_dependency_graph(kept))
+    order = dr.depth_first_run_order(graph)
+    assert set(order) == set(graph) | set([HostContext])
+    for c, deps in graph.items():
+        assert all(order.index(d) < order.index(c) for d in deps)
+
+    # one chain is finished before the next is started
+    graph = {"r1": set(["p1"]), "p1": set(["d1"]), "r2": set(["p2"]), "p2": set(["d2"])}
+    order = dr.depth_first_run_order(graph)
+    assert order in (["d1", "p1", "r1", "d2", "p2", "r2"], ["d2", "p2", "r2", "d1", "p1", "r1"])
+
+
+def test_depth_first_run_order_cycle():
+    with pytest.raises(ValueError):
+        dr.depth_first_run_order({"a": set(["b"]), "b": set(["a"])})
+    with pytest.raises(ValueError):
+        dr.depth_first_run_order({"r": set(["a"]), "a": set(["b"]), "b": set(["a"])})
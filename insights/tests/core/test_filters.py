@@ -1,6 +1,8 @@
+import json
 import pytest
 
 from collections import defaultdict
+from unittest.mock import patch
 
 from insights import parser
 from insights.combiners.hostname import Hostname
@@ -50,7 +52,7 @@ def setup_function(func):
         filters.add_filter(Specs.ps_aux, "COMMAND")
         filters.add_filter(DefaultSpecs.ps_aux, "MEM")
 
-    if func is test_filter_dumps_loads:
+    if func in (test_filter_dumps_loads, test_filter_dumps_loads_compiled, test_filter_load_compiled):
         filters.add_filter(Specs.ps_aux, ["PID", "COMMAND"])
         filters.add_filter(Specs.ps_aux, "TEST_10", 10)
         filters.add_filter(Specs.ps_aux, ["PID", "TEST_5"], 5)
@@ -79,6 +81,76 @@ def test_filter_dumps_loads():
     assert r2 == r  # 'filters' are in the same order in every dumps()
 
 
+def test_filter_dumps_loads_compiled():
+    filters.add_filter(DefaultSpecs.ps_aux, "MEM")
+    r = filters.dumps_compiled()
+    expected = filters.get_filters(DefaultSpecs.ps_aux, True)
+    d = json.loads(r)
+    assert d["datasources"]["insights.specs.default.DefaultSpecs.ps_aux"] == expected
+    assert d["source"] == filters._digest(filters.dumps())
+
+    filters._CACHE = {}
+    filters.FILTERS = defaultdict(dict)
+    filters.loads_compiled(r)
+    assert filters.FILTERS[Specs.ps_aux]["TEST_10"] == 10
+    # the datasources get their merged filters without a walk of the graph
+    assert filters._CACHE[DefaultSpecs.ps_aux] == expected
+    assert filters.get_filters(DefaultSpecs.ps_aux, True) == expected
+    assert filters.dumps_compiled() == r
+
+    # a filter added later reaches the datasources that get it
+    filters.add_filter(Specs.ps_aux, "NEW")
+    assert "NEW" in filters.get_filters(DefaultSpecs.ps_aux)
+
+    with pytest.raises(ValueError):
+        filters.loads_compiled(json.dumps({"version": 0}))
+
+
+def test_filter_load_compiled():
+    yaml_data = filters.dumps()
+    compiled = filters.dumps_compiled()
+    files = {filters._filename: yaml_data.encode("utf-8"), filters._compiled_filename: compiled.encode("utf-8")}
+
+    def get_data(package, name):
+        if name not in files:
+            raise IOError(name)
+        return files[name]
+
+    with patch("insights.core.filters.pkgutil.get_data", side_effect=get_data):
+        with patch("insights.core.filters.loads") as loads:
+            with patch("insights.core.filters._load_compiled") as loads_compiled:
+                with patch("insights.core.filters.json.loads", wraps=json.loads) as json_loads:
+                    filters.load()
+                # the compiled filters are parsed once
+                json_loads.assert_called_once_with(files[filters._compiled_filename])
+                loads_compiled.assert_called_once_with(json.loads(compiled))
+                loads.assert_not_called()
+
+                # the compiled filters weren't made with this filters file
+                files[filters._filename] = yaml_data.replace("TEST_5", "TEST_6").encode("utf-8")
+                loads_compiled.reset_mock()
+                filters.load()
+                loads.assert_called_once_with(files[filters._filename])
+                loads_compiled.assert_not_called()
+
+        # broken compiled filters fall back to the filters file
+        for broken in ("{", json.dumps({"version": filters.COMPILED_VERSION}), json.dumps({"version": 0})):
+            files[filters._compiled_filename] = broken.encode("utf-8")
+            files[filters._filename] = yaml_data.encode("utf-8")
+            filters.FILTERS = defaultdict(dict)
+            filters.load()
+            assert "TEST_5" in filters.FILTERS[Specs.ps_aux]
+
+        files[filters._filename] = yaml_data.replace("TEST_5", "TEST_6").encode("utf-8")
+        del files[filters._compiled_filename]
+        filters.load()
+        assert "TEST_6" in filters.FILTERS[Specs.ps_aux]
+
+        del files[filters._filename]
+        with pytest.raises(IOError):
+            filters.load()
+
+
 def test_get_filter():
     f = filters.get_filters(Specs.ps_aux)
     assert "COMMAND" in f
@@ -0,0 +1,153 @@
+import os
+import pytest
+import shutil
+
+from tempfile import mkdtemp
+
+from insights.core import Parser, StreamParser, dr
+from insights.core.context import HostContext
+from insights.core.parse_cache import ParseCache
+from insights.core.plugins import datasource, parser
+from insights.core.spec_factory import DatasourceProvider
+from insights.tests import context_wrap
+
+CALLS = []
+
+
+@datasource(HostContext)
+def the_data(broker):
+    return DatasourceProvider(content=["a=1", "b=2"], relative_path="etc/the_data")
+
+
+@datasource(HostContext)
+def many(broker):
+    return [
+        DatasourceProvider(content=["a=1"], relative_path="etc/one"),
+        DatasourceProvider(content=["a=1"], relative_path="etc/one"),
+        DatasourceProvider(content=["a=1"], relative_path="etc/two"),
+    ]
+
+
+@parser(the_data)
+class Conf(Parser):
+    def parse_content(self, content):
+        CALLS.append(self.file_path)
+        self.data = dict(line.split("=") for line in content)
+
+
+@parser(many)
+class ManyConf(Conf):
+    pass
+
+
+class Streamed(StreamParser):
+    def parse_content(self, content):
+        CALLS.append(self.file_path)
+        self.lines = list(content)
+
+
+def run(comp, cache):
+    broker = dr.Broker()
+    broker[HostContext] = HostContext()
+    broker.parse_cache = cache
+    return dr.run(dr.get_dependency_graph(comp), broker)
+
+
+def test_parse_cache_across_brokers():
+    del CALLS[:]
+    cache = ParseCache()
+    first = run(Conf, cache)[Conf]
+    second = run(Conf, cache)[Conf]
+    assert first is second
+    assert second.data == {"a": "1", "b": "2"}
+    assert CALLS == ["/etc/the_data"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_parse_cache_copy():
+    del CALLS[:]
+    cache = ParseCache(copy=True)
+    first = run(Conf, cache)[Conf]
+    first.data["a"] = "changed"
+    second = run(Conf, cache)[Conf]
+    assert second is not first
+    assert second.data == {"a": "1", "b": "2"}
+    assert CALLS == ["/etc/the_data"]
+
+
+def test_parse_cache_list():
+    del CALLS[:]
+    cache = ParseCache()
+    results = run(ManyConf, cache)[ManyConf]
+    # the same content at another path is parsed again
+    assert CALLS == ["/etc/one", "/etc/two"]
+    assert results[0] is results[1]
+    assert results[2].file_path == "/etc/two"
+
+
+def test_parse_cache_without_cache():
+    del CALLS[:]
+    run(Conf, None)
+    run(Conf, None)
+    assert CALLS == ["/etc/the_data", "/etc/the_data"]
+
+
+def test_parse_cache_lru():
+    cache = ParseCache(maxsize=2)
+    for name in ("a", "b", "a", "c"):
+        cache.put(name, name.upper())
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_parse_cache_key():
+    def provider(content, path="etc/the_data"):
+        return DatasourceProvider(content=content, relative_path=path)
+
+    cache = ParseCache(version="1")
+    ctx = provider(["a=1"])
+    key = cache.key(Conf, ctx)
+    assert key is not None
+    assert key == cache.key(Conf, provider(["a=1"]))
+    assert key != cache.key(ManyConf, ctx)
+    assert key != cache.key(Conf, provider(["a=2"]))
+    assert key != cache.key(Conf, provider(["a=1"], path="etc/other"))
+    assert key != ParseCache(version="2").key(Conf, ctx)
+
+    # only content providers with lines of text are cached
+    assert cache.key(Conf, context_wrap("a=1", path="/etc/the_data")) is None
+    assert cache.key(Streamed, ctx) is None
+    assert cache.key(Conf, DatasourceProvider(content=b"a=1", relative_path="etc/the_data")) is None
+
+
+def test_parse_cache_on_disk():
+    tmp = mkdtemp()
+    try:
+        del CALLS[:]
+        run(Conf, ParseCache(path=tmp, version="1"))
+        files = [f for _, _, names in os.walk(tmp) for f in names]
+        assert len(files) == 1
+
+        cache = ParseCache(path=tmp, version="1")
+        result = run(Conf, cache)[Conf]
+        assert result.data == {"a": "1", "b": "2"}
+        assert CALLS == ["/etc/the_data"]
+        assert cache.hits == 1
+
+        # the results of another version are parsed again
+        cache = ParseCache(path=tmp, version="2")
+        run(Conf, cache)
+        assert CALLS == ["/etc/the_data", "/etc/the_data"]
+        assert cache.misses == 1
+
+        with pytest.raises(ValueError):
+            ParseCache(path=tmp)
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_parse_cache_seed_broker():
+    broker = dr.Broker()
+    broker.parse_cache = ParseCache()
+    assert dr.Broker(broker).parse_cache is broker.parse_cache
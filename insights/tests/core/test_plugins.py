@@ -1,10 +1,18 @@
 import json
 import pytest
 
-from insights.core import plugins
+from concurrent.futures import ThreadPoolExecutor
+
+from insights.core import dr, plugins
+from insights.core.context import HostContext
 from insights.core.exceptions import ValidationException
 
 
+@plugins.datasource(HostContext)
+def host_ds(broker):
+    return "host_ds"
+
+
 def test_validate_good_response():
     assert plugins.make_response("a_test", foo="bar") == {
         "type": "rule",
@@ -71,3 +79,11 @@ def test_str_without_type():
     del d["type"]
     str(d)
     assert True
+
+
+def test_datasource_in_thread():
+    broker = dr.Broker()
+    broker[HostContext] = HostContext()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        broker = pool.submit(dr.run, host_ds, broker).result()
+    assert broker[host_ds] == "host_ds"
@@ -0,0 +1,154 @@
+import json
+import os
+import shutil
+import subprocess
+
+from tempfile import mkdtemp
+
+from insights.core import dr
+from insights.core.plugins import component
+from insights.core.profiling import PROFILE_FILE, ChildRusageMeter, CpuMeter, Profiler
+from insights.core.serde import Hydration, serializer
+from insights.core.spec_factory import TextFileProvider
+
+
+class Thing(object):
+    def __init__(self, stats=None):
+        self.stats = stats or {}
+
+
+@serializer(Thing)
+def serialize_thing(obj, root=None):
+    return {}
+
+
+@component()
+def busy():
+    return sum(range(100000))
+
+
+@component()
+def child():
+    subprocess.call(["true"])
+    return True
+
+
+@component(busy)
+def things(b):
+    return [Thing({"lines_read": 3, "bytes_read": 10}), Thing({"lines_read": 2, "bytes_read": 5})]
+
+
+@component()
+def boom():
+    raise Exception("boom")
+
+
+def test_add_and_top():
+    p = Profiler(meters=[])
+    p.add(busy, cpu_time=1.0)
+    p.add(busy, cpu_time=0.5, ser_time=0.1)
+    p.add(things, cpu_time=2.0)
+    p.add(boom, ser_time=3.0)
+
+    assert p.stats[busy]["cpu_time"] == 1.5
+    assert p.top("cpu_time") == [(dr.get_name(things), 2.0), (dr.get_name(busy), 1.5)]
+    assert p.top("cpu_time", n=1) == [(dr.get_name(things), 2.0)]
+    assert p.to_dict()[dr.get_name(boom)] == {"ser_time": 3.0}
+
+
+def test_dump():
+    tmp = mkdtemp()
+    try:
+        p = Profiler(meters=[])
+        p.add(busy, cpu_time=1.0)
+        path = p.dump(tmp)
+        assert path == os.path.join(tmp, PROFILE_FILE)
+        with open(path) as f:
+            assert json.load(f) == {dr.get_name(busy): {"cpu_time": 1.0}}
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_meters():
+    m = CpuMeter()
+    assert m.stop(m.start())["cpu_time"] >= 0
+
+    m = ChildRusageMeter()
+    snapshot = m.start()
+    subprocess.call(["true"])
+    res = m.stop(snapshot)
+    assert res["child_user_time"] >= 0
+    assert res["child_system_time"] >= 0
+
+
+def test_run_with_profiler():
+    broker = dr.Broker()
+    broker.profiler = Profiler()
+    broker = dr.run([busy, child, boom], broker=broker)
+
+    stats = broker.profiler.stats
+    assert set(stats) == set([busy, child, boom])
+    assert stats[busy]["cpu_time"] > 0
+    assert "child_user_time" in stats[child]
+    assert dr.get_name(busy) in broker.profiler.to_dict()
+
+
+def test_run_without_profiler():
+    broker = dr.run([busy])
+    assert broker.profiler is None
+    assert busy in broker
+
+
+def test_seed_broker_shares_profiler():
+    broker = dr.Broker()
+    broker.profiler = Profiler()
+    assert dr.Broker(broker).profiler is broker.profiler
+
+
+def test_dehydrate_adds_provider_stats():
+    tmp = mkdtemp()
+    try:
+        broker = dr.Broker()
+        broker.profiler = Profiler(meters=[])
+        broker[things] = things(1)
+
+        h = Hydration(tmp)
+        h.dehydrate(things, broker)
+        stats = broker.profiler.stats[things]
+        assert stats["lines_read"] == 5
+        assert stats["bytes_read"] == 15
+        assert "ser_time" in stats
+
+        # the profile is not mistaken for a component
+        broker.profiler.dump(h.meta_root)
+        h.hydrate(broker=dr.Broker())
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_text_file_provider_stats():
+    tmp = mkdtemp()
+    try:
+        path = os.path.join(tmp, "sample")
+        with open(path, "w") as f:
+            f.write("one\ntwo\nthree\n")
+
+        tfp = TextFileProvider("sample", root=tmp)
+        dst = os.path.join(tmp, "out", "sample")
+        os.makedirs(os.path.dirname(dst))
+        tfp.write(dst)
+        # nothing is recorded unless asked
+        assert tfp.stats is None
+
+        tfp = TextFileProvider("sample", root=tmp)
+        tfp.record_stats()
+        tfp.write(dst)
+        assert tfp.stats == {
+            "source_bytes": 14,
+            "lines_read": 3,
+            "bytes_read": 14,
+            "lines_written": 3,
+            "bytes_written": 13,
+        }
+    finally:
+        shutil.rmtree(tmp)
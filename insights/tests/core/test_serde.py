@@ -6,8 +6,16 @@ from tempfile import mkdtemp
 from insights.core import dr
 from insights.core.exceptions import ContentException
 from insights.core.plugins import component, datasource, make_info, rule
-from insights.core.serde import Hydration, deserializer, marshal, serializer, unmarshal
-from insights.core.spec_factory import RegistryPoint, SpecSet
+from insights.core.serde import (
+    SIZES_FILE,
+    Hydration,
+    deserializer,
+    marshal,
+    rank_by_size,
+    serializer,
+    unmarshal,
+)
+from insights.core.spec_factory import DatasourceProvider, RegistryPoint, SpecSet
 from insights.util import fs
 
 
@@ -67,6 +75,20 @@ def report(dt):
     return make_info('INFO_1')
 
 
+@datasource()
+def copies(broker):
+    return [
+        DatasourceProvider(content=["same"], relative_path="c1/same"),
+        DatasourceProvider(content=["same"], relative_path="c2/same"),
+        DatasourceProvider(content=["other"], relative_path="c3/other"),
+    ]
+
+
+@datasource()
+def one_copy(broker):
+    return DatasourceProvider(content=["same"], relative_path="c4/same")
+
+
 #
 # TEST
 #
@@ -265,3 +287,87 @@ def test_dehydrate():
             assert "Fake Datasource" in tb
     finally:
         fs.remove(tmp_path)
+
+
+def test_dedup():
+    broker = dr.run([copies, one_copy])
+    tmp_path = mkdtemp()
+    try:
+        h = Hydration(tmp_path, dedup=True)
+        h.dehydrate(copies, broker)
+        h.dehydrate(one_copy, broker)
+        # dehydrating a component again doesn't remove its own files
+        h.dehydrate(copies, broker)
+        assert os.path.exists(os.path.join(h.data_root, "c1", "same"))
+        assert not os.path.exists(os.path.join(h.data_root, "c2", "same"))
+        assert os.path.exists(os.path.join(h.data_root, "c3", "other"))
+        assert not os.path.exists(os.path.join(h.data_root, "c4", "same"))
+        with open(os.path.join(h.meta_root, dr.get_name(one_copy) + ".json")) as f:
+            assert json.load(f)["results"]["object"]["same_as"] == "c1/same"
+
+        broker = Hydration(tmp_path).hydrate()
+        assert [p.content for p in broker[copies]] == [["same"], ["same"], ["other"]]
+        assert broker[copies][1].relative_path == "c2/same"
+        assert broker[one_copy].content == ["same"]
+        assert broker[one_copy].relative_path == "c4/same"
+    finally:
+        fs.remove(tmp_path)
+
+
+def test_dedup_outside_root():
+    tmp_path = mkdtemp()
+    try:
+        h = Hydration(tmp_path)
+        fs.ensure_path(h.meta_root)
+        doc = {
+            "name": dr.get_name(one_copy),
+            "exec_time": 0.1,
+            "ser_time": 0.1,
+            "errors": [],
+            "results": {
+                "type": dr.get_name(DatasourceProvider),
+                "object": {"relative_path": "c4/same", "same_as": "../../etc/hostname", "save_as": None},
+            },
+        }
+        with open(os.path.join(h.meta_root, dr.get_name(one_copy) + ".json"), "w") as f:
+            json.dump(doc, f)
+        broker = h.hydrate()
+        assert one_copy not in broker
+        assert not os.path.exists(os.path.join(h.data_root, "c4", "same"))
+    finally:
+        fs.remove(tmp_path)
+
+
+def test_rank_by_size():
+    sizes = {"a/1": (10, "a"), "a/2": (30, "a"), "b/1": (35, "b"), "c/1": (1, "c")}
+    assert rank_by_size(sizes, n=2) == [
+        {"name": "a", "size": 40, "largest_file": "a/2", "largest_size": 30},
+        {"name": "b", "size": 35, "largest_file": "b/1", "largest_size": 35},
+    ]
+    assert rank_by_size({}) == []
+
+
+def test_dump_sizes():
+    broker = dr.run([copies, one_copy])
+    tmp_path = mkdtemp()
+    try:
+        h = Hydration(tmp_path, dedup=True)
+        h.dehydrate(copies, broker)
+        assert h.sizes == {}
+
+        h = Hydration(tmp_path, dedup=True, record_sizes=True)
+        h.dehydrate(copies, broker)
+        h.dehydrate(one_copy, broker)
+        path = h.dump_sizes()
+        assert path == os.path.join(h.meta_root, SIZES_FILE)
+        with open(path) as f:
+            # duplicates take no space in the archive
+            assert json.load(f) == {"specs": [
+                {"name": dr.get_name(copies), "size": 9, "largest_file": "c3/other", "largest_size": 5},
+            ]}
+
+        # the report is not mistaken for a component
+        broker = Hydration(tmp_path).hydrate()
+        assert copies in broker
+    finally:
+        fs.remove(tmp_path)
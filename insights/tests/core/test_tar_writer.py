@@ -0,0 +1,220 @@
+import os
+import shutil
+import tarfile
+
+from tempfile import mkdtemp
+from unittest.mock import patch
+
+import pytest
+
+from insights.core import dr
+from insights.core.archives import TarWriter, extract
+from insights.core.plugins import datasource
+from insights.core.serde import Hydration
+from insights.core.spec_factory import DatasourceProvider
+
+
+@datasource()
+def the_data(broker):
+    return DatasourceProvider(content=["one", "two"], relative_path="insights_datasources/the_data")
+
+
+@datasource()
+def many(broker):
+    return [
+        DatasourceProvider(content=["a"], relative_path="many/a"),
+        DatasourceProvider(content=["b"], relative_path="many/b"),
+    ]
+
+
+@datasource()
+def twins(broker):
+    return [
+        DatasourceProvider(content=["a"], relative_path="twins/a"),
+        DatasourceProvider(content=["a"], relative_path="twins/b"),
+    ]
+
+
+def make_file(root, rel, content):
+    path = os.path.join(root, rel)
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, "w") as f:
+        f.write(content)
+    return path
+
+
+@pytest.mark.parametrize("compressor", ["gz", "bz2", "xz", "none"])
+def test_tar_writer(compressor):
+    tmp = mkdtemp()
+    try:
+        root = os.path.join(tmp, "archive")
+        writer = TarWriter(root + "/", compressor)
+        ext = "" if compressor == "none" else "." + compressor
+        assert writer.path == root + ".tar" + ext
+
+        first = make_file(root, "data/etc/first", "first")
+        writer.add(first)
+        # files already added or outside of the root are skipped
+        writer.add(first)
+        outside = make_file(tmp, "outside", "outside")
+        writer.add(outside)
+        kept = make_file(root, "meta_data/kept.json", "{}")
+        writer.add(kept, remove=False)
+        make_file(root, "insights_archive.txt", "")
+        make_file(root, "data/etc/empty/.keep", "")
+
+        assert writer.close() == writer.path
+        assert not os.path.exists(root)
+        assert os.path.exists(outside)
+
+        with tarfile.open(writer.path) as tf:
+            names = tf.getnames()
+            assert names.count("archive/meta_data/kept.json") == 1
+            assert names.index("archive/data/etc") < names.index("archive/data/etc/first")
+            assert set(names) == set([
+                "archive",
+                "archive/data",
+                "archive/data/etc",
+                "archive/data/etc/first",
+                "archive/data/etc/empty",
+                "archive/data/etc/empty/.keep",
+                "archive/meta_data",
+                "archive/meta_data/kept.json",
+                "archive/insights_archive.txt",
+            ])
+            assert tf.extractfile("archive/data/etc/first").read() == b"first"
+    finally:
+        shutil.rmtree(tmp)
+
+
+@pytest.mark.parametrize("compressor", ["gz", "none"])
+def test_tar_writer_abort(compressor):
+    tmp = mkdtemp()
+    try:
+        root = os.path.join(tmp, "archive")
+        writer = TarWriter(root, compressor)
+        first = make_file(root, "data/first", "first")
+        writer.add(first)
+        writer.abort()
+        assert not os.path.exists(writer.path)
+        assert os.path.isdir(root)
+        if writer._proc is not None:
+            assert writer._proc.returncode is not None
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_tar_writer_skips_unreadable_files():
+    tmp = mkdtemp()
+    try:
+        root = os.path.join(tmp, "archive")
+        writer = TarWriter(root)
+        writer.add(os.path.join(root, "data", "missing"))
+        first = make_file(root, "data/first", "first")
+        writer.add(first)
+        path = writer.close()
+        with tarfile.open(path) as tf:
+            assert "archive/data/first" in tf.getnames()
+            assert "archive/data/missing" not in tf.getnames()
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_tar_writer_write_error():
+    tmp = mkdtemp()
+    try:
+        root = os.path.join(tmp, "archive")
+        writer = TarWriter(root)
+        first = make_file(root, "data/first", "first")
+        second = make_file(root, "data/second", "second")
+        addfile = writer._tar.addfile
+
+        def broken(info, f=None):
+            if info.name.endswith("first"):
+                raise OSError("unexpected end of data")
+            return addfile(info, f)
+
+        with patch.object(writer._tar, "addfile", side_effect=broken):
+            writer.add(first)
+            writer.add(second)
+            with pytest.raises(OSError):
+                writer.close()
+        assert not os.path.exists(writer.path)
+        # nothing after the error is added or removed
+        assert os.path.exists(second)
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_tar_writer_command():
+    writer = TarWriter(os.path.join(mkdtemp(), "archive"))
+    try:
+        if writer._cmd is not None:
+            assert os.path.isabs(writer._cmd[0])
+    finally:
+        writer.abort()
+        shutil.rmtree(os.path.dirname(writer.root))
+
+
+def test_tar_writer_bad_compressor():
+    with pytest.raises(ValueError):
+        TarWriter("/tmp/archive", "zip")
+
+
+class Sink(object):
+    def __init__(self):
+        self.added = []
+
+    def add(self, path, remove=True):
+        self.added.append((path, remove))
+
+
+def test_dehydrate_adds_to_sink():
+    tmp = mkdtemp()
+    try:
+        broker = dr.run([the_data, many])
+        h = Hydration(tmp, sink=Sink())
+        h.dehydrate(many, broker)
+        # the metadata stays on disk for later use
+        assert h.sink.added == [
+            (os.path.join(h.data_root, "many", "a"), True),
+            (os.path.join(h.data_root, "many", "b"), True),
+            (os.path.join(h.meta_root, dr.get_name(many) + ".json"), False),
+        ]
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_dehydrate_adds_no_duplicates_to_sink():
+    tmp = mkdtemp()
+    try:
+        broker = dr.run([twins])
+        h = Hydration(tmp, sink=Sink(), dedup=True)
+        h.dehydrate(twins, broker)
+        assert h.sink.added == [
+            (os.path.join(h.data_root, "twins", "a"), True),
+            (os.path.join(h.meta_root, dr.get_name(twins) + ".json"), False),
+        ]
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_dehydrate_to_sink():
+    tmp = mkdtemp()
+    try:
+        root = os.path.join(tmp, "archive")
+        writer = TarWriter(root)
+        broker = dr.run([the_data, many])
+
+        h = Hydration(root, sink=writer)
+        h.dehydrate(the_data, broker)
+        h.dehydrate(many, broker)
+        path = writer.close()
+        with extract(path) as ex:
+            h = Hydration(os.path.join(ex.tmp_dir, "archive"))
+            broker = h.hydrate()
+            assert broker[the_data].content == ["one", "two"]
+            assert sorted(p.content[0] for p in broker[many]) == ["a", "b"]
+    finally:
+        shutil.rmtree(tmp)
@@ -11,6 +11,7 @@ import random
 import fileinput
 
 from datetime import datetime
+from io import StringIO
 from unittest.mock import patch, Mock, ANY
 
 try:
@@ -38,6 +39,10 @@ from insights.specs.datasources.malware_detection import (
     process_include_items,
     process_exclude_items,
     process_include_exclude_items,
+    weigh_scan_items,
+    split_scan_items,
+    find_modified_in_directory,
+    ScanIndex,
     logger,
     MIN_YARA_VERSION,
 )
@@ -464,6 +469,76 @@ class TestsNotUtilizingYara:
         )
         assert all([x not in scan_dict['/tmp']['include'] for x in dont_include_files])
 
+    def test_weigh_and_split_scan_items(self, tmpdir):
+        # Directories with more than an even share of the files are replaced with their contents
+        for path in ['big/a_file', 'big/sub1/1', 'big/sub1/2', 'big/sub1/3', 'big/sub1/4',
+                     'big/sub2/1', 'big/sub2/2', 'small/1']:
+            tmpdir.join(path).ensure()
+        os.mkfifo(str(tmpdir.join('big/pipe_file')))
+        os.symlink(str(tmpdir.join('small')), str(tmpdir.join('big/link_dir')))
+        big, small = str(tmpdir.join('big')), str(tmpdir.join('small'))
+
+        weighed = weigh_scan_items([big, small], 2)
+        assert weighed == [
+            (os.path.join(big, 'a_file'), 1),
+            (os.path.join(big, 'sub1'), 4),
+            (os.path.join(big, 'sub2'), 2),
+            (small, 1),
+        ]
+        assert split_scan_items(weighed, 2) == [
+            [os.path.join(big, 'sub1')],
+            [os.path.join(big, 'sub2'), os.path.join(big, 'a_file'), small],
+        ]
+
+        # Nothing is split for a single scan and there are no empty shards
+        assert weigh_scan_items([big, small], 1) == [(big, 8), (small, 1)]
+        # The includes of a scan are a set when there are no excludes
+        assert weigh_scan_items(set([small, big]), 2) == weighed
+        assert split_scan_items([(small, 1)], 4) == [[small]]
+
+    def test_scan_index(self, tmpdir):
+        for path in ['files/a', 'files/b', 'files/sub/c']:
+            tmpdir.join(path).ensure()
+        os.mkfifo(str(tmpdir.join('files/pipe_file')))
+        os.symlink(str(tmpdir.join('files/a')), str(tmpdir.join('files/link_file')))
+        files, index_file = str(tmpdir.join('files')), str(tmpdir.join('index'))
+        a, b, c = [os.path.join(files, x) for x in ('a', 'b', 'sub/c')]
+
+        def find_files(scan_index, timestamp=None):
+            output = StringIO()
+            find_modified_in_directory(files, timestamp, output, scan_index)
+            return sorted(output.getvalue().splitlines())
+
+        # Without an index all the regular files are scanned
+        scan_index = ScanIndex(index_file, 'rules')
+        assert scan_index.files == {}
+        assert find_files(scan_index) == [a, b, c]
+        # Failed scans and files with matches are scanned again
+        scan_index.forget([b])
+        scan_index.save(exclude=[c])
+
+        scan_index = ScanIndex(index_file, 'rules')
+        assert sorted(scan_index.files) == [a]
+        assert find_files(scan_index) == [b, c]
+        assert find_files(scan_index, timestamp=time.time() + 60) == []
+        scan_index.save()
+
+        # A filesystem_scan_since run keeps the files it didn't scan in the index
+        scan_index = ScanIndex(index_file, 'rules')
+        assert find_files(scan_index, timestamp=time.time() + 60) == []
+        scan_index.save()
+        assert sorted(ScanIndex(index_file, 'rules').files) == [a, b, c]
+
+        tmpdir.join('files/a').write('changed')
+        assert find_files(ScanIndex(index_file, 'rules')) == [a]
+        # A file that changed isn't kept unless it's scanned
+        scan_index = ScanIndex(index_file, 'rules')
+        assert find_files(scan_index, timestamp=time.time() + 60) == []
+        scan_index.save()
+        assert sorted(ScanIndex(index_file, 'rules').files) == [b, c]
+        # Everything is scanned again with different rules
+        assert find_files(ScanIndex(index_file, 'other rules')) == [a, b, c]
+
 
 ###################################################################################################
 # Tests for scan source detection (IBM, CrowdStrike, third-party)
@@ -3033,6 +3108,101 @@ class TestsUtilizingFakeYara:
                 TEST_RULE_FILE,
             )
 
+        def test_filesystem_scan_parallel(
+            self, log_mock, yara, cmd, remove, create_test_files_fake_yara, tmpdir
+        ):
+            # With parallel_scans, the items are scanned in shards by separate yara commands
+            for path in ['scan_me/1', 'scan_me/2', 'scan_me_too/1', 'scan_me_too/2']:
+                tmpdir.join(path).ensure()
+            scan_me, scan_me_too = str(tmpdir.join('scan_me')), str(tmpdir.join('scan_me_too'))
+            for line in fileinput.FileInput(TEMP_CONFIG_FILE, inplace=1):
+                line = "test_scan: false" if line.startswith("test_scan:") else line
+                line = (
+                    line + "remote_rules_location: %s\n" % TEST_RULE_FILE
+                    if line.startswith('---')
+                    else line
+                )
+                line = line + "- %s\n- %s" % (scan_me, scan_me_too) if line.startswith("filesystem_scan_only:") else line
+                line = "parallel_scans: 2" if line.startswith("parallel_scans:") else line
+                line = "add_metadata: false" if line.startswith("add_metadata:") else line
+                line = (
+                    "exclude_network_filesystem_mountpoints: false"
+                    if line.startswith("exclude_network_filesystem_mountpoints:")
+                    else line
+                )
+                print(line)
+            mdc = MalwareDetectionClient(None)
+            assert mdc.parallel_scans == 2
+            mdc.active_cmd = ['yara']
+
+            scan_lists = {}
+
+            def fake_call(cmds):
+                with open(cmds[0][-1]) as f:
+                    items = f.read().splitlines()
+                scan_lists[items[0]] = items
+                return 'TEST_Rule [author="Red Hat Insights"] %s/1\n0x4a:$re1: Malware' % items[0]
+
+            with patch(CALL_TARGET, side_effect=fake_call) as call_mock:
+                assert mdc.scan_filesystem() is True
+            assert call_mock.call_count == 2
+            assert all(c[0][0][0][:2] == ['yara', '--scan-list'] for c in call_mock.call_args_list)
+            assert scan_lists == {scan_me: [scan_me], scan_me_too: [scan_me_too]}
+            sources = sorted(m['source'] for m in mdc.host_scan['TEST_Rule']['matches'])
+            assert sources == [os.path.join(scan_me, '1'), os.path.join(scan_me_too, '1')]
+
+        def test_filesystem_scan_index(
+            self, log_mock, yara, cmd, remove, create_test_files_fake_yara, tmpdir
+        ):
+            # With filesystem_scan_index, files are only scanned again when they change
+            for path in ['scan_me/1', 'scan_me/2']:
+                tmpdir.join(path).ensure()
+            scan_me = str(tmpdir.join('scan_me'))
+            for line in fileinput.FileInput(TEMP_CONFIG_FILE, inplace=1):
+                line = "test_scan: false" if line.startswith("test_scan:") else line
+                line = (
+                    line + "remote_rules_location: %s\n" % TEST_RULE_FILE
+                    if line.startswith('---')
+                    else line
+                )
+                line = line + "- %s" % scan_me if line.startswith("filesystem_scan_only:") else line
+                line = "filesystem_scan_index: true" if line.startswith("filesystem_scan_index:") else line
+                line = (
+                    "exclude_network_filesystem_mountpoints: false"
+                    if line.startswith("exclude_network_filesystem_mountpoints:")
+                    else line
+                )
+                print(line)
+
+            scan_lists = []
+
+            def fake_call(cmds):
+                with open(cmds[0][-1]) as f:
+                    scan_lists.append(sorted(f.read().splitlines()))
+                return ''
+
+            def scan(scan_timeout=None):
+                mdc = MalwareDetectionClient(None)
+                mdc.active_cmd = ['yara']
+                if scan_timeout:
+                    mdc.scan_timeout = scan_timeout
+                with patch(CALL_TARGET, side_effect=fake_call):
+                    mdc.scan_filesystem()
+                mdc.scan_index.save()
+                return scan_lists.pop()
+
+            with patch('insights.specs.datasources.malware_detection.FILESYSTEM_SCAN_INDEX_FILE',
+                       str(tmpdir.join('index'))):
+                assert scan() == [os.path.join(scan_me, '1'), os.path.join(scan_me, '2')]
+                assert scan() == []
+                tmpdir.join('scan_me/2').write('changed')
+                assert scan() == [os.path.join(scan_me, '2')]
+                # The files of a scan that timed out are scanned again
+                tmpdir.join('scan_me/1').write('changed')
+                assert scan(scan_timeout=2) == [os.path.join(scan_me, '1')]
+                assert scan() == [os.path.join(scan_me, '1')]
+                assert scan() == []
+
         def test_scan_root_with_extra_slashes(
             self, log_mock, yara, cmd, remove, create_test_files_fake_yara
         ):
@@ -1,5 +1,6 @@
 import pytest
-from insights.parsers.audit_log import AuditLog
+import shlex
+from insights.parsers.audit_log import AuditLog, _split
 from insights.tests import context_wrap
 from datetime import date
 
@@ -127,3 +128,33 @@ def test_audit_log():
     logtime = date.fromtimestamp(1506047401.407)
     logs = list(auditlog.get_after(timestamp=logtime))
     assert logs[0]['raw_message'] == LAST_LINE_OF_TEMPLATE
+
+
+@pytest.mark.parametrize("line", [
+    "",
+    "   ",
+    "a  b\tc\r\nd",
+    " lead and trail ",
+    LAST_LINE_OF_TEMPLATE,
+    AUDIT_LOG_NORMAL,
+    "a'b c'd e",
+    "a\"b c\"d",
+    "x='' y=\"\"",
+    "''",
+    "a\\ b c\\\\d",
+    "\"a\\\"b\\\\c\\d\"",
+    "'a\\b'",
+    "\"it's\" 'say \"hi\"'",
+    "key=val\xa0ue\x0bmore",
+    "proctitle=2F7573722F62696E2F707974686F6E",
+])
+def test_split_like_shlex(line):
+    assert _split(line) == shlex.split(line)
+
+
+@pytest.mark.parametrize("line", ["a 'b", 'a "b', "a b\\", 'a "b\\"'])
+def test_split_unbalanced(line):
+    with pytest.raises(ValueError):
+        shlex.split(line)
+    with pytest.raises(ValueError):
+        _split(line)
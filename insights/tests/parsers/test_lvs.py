@@ -32,6 +32,12 @@ LVS_INFO_2 = """
   LVM2_LV_UUID='9t90ef-LY5K-CY5b-fMJL-rucT-JNF8-HbySuY'|LVM2_LV_NAME='swap'|LVM2_LV_FULL_NAME='rhel/swap'|LVM2_LV_PATH='/dev/rhel/swap'|LVM2_LV_DM_PATH='/dev/mapper/rhel-swap'|LVM2_LV_PARENT=''|LVM2_LV_LAYOUT='linear'|LVM2_LV_ROLE='public'|LVM2_LV_INITIAL_IMAGE_SYNC=''|LVM2_LV_IMAGE_SYNCED=''|LVM2_LV_MERGING=''|LVM2_LV_CONVERTING=''|LVM2_LV_ALLOCATION_POLICY='inherit'|LVM2_LV_ALLOCATION_LOCKED=''|LVM2_LV_FIXED_MINOR=''|LVM2_LV_SKIP_ACTIVATION=''|LVM2_LV_WHEN_FULL=''|LVM2_LV_ACTIVE='active'|LVM2_LV_ACTIVE_LOCALLY='active locally'|LVM2_LV_ACTIVE_REMOTELY=''|LVM2_LV_ACTIVE_EXCLUSIVELY='active exclusively'|LVM2_LV_MAJOR='-1'|LVM2_LV_MINOR='-1'|LVM2_LV_READ_AHEAD='auto'|LVM2_LV_SIZE='1.62g'|LVM2_LV_METADATA_SIZE=''|LVM2_SEG_COUNT='1'|LVM2_ORIGIN=''|LVM2_ORIGIN_UUID=''|LVM2_ORIGIN_SIZE=''|LVM2_LV_ANCESTORS=''|LVM2_LV_FULL_ANCESTORS=''|LVM2_LV_DESCENDANTS=''|LVM2_LV_FULL_DESCENDANTS=''|LVM2_RAID_MISMATCH_COUNT=''|LVM2_RAID_SYNC_ACTION=''|LVM2_RAID_WRITE_BEHIND=''|LVM2_RAID_MIN_RECOVERY_RATE=''|LVM2_RAID_MAX_RECOVERY_RATE=''|LVM2_MOVE_PV=''|LVM2_MOVE_PV_UUID=''|LVM2_CONVERT_LV=''|LVM2_CONVERT_LV_UUID=''|LVM2_MIRROR_LOG=''|LVM2_MIRROR_LOG_UUID=''|LVM2_DATA_LV=''|LVM2_DATA_LV_UUID=''|LVM2_METADATA_LV=''|LVM2_METADATA_LV_UUID=''|LVM2_POOL_LV=''|LVM2_POOL_LV_UUID=''|LVM2_LV_TAGS=''|LVM2_LV_PROFILE=''|LVM2_LV_LOCKARGS=''|LVM2_LV_TIME='2017-07-10 05:49:42 -0400'|LVM2_LV_TIME_REMOVED=''|LVM2_LV_HOST='localhost.localdomain'|LVM2_LV_MODULES=''|LVM2_LV_HISTORICAL=''|LVM2_LV_KERNEL_MAJOR='253'|LVM2_LV_KERNEL_MINOR='1'|LVM2_LV_KERNEL_READ_AHEAD='4.00m'|LVM2_LV_PERMISSIONS='writeable'|LVM2_LV_SUSPENDED=''|LVM2_LV_LIVE_TABLE='live table present'|LVM2_LV_INACTIVE_TABLE=''|LVM2_LV_DEVICE_OPEN='open'|LVM2_DATA_PERCENT=''|LVM2_SNAP_PERCENT=''|LVM2_METADATA_PERCENT=''|LVM2_COPY_PERCENT=''|LVM2_SYNC_PERCENT=''|LVM2_CACHE_TOTAL_BLOCKS=''|LVM2_CACHE_USED_BLOCKS=''|LVM2_CACHE_DIRTY_BLOCKS=''|LVM2_CACHE_READ_HITS=''|LVM2_CACHE_READ_MISSES=''|LVM2_CACHE_WRITE_HITS=''|LVM2_CACHE_WRITE_MISSES=''|LVM2_KERNEL_CACHE_SETTINGS=''|LVM2_KERNEL_CACHE_POLICY=''|LVM2_KERNEL_METADATA_FORMAT=''|LVM2_LV_HEALTH_STATUS=''|LVM2_KERNEL_DISCARDS=''|LVM2_LV_CHECK_NEEDED='unknown'|LVM2_LV_MERGE_FAILED='unknown'|LVM2_LV_SNAPSHOT_INVALID='unknown'|LVM2_LV_ATTR='-wi-ao----'|LVM2_SEGTYPE='linear'|LVM2_SEG_MONITOR='monitored'
 """.strip()
 
+LVS_SAME_NAME = """
+LVM2_LV_NAME='data'|LVM2_LV_FULL_NAME='vg1/data'|LVM2_LV_SIZE='1.00g'|LVM2_VG_NAME='vg1'
+LVM2_LV_NAME='data'|LVM2_LV_FULL_NAME='vg2/data'|LVM2_LV_SIZE='2.00g'|LVM2_VG_NAME='vg2'
+LVM2_LV_NAME='logs'|LVM2_LV_FULL_NAME='vg2/logs'|LVM2_LV_SIZE='3.00g'|LVM2_VG_NAME='vg2'
+""".strip()
+
 LVS_INFO_ERROR = """
   WARNING: Locking disabled. Be careful! This could corrupt your metadata.
   Logical Volume Fields
@@ -423,6 +429,15 @@ class TestLVS(object):
             'LVM2_LV_ATTR': '-wi-ao----', 'LVM2_DEVICES': '/dev/sda2(416)',
         })
 
+    def test_lvs_same_name(self):
+        lvs_list = Lvs(context_wrap(LVS_SAME_NAME))
+        assert lvs_list['data']['VG'] == 'vg1'
+        assert [lv['LSize'] for lv in lvs_list.vg('vg2')] == ['2.00g', '3.00g']
+        # the returned list can't change the parser
+        lvs_list.vg('vg2').append({})
+        assert len(lvs_list.vg('vg2')) == 2
+        assert lvs_list.vg('missing') == []
+
     def test_lvs2(self):
         lvs_list = Lvs(context_wrap(LVS_INFO_2))
         assert len(lvs_list) == 6
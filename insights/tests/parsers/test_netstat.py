@@ -811,6 +811,31 @@ def test_ss_tulpn_get_port():
     assert ss.get_port("22") == exp03
 
 
+def test_ss_get_service_like_substring_search():
+    for data in (Ss_TULPN, Ss_TUPNA, SS_TUPNA_2):
+        ss = SsTUPNA(context_wrap(data))
+        for service in ("rpc", "rpcbind", "rpc.statd", "sshd", "d", "s", "pid", "953", "1231,3",
+                        '"sshd"', "master", "dhclient", "missing", ""):
+            assert ss.get_service(service) == [
+                l for l in ss if l.get("Process") and service in l["Process"]
+            ]
+
+
+def test_ss_get_port_unknown_process():
+    ss = SsTUPNA(context_wrap(Ss_TULPN + "tcp    LISTEN     0      128      *:22    *:*    unknown"))
+    assert [l["Process"] for l in ss.get_service("unknown")] == ["unknown"]
+    assert [l.get("Process") for l in ss.get_localport(22)] == ['users:(("sshd",1231,3))', "unknown"]
+    assert ss.get_localport("99") == []
+
+
+def test_netstat_listening_pid_copy():
+    ns = Netstat(context_wrap(NETSTAT_DOCS))
+    ns.listening_pid['1272']['port'] = '1'
+    ns.running_processes.add('other')
+    assert ns.listening_pid['1272']['port'] == '5646'
+    assert 'other' not in ns.running_processes
+
+
 # Because tests are done at the module level, we have to put all the shared
 # parser information in the one environment.  Fortunately this is normal.
 def test_netstat_doc_examples():
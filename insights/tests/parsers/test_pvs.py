@@ -185,6 +185,10 @@ def test_pvs_dup():
         'unknown device+mn5KxB-YKlY-u4hK-zuZJ-Ia6r-3dTg-8IDjsM',
         'unknown device+V4xZ9b-FXOz-CrRA-Eu2e-8iOS-9EDF-YZYftK',
     ])
+    # the first of the PVs with the same name is found by name
+    assert pvs_records['unknown device']['VG'] == 'rhel'
+    assert [pv['PSize'] for pv in pvs_records.vg('vgtest')] == ['196.00m']
+    assert pvs_records.vg('missing') == []
 
 
 def test_pvs_headings():
@@ -212,6 +216,25 @@ def test_pvs_headings():
     })
 
 
+def test_pvs_without_name():
+    content = PVS_INFO.splitlines()
+    content[1] = content[1].replace("|LVM2_PV_NAME='/dev/sda1'", "")
+    pvs_records = Pvs(context_wrap("\n".join(content)))
+    assert len(pvs_records) == 2
+    assert pvs_records[0]['PV_KEY'] == 'no_name+'
+    # rows without a name can't be found by name
+    assert pvs_records[None] is None
+    assert pvs_records['/dev/sda1'] is None
+    assert pvs_records['/dev/sda2']['Fmt'] == 'lvm2'
+
+    class PvsWithoutNames(Pvs):
+        KEYS = dict((k, v) for k, v in Pvs.KEYS.items() if v != 'PV')
+
+    pvs_records = PvsWithoutNames(context_wrap(PVS_INFO))
+    assert len(pvs_records) == 2
+    assert pvs_records['/dev/sda2'] is None
+
+
 def test_pvs_other_error():
     pvs_records = Pvs(context_wrap(PVS_WITH_OTHER_ERROR_BEFORE_CONTENT))
     assert len(pvs_records.data['content']) == 1
@@ -99,6 +99,35 @@ def test_broker_parse_exception():
     assert EXPECTED_MSG_3 in tb
 
 
+def test_broker_lazy_tracebacks():
+    eager = dr.run(report)
+    seed = dr.Broker()
+    seed.lazy_tracebacks = True
+    broker = dr.run(report, broker=dr.Broker(seed))
+    assert broker.lazy_tracebacks
+
+    for spec in (Specs.the_ce_data, Specs.the_ex_data):
+        ex = broker.exceptions[spec][0]
+        assert isinstance(dict.__getitem__(broker.tracebacks, ex), dr.LazyTraceback)
+        tb = broker.tracebacks[ex]
+        assert type(tb) is str
+        assert tb == eager.tracebacks[eager.exceptions[spec][0]]
+        # the text replaces the captured traceback once it's read
+        assert dict.__getitem__(broker.tracebacks, ex) is tb
+
+    # the implementation and the registry point share the traceback
+    ex = broker.exceptions[TestSpecs.the_ex_data][0]
+    assert broker.tracebacks.get(ex) is broker.tracebacks[ex]
+    assert all(type(tb) is str for tb in broker.tracebacks.values())
+    assert broker.tracebacks.get(Exception()) is None
+
+    broker = dr.run(report, broker=dr.Broker(seed))
+    copied = broker.tracebacks.copy()
+    assert type(copied) is dict
+    assert all(type(tb) is str for tb in copied.values())
+    assert len(copied) == len(broker.tracebacks)
+
+
 def test_no_filter_exception():
     # No "add_filter" to Specs.the_ft_data or FilterSpecParser
     broker = run_input_data(FilterSpecParser, InputData())
@@ -0,0 +1,152 @@
+import json
+import os
+import pytest
+import shutil
+
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import mkdtemp
+
+from insights.collect import (
+    get_history_configs,
+    get_history_weights,
+    load_history,
+    save_history,
+    update_history,
+)
+from insights.core import dr
+from insights.core.exceptions import CalledProcessError, CalledProcessTimeout, TimeoutException
+from insights.core.plugins import datasource
+from insights.core.spec_factory import RegistryPoint, SpecSet
+
+
+class Specs(SpecSet):
+    slow = RegistryPoint()
+    fast = RegistryPoint()
+
+
+class TheSpecs(Specs):
+    @datasource()
+    def slow(broker):
+        return "slow"
+
+    @datasource()
+    def fast(broker):
+        return "fast"
+
+
+SLOW = dr.get_name(Specs.slow)
+FAST = dr.get_name(Specs.fast)
+SLOW_IMPL = dr.get_name(TheSpecs.slow)
+
+
+def write_doc(meta_root, comp, exec_time, ser_time):
+    name = dr.get_name(comp)
+    with open(os.path.join(meta_root, name + ".json"), "w") as f:
+        json.dump({"name": name, "exec_time": exec_time, "ser_time": ser_time, "results": {}}, f)
+
+
+def test_load_and_save_history():
+    tmp = mkdtemp()
+    try:
+        path = os.path.join(tmp, "sub", "history.json")
+        assert load_history(path) == {}
+
+        save_history(path, {SLOW: [[1.0, False]]})
+        assert load_history(path) == {SLOW: [[1.0, False]]}
+
+        with open(path, "w") as f:
+            f.write("[]")
+        assert load_history(path) == {}
+
+        with open(path, "w") as f:
+            f.write("{")
+        assert load_history(path) == {}
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_update_history():
+    tmp = mkdtemp()
+    try:
+        write_doc(tmp, Specs.slow, 1.0, 2.0)
+        write_doc(tmp, Specs.fast, None, 0.5)
+        with open(os.path.join(tmp, "insights_profile.json"), "w") as f:
+            f.write("{}")
+
+        broker = dr.Broker()
+        broker.add_exception(Specs.slow, CalledProcessTimeout(124, ["cmd"]))
+        broker.add_exception(Specs.fast, CalledProcessError(1, ["cmd"]))
+
+        history = {SLOW: [[5.0, True], [4.0, True], [3.0, False]]}
+        history = update_history(history, broker, tmp, skipped=set(["other"]), runs=3)
+        assert history[SLOW] == [[4.0, True], [3.0, False], [3.0, True]]
+        assert history[FAST] == [[0.5, False]]
+        assert history["other"] == [None]
+    finally:
+        shutil.rmtree(tmp)
+
+
+@pytest.mark.parametrize("ex", [TimeoutException("timed out"), CalledProcessTimeout(137, ["cmd"])])
+def test_update_history_timeout(ex):
+    tmp = mkdtemp()
+    try:
+        write_doc(tmp, Specs.slow, 120.0, 0.0)
+        broker = dr.Broker()
+        broker.add_exception(Specs.slow, ex)
+        assert update_history({}, broker, tmp) == {SLOW: [[120.0, True]]}
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_get_history_configs_skip():
+    history = {
+        SLOW: [[10.0, True], None, [10.0, True]],
+        FAST: [[10.0, True], [0.1, False], [10.0, True]],
+        "not.loaded": [[10.0, True], [10.0, True], [10.0, True]],
+    }
+    configs, skipped = get_history_configs(history, runs=3)
+    assert skipped == set([SLOW])
+    assert configs == [
+        {"name": SLOW, "enabled": False},
+        {"name": SLOW_IMPL, "enabled": False},
+    ]
+
+
+def test_get_history_configs_retries_after_skipping():
+    history = {SLOW: [None, None, None]}
+    assert get_history_configs(history, runs=3) == ([], set())
+
+    history = {SLOW: [[10.0, True], [10.0, True]]}
+    assert get_history_configs(history, runs=3) == ([], set())
+
+
+def test_get_history_configs_lower_timeout():
+    history = {SLOW: [[10.0, True], [10.0, True]]}
+    configs, skipped = get_history_configs(history, runs=2, on_timeout=5)
+    assert not skipped
+    assert configs == [
+        {"name": SLOW, "timeout": 5},
+        {"name": SLOW_IMPL, "timeout": 5},
+    ]
+
+
+def test_get_history_weights():
+    history = {SLOW: [[10.0, True], None, [20.0, False]], FAST: [None], "not.loaded": [[1.0, False]]}
+    assert get_history_weights(history) == {Specs.slow: 15.0}
+
+
+def test_run_all_weights():
+    order = []
+    broker = dr.Broker()
+    broker.add_observer(lambda c, b: order.append(c), dr.ComponentType)
+    graph = dr.get_dependency_graph(Specs.slow)
+    graph.update(dr.get_dependency_graph(Specs.fast))
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        dr.run_all(graph, broker, pool, weights={Specs.slow: 10.0, Specs.fast: 1.0})
+        first = [c for c in order if c in (Specs.slow, Specs.fast)]
+        assert first == [Specs.slow, Specs.fast]
+
+        del order[:]
+        dr.run_all(graph, broker, pool, weights={Specs.slow: 1.0, Specs.fast: 10.0})
+        first = [c for c in order if c in (Specs.slow, Specs.fast)]
+        assert first == [Specs.fast, Specs.slow]
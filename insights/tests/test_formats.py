@@ -1,11 +1,16 @@
+import json
 import pytest
+import yaml
 
 from io import StringIO
 
-from insights import dr, make_fail, rule
+from insights import dr, make_fail, make_pass, rule
+from insights.formats import is_type_shown
 from insights.formats.text import HumanReadableFormat
 from insights.formats._yaml import YamlFormat
+from insights.formats._yaml_stream import YamlStreamFormat
 from insights.formats._json import JsonFormat
+from insights.formats._jsonl import JsonLinesFormat
 from insights.formats._syslog import SysLogFormat
 from insights.formats.html import HtmlFormat
 from insights.formats.simple_html import SimpleHtmlFormat
@@ -113,3 +118,72 @@ def test_simple_html_format():
     data = output.read()
     assert "foo" in data
     assert "bar" in data
+
+
+@rule()
+def passed():
+    return make_pass("PASSED")
+
+
+class Stream(StringIO):
+    """Keeps what's in the stream at each flush"""
+
+    def __init__(self):
+        super(Stream, self).__init__()
+        self.flushes = []
+
+    def flush(self):
+        self.flushes.append(self.getvalue())
+
+
+def test_json_lines_format():
+    broker = dr.Broker()
+    output = Stream()
+    fmt = JsonLinesFormat(broker, missing=True, stream=output)
+    fmt.flush_interval = 0
+    with fmt:
+        dr.run([report, passed], broker=broker)
+        # the results are written while the rules are evaluated
+        assert len(output.flushes) == 2
+    lines = [json.loads(l) for l in output.getvalue().splitlines()]
+    # the rules are written in the order they're evaluated, then the summary
+    assert sorted(l["type"] for l in lines[:-1]) == ["pass", "rule"]
+    assert "type" not in lines[-1]
+    rule = [l for l in lines if l.get("type") == "rule"][0]
+    assert rule["details"]["foo"] == "bar"
+    assert "reports" not in lines[-1]
+    assert "analysis_metadata" in lines[-1]
+
+
+def test_json_lines_format_show_rules():
+    broker = dr.Broker()
+    output = StringIO()
+    with JsonLinesFormat(broker, show_rules=["pass"], stream=output) as fmt:
+        dr.run([report, passed], broker=broker)
+        # the results are buffered
+        assert output.getvalue() == ""
+    lines = [json.loads(l) for l in output.getvalue().splitlines()]
+    assert [l.get("type") for l in lines] == ["pass", None]
+    assert "metadata" not in lines[-1]["system"]
+    assert not fmt.results["rule"]
+
+
+def test_is_type_shown():
+    assert is_type_shown("rule")
+    assert not is_type_shown("none")
+    assert not is_type_shown("skip", missing=False)
+    assert is_type_shown("none", show_rules=["none"])
+    assert not is_type_shown("rule", show_rules=["pass"])
+
+
+def test_yaml_stream_format():
+    broker = dr.Broker()
+    output = StringIO()
+    with YamlStreamFormat(broker, stream=output):
+        dr.run([report, passed], broker=broker)
+    docs = list(yaml.load_all(output.getvalue(), Loader=yaml.Loader))
+    assert sorted(d["type"] for d in docs[:-1]) == ["pass", "rule"]
+    assert "type" not in docs[-1]
+    rule = [d for d in docs if d.get("type") == "rule"][0]
+    assert rule["details"]["foo"] == "bar"
+    assert "analysis_metadata" in docs[-1]
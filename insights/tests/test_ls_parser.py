@@ -1,4 +1,7 @@
 # -*- coding: UTF-8 -*-
+import json
+import pytest
+
 from insights.core.ls_parser import parse
 
 
@@ -366,3 +369,63 @@ def test_error_lines():
     assert len(results['error_lines']) == 2
     assert results['error_lines'][0] == "/bin/ls: unrecognized option '--xx.xx.xxx.xx:/opt/carga_alocacao'"
     assert results['error_lines'][1] == "Try '/bin/ls --help' for more information."
+
+
+def test_entries_parsed_on_access():
+    results = parse(MULTIPLE_DIRECTORIES.splitlines(), None)
+    entries = results["/etc/sysconfig"]["entries"]
+    assert isinstance(entries, dict)
+    assert list(dict.keys(entries)) == ["."]
+    assert "grub" in entries
+    assert "missing" not in entries
+    assert sorted(entries) == sorted(
+        [".", "..", "cbq", "console", "ebtables-config", "firewalld", "grub", "spooler-T", "spooler-t"]
+    )
+    assert list(dict.keys(entries)) == ["."]
+
+    grub = entries["grub"]
+    assert entries["grub"] is grub
+    assert list(dict.keys(entries)) == [".", "grub"]
+    assert grub["link"] == "/etc/default/grub"
+    assert entries.get("missing") is None
+
+    # the lazy entries compare equal to the parsed ones
+    assert entries == dict((k, v) for k, v in entries.items())
+    assert dict(entries)["cbq"]["dir"] == "/etc/sysconfig"
+
+
+def test_entries_whole_dict():
+    entries = parse(MULTIPLE_DIRECTORIES.splitlines(), None)["/etc/sysconfig"]["entries"]
+    parsed = json.loads(json.dumps(entries))
+    assert list(parsed) == list(entries)
+    assert parsed["grub"]["link"] == "/etc/default/grub"
+
+    entries = parse(MULTIPLE_DIRECTORIES.splitlines(), None)["/etc/sysconfig"]["entries"]
+    copied = entries.copy()
+    assert type(copied) is dict
+    assert copied == entries
+    assert copied["cbq"]["dir"] == "/etc/sysconfig"
+
+
+def test_bad_number_at_parse_time():
+    lines = MULTIPLE_DIRECTORIES.splitlines()
+    grub = [i for i, l in enumerate(lines) if l.endswith("grub -> /etc/default/grub")][0]
+    lines[grub] = lines[grub].replace(" 17 ", " 1x7 ")
+    with pytest.raises(ValueError):
+        parse(lines, None)
+
+
+def test_entries_format_per_stanza():
+    results = parse((RHEL8_SELINUX_DIRECTORY + COMPLICATED_FILES_BAD_LINE).splitlines(), None)
+    assert results["/var/lib/nova/instances"]["entries"].rhel8 is True
+    assert results["/var/lib/nova/instances"]["entries"]["."]["se_type"] == "var_lib_t"
+    tmp = results["/tmp"]
+    assert tmp["entries"].rhel8 is False
+    assert tmp["entries"]["dm-10"]["major"] == 253
+    assert "dm-10" in tmp["specials"]
+    assert "File name with spaces in it!" in tmp["files"]
+    assert tmp["entries"]["link with spaces"]["link"] == "../file with spaces"
+
+    results = parse(SELINUX_DIRECTORY.splitlines(), "/boot")
+    assert results["/boot"]["entries"].rhel8 is None
+    assert results["/boot"]["dirs"] == ["grub2"]
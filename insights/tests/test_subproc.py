@@ -3,9 +3,10 @@ import pytest
 import shlex
 import sys
 import stat
+import time
 
-from insights.core.exceptions import CalledProcessError
-from insights.util import subproc
+from insights.core.exceptions import CalledProcessError, CalledProcessTimeout
+from insights.util import streams, subproc
 
 
 def test_call():
@@ -27,6 +28,53 @@ def test_call_timeout():
             subproc.call('sleep 3', timeout=1)
 
 
+def test_call_timeout_pipeline():
+    # the deadline covers every command of the pipeline, not just the first
+    start = time.time()
+    with pytest.raises(CalledProcessTimeout) as cpt:
+        subproc.call([["echo", "x"], ["sleep", "30"]], timeout=1)
+    assert time.time() - start < 10
+    assert cpt.value.returncode == 137
+    assert cpt.value.cmd == ["echo", "x"]
+
+
+def test_call_timeout_keep_rc():
+    rc, _ = subproc.call([["sleep", "30"], ["cat"]], timeout=1, keep_rc=True, signum=15)
+    assert rc == 124
+
+
+def test_call_timeout_ignored(monkeypatch):
+    monkeypatch.setattr(subproc, "KILL_GRACE", 0.5)
+    start = time.time()
+    with pytest.raises(CalledProcessTimeout):
+        subproc.call("sh -c 'trap \"\" TERM; sleep 30'", timeout=1, signum=15)
+    assert time.time() - start < 10
+
+
+def test_call_timeout_output(tmpdir):
+    out = str(tmpdir.join("out"))
+    rc = subproc.Pipeline("sh -c 'echo x; sleep 30'", timeout=1).write(out, keep_rc=True)
+    assert rc == 137
+    with open(out) as f:
+        assert f.read() == "x\n"
+
+
+def test_call_timeout_zero():
+    # like timeout(1), a timeout of 0 means no timeout
+    assert subproc.call("echo -n hi", timeout=0) == "hi"
+
+
+def test_call_timeout_in_time():
+    assert subproc.call([["echo", "hello"], ["cat"]], timeout=10) == "hello\n"
+
+
+def test_stream_timeout():
+    start = time.time()
+    with streams.connect("echo x", "sleep 30", timeout=1) as s:
+        assert list(streams.reader(s)) == []
+    assert time.time() - start < 10
+
+
 SCRIPT_CONTENT = """
 #!/bin/bash
 echo '0123456789'
@@ -1,8 +1,13 @@
 import datetime
+import importlib
+import inspect
+import pkgutil
 import pytest
+import yaml
 
 import insights
-from insights.core import YAMLParser
+import insights.parsers
+from insights.core import YAMLParser, _PatchedPySafeLoader
 from insights.core.exceptions import ParseException, SkipComponent
 from insights.tests import context_wrap, _PatchedSafeLoader
 
@@ -110,3 +115,44 @@ def test_yaml_parser_with_equal_value():
 
     ctx = context_wrap("key: value")
     assert FakeYamlParser(ctx).data == {"key": "value"}
+
+
+def yaml_parser_test_corpus():
+    """
+    Yields the strings of the tests of all parsers based on YAMLParser.
+    """
+    for info in pkgutil.iter_modules(insights.parsers.__path__):
+        mod = importlib.import_module("insights.parsers." + info.name)
+        if not any(
+            inspect.isclass(v) and issubclass(v, YAMLParser) and v.__module__ == mod.__name__
+            for v in vars(mod).values()
+        ):
+            continue
+        try:
+            tests = importlib.import_module("insights.tests.parsers.test_" + info.name)
+        except ImportError:
+            continue
+        for name, value in sorted(vars(tests).items()):
+            if isinstance(value, str) and not name.startswith("__"):
+                yield value
+    for value in yaml_test_strings:
+        yield value
+
+
+def load(content, loader):
+    try:
+        return yaml.load(content, Loader=loader)
+    except yaml.YAMLError as e:
+        return type(e)
+
+
+@pytest.mark.skipif(not getattr(yaml, "__with_libyaml__", False), reason="libyaml is not available")
+def test_libyaml_loader_conformance():
+    # the original loader, which is libyaml based when available
+    c_loader = _PatchedSafeLoader
+    assert issubclass(c_loader, yaml.CSafeLoader)
+
+    corpus = list(yaml_parser_test_corpus())
+    assert len(corpus) > len(yaml_test_strings)
+    for content in corpus:
+        assert load(content, c_loader) == load(content, _PatchedPySafeLoader)
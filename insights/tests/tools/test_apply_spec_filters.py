@@ -59,7 +59,9 @@ JSON_content = """
 """.strip()
 JSON_file = '/tmp/_test_just_test_uploader.json'
 YAML_file = '/tmp/_test_just_test_filters_yaml.yaml'
+COMPILED_file = '/tmp/_test_just_test_filters.json'
 yaml_file = os.path.join(os.path.dirname(insights.__file__), filters._filename)
+compiled_file = os.path.join(os.path.dirname(insights.__file__), filters._compiled_filename)
 
 
 def setup_function():
@@ -78,6 +80,9 @@ def teardown_function():
         os.remove(YAML_file)
     if os.path.exists(yaml_file):
         os.remove(yaml_file)
+    for path in (COMPILED_file, compiled_file):
+        if os.path.exists(path):
+            os.remove(path)
 
     filters._CACHE = {}
     filters.FILTERS = defaultdict(dict)
@@ -165,6 +170,25 @@ def test_apply_specs_filters_yaml():
     assert count == 6
 
 
+def test_apply_specs_filters_compiled():
+    apply_spec_filters.apply_filters("compiled", 'insights.parsers', COMPILED_file)
+
+    with open(COMPILED_file, 'r') as f:
+        ret = json.load(f)
+    assert len(ret['filters']['insights.specs.Specs.ps_alxwww']) == 2
+    assert 'insights.specs.Specs.ps_auxcww' not in ret['filters']
+    assert set(['Erased', 'Installed', 'Updated']) <= set(ret['datasources']['insights.specs.default.DefaultSpecs.yum_log'])
+
+    apply_spec_filters.apply_filters("compiled", 'insights.parsers')
+    # the filters file is written along with the compiled filters
+    with open(yaml_file, 'r') as f:
+        assert 'Installed' in yaml.safe_load(f)['insights.specs.Specs.yum_log']
+    with open(compiled_file, 'r') as f:
+        ret = json.load(f)
+    with open(yaml_file, 'rb') as f:
+        assert ret['source'] == filters._digest(f.read())
+
+
 def test_apply_specs_filters_ab():
     ret = apply_spec_filters.apply_filters("test", 'insights.parsers', YAML_file)
     assert ret == 1
@@ -32,7 +32,7 @@ def load_default_plugins():
 def apply_filters(_format, _plugins, output=None):
     load_default_plugins()
 
-    if _format not in ("yaml", "json"):
+    if _format not in ("yaml", "json", "compiled"):
         logger.error("Unsupported format: {0}".format(_format))
         return 1
 
@@ -56,6 +56,23 @@ def apply_filters(_format, _plugins, output=None):
             with open(yaml_path, 'w') as fp:
                 filters.dump(fp)
 
+    if _format == "compiled":
+        # the compiled filters are loaded at collection instead of the
+        # filters file they're made with, see insights.core.filters
+        if not output:
+            logger.info(
+                "Output filters to '{0}' and '{1}'".format(
+                    os.path.join(os.path.dirname(insights.__file__), filters._filename),
+                    os.path.join(os.path.dirname(insights.__file__), filters._compiled_filename),
+                )
+            )
+            filters.dump()
+            filters.dump_compiled()
+        else:
+            logger.info("Output compiled filters to '{0}'".format(output))
+            with open(output, 'w') as fp:
+                filters.dump_compiled(fp)
+
     if _format == "json":
         json_path = output
         if not json_path:
@@ -96,7 +113,9 @@ def apply_filters(_format, _plugins, output=None):
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("-f", "--format", help="Filters format.", default="yaml")
+    parser.add_argument(
+        "-f", "--format", help="Filters format: yaml, json or compiled.", default="yaml"
+    )
     parser.add_argument("-o", "--output", help="Ouput file.", default="")
     parser.add_argument(
         "-p", "--plugins", help="Comma-separated list without spaces of plugins.", default=""
@@ -5,10 +5,12 @@ as a generator of lines.
 import os
 import shlex
 import signal
+import threading
 from contextlib import contextmanager
 from subprocess import Popen, PIPE, STDOUT
 
 from insights.util import which
+from insights.util.subproc import killpg
 
 stream_options = {
     "bufsize": -1,  # use OS defaults. Non buffered if not set.
@@ -23,9 +25,6 @@ def reader(stream):
         yield line.rstrip("\n")
 
 
-timeout_command = [which("timeout"), "-s", str(signal.SIGKILL)]
-
-
 @contextmanager
 def stream(command, stdin=None, env=os.environ, timeout=None):
     """
@@ -38,7 +37,8 @@ def stream(command, stdin=None, env=os.environ, timeout=None):
         env (dict): The environment in which to execute the command. PATH should
             be defined.
         timeout (int): Amount of time in seconds to give the command to complete.
-            The ``timeout`` utility must be installed to use this feature.
+            The command and the processes it started are killed with SIGKILL
+            when it expires.
 
     Yields:
         The output stream for the command. It should typically be wrapped in a
@@ -54,18 +54,20 @@ def stream(command, stdin=None, env=os.environ, timeout=None):
 
     command[0] = cmd
 
-    if timeout:
-        if not timeout_command[0]:
-            raise Exception("Timeout specified but timeout command not available.")
-        command = timeout_command + [str(timeout)] + command
-
     output = None
+    timer = None
     try:
-        output = Popen(command, env=env, stdin=stdin, **stream_options)
+        output = Popen(command, env=env, stdin=stdin, start_new_session=bool(timeout), **stream_options)
+        if timeout:
+            timer = threading.Timer(timeout, killpg, args=([output], signal.SIGKILL))
+            timer.daemon = True
+            timer.start()
         yield output.stdout
     finally:
         if output:
             output.wait()
+        if timer:
+            timer.cancel()
 
 
 @contextmanager
@@ -80,8 +82,8 @@ def connect(*cmds, **kwargs):
             standard input.
         env (dict): The environment in which to execute the commands. PATH
             should be defined.
-        timeout (int): Amount of time in seconds to give the pipeline to complete.
-            The ``timeout`` utility must be installed to use this feature.
+        timeout (int): Amount of time in seconds to give each command of the
+            pipeline to complete.
 
     Yields:
         The output stream for the final command in the pipeline. It should
@@ -2,11 +2,11 @@ import logging
 import os
 import shlex
 import signal
+import threading
 
 from subprocess import Popen, PIPE, STDOUT
 
-from insights.core.exceptions import CalledProcessError
-from insights.util import which
+from insights.core.exceptions import CalledProcessError, CalledProcessTimeout
 
 try:
     from subprocess import DEVNULL
@@ -15,12 +15,41 @@ except:
 
 log = logging.getLogger(__name__)
 
+KILL_GRACE = 5
+"""
+Seconds a pipeline has to exit after it's sent the timeout signal before it's
+killed with SIGKILL.
+"""
+
+
+def killpg(procs, signum):
+    """
+    Sends the signal to the process group of each process.
+    """
+    for p in procs:
+        try:
+            os.killpg(p.pid, signum)
+        except OSError:
+            # the group is gone
+            pass
+
+
+def timeout_returncode(signum):
+    """
+    The exit code of a command that timed out, the same as timeout(1) gives.
+    """
+    return 128 + signal.SIGKILL if signum == signal.SIGKILL else 124
+
 
 class Pipeline(object):
     """
     Connect a list of lists of commands together with the stdout of one as the
     stdin of the next. The output of the last command is written to out_stream.
 
+    Each command runs in a process group of its own. When the pipeline
+    doesn't complete before its timeout, the signal is sent to every group,
+    so every command of the pipeline and what they started are stopped.
+
     >>> p = Pipeline("ls -lrt", "grep .py")
     >>> output = p()
     >>> p.write("pythons.txt")
@@ -35,9 +64,9 @@ class Pipeline(object):
             Defaults to -1.
         env (dict): environment in which to execute commands. Defaults to
             os.environ.
-        timeout (int): number of seconds to wait before killing the command.
-            Defaults to None, which waits forever.
-        signum (int): signal to send the command on timeout. Defaults to
+        timeout (int): number of seconds to wait before killing the
+            pipeline. Defaults to None, which waits forever.
+        signum (int): signal to send the pipeline on timeout. Defaults to
             signal.SIGKILL
         """
 
@@ -51,61 +80,85 @@ class Pipeline(object):
         except (ValueError, TypeError):
             max_failure_output = 1024
         self.max_failure_output = max_failure_output
-        timeout = kwargs.get("timeout")
-        signum = kwargs.get("signum", signal.SIGKILL)
-
-        cmds = [shlex.split(c) if not isinstance(c, list) else c for c in cmds]
-        timeout_command = which("timeout", env=self.env)
-        if timeout:
-            if timeout_command:
-                to = shlex.split("timeout -s {0} {1}".format(signum, timeout))
-                to.extend(cmds[0])
-                cmds[0] = to
-            else:
-                # TODO: Should this raise an exception instead?
-                log.warn("Timeout specified but timeout command unavailable.")
-        self.cmds = cmds
+        self.timeout = kwargs.get("timeout")
+        self.signum = kwargs.get("signum", signal.SIGKILL)
+        self.cmds = [shlex.split(c) if not isinstance(c, list) else c for c in cmds]
+        self.procs = []
+        self.timed_out = False
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
 
     def _build_pipes(self, out_stream=PIPE):
         log.debug("Executing: %s" % str(self.cmds))
-        if len(self.cmds) == 1:
-            return Popen(
-                self.cmds[0],
-                bufsize=self.bufsize,
-                stdin=DEVNULL,
-                stderr=STDOUT,
-                stdout=out_stream,
-                env=self.env,
-            )
-
-        stdout = Popen(
-            self.cmds[0],
-            bufsize=self.bufsize,
-            stdin=DEVNULL,
-            stderr=STDOUT,
-            stdout=PIPE,
-            env=self.env,
-        ).stdout
-        last = len(self.cmds) - 2
-        for i, arg in enumerate(self.cmds[1:]):
-            if i < last:
-                stdout = Popen(
-                    arg,
-                    bufsize=self.bufsize,
-                    stdin=stdout,
-                    stderr=STDOUT,
-                    stdout=PIPE,
-                    env=self.env,
-                ).stdout
-            else:
-                return Popen(
+        self.procs = []
+        self.timed_out = False
+        self._finished.clear()
+        stdin = DEVNULL
+        last = len(self.cmds) - 1
+        try:
+            for i, arg in enumerate(self.cmds):
+                p = Popen(
                     arg,
                     bufsize=self.bufsize,
-                    stdin=stdout,
+                    stdin=stdin,
                     stderr=STDOUT,
-                    stdout=out_stream,
+                    stdout=out_stream if i == last else PIPE,
                     env=self.env,
+                    start_new_session=bool(self.timeout),
                 )
+                self.procs.append(p)
+                if stdin is not DEVNULL:
+                    # only the next command reads it, so the previous one
+                    # gets SIGPIPE if the next one exits early
+                    stdin.close()
+                stdin = p.stdout
+        except BaseException:
+            killpg(self.procs, signal.SIGKILL)
+            raise
+        return self.procs[-1]
+
+    def _expire(self):
+        with self._lock:
+            if self._finished.is_set():
+                return
+            self.timed_out = True
+        log.debug("Timed out after %s seconds: %s" % (self.timeout, self.cmds))
+        killpg(self.procs, self.signum)
+        if self.signum != signal.SIGKILL and not self._finished.wait(KILL_GRACE):
+            killpg(self.procs, signal.SIGKILL)
+
+    def _wait(self, communicate=False):
+        """
+        Waits for the pipeline to complete, and stops it if it doesn't before
+        the timeout. Returns the return code and the output of the last
+        command.
+        """
+        p = self.procs[-1]
+        # a thread waiting on the timeout costs less than a bounded wait,
+        # which polls the process until it exits
+        timer = None
+        if self.timeout:
+            timer = threading.Timer(self.timeout, self._expire)
+            timer.daemon = True
+            timer.start()
+        try:
+            output = p.communicate()[0] if communicate else p.wait()
+            if timer:
+                # the commands before the last one are bound by the timeout too
+                for up in self.procs[:-1]:
+                    up.wait()
+        finally:
+            with self._lock:
+                self._finished.set()
+            if timer:
+                timer.cancel()
+
+        rc = timeout_returncode(self.signum) if self.timed_out else p.poll()
+        return rc, output
+
+    def _error(self, rc, output):
+        cls = CalledProcessTimeout if self.timed_out else CalledProcessError
+        return cls(rc, self.cmds[0], output)
 
     def __call__(self, keep_rc=False):
         """
@@ -116,16 +169,15 @@ class Pipeline(object):
             an (exit code, output) tuple if keep_rc is True.
         Raises:
             CalledProcessError if any return code in the pipeline is nonzero
-            and keep_rc is False.
+            and keep_rc is False, CalledProcessTimeout if it timed out.
         """
-        p = self._build_pipes()
-        output = p.communicate()[0]
-        rc = p.poll()
+        self._build_pipes()
+        rc, output = self._wait(communicate=True)
         if keep_rc:
             return (rc, output)
         if rc:
             # it's enough for trobuleshooting to keep the first 1024 charactersof the failure output
-            raise CalledProcessError(rc, self.cmds[0], output[: self.max_failure_output])
+            raise self._error(rc, output[: self.max_failure_output])
         return output
 
     def write(self, output, mode="w", keep_rc=False):
@@ -150,32 +202,32 @@ class Pipeline(object):
             already_exists = os.path.exists(output)
             try:
                 with open(output, mode) as f:
-                    p = self._build_pipes(f)
-                    rc = p.wait()
+                    self._build_pipes(f)
+                    rc = self._wait()[0]
                     if keep_rc:
                         return rc
                     if rc:
-                        raise CalledProcessError(rc, self.cmds[0], "")
+                        raise self._error(rc, "")
             except BaseException as be:
                 if not already_exists and os.path.exists(output):
                     os.remove(output)
                 raise be
         else:
-            p = self._build_pipes(output)
-            rc = p.wait()
+            self._build_pipes(output)
+            rc = self._wait()[0]
             if keep_rc:
                 return rc
             if rc:
-                raise CalledProcessError(rc, self.cmds[0], "")
+                raise self._error(rc, "")
 
 
 def call(cmd, timeout=None, signum=signal.SIGKILL, keep_rc=False, encoding="utf-8", env=os.environ):
     """
     Execute a cmd or list of commands with an optional timeout in seconds.
 
-    If `timeout` is supplied and expires, the process is killed with
-    SIGKILL (kill -9) and an exception is raised. Otherwise, the command
-    output is returned.
+    If `timeout` is supplied and expires, the processes are sent `signum`,
+    SIGKILL (kill -9) by default, and a CalledProcessTimeout is raised. Otherwise, the
+    command output is returned.
 
     Parameters
     ----------
@@ -201,6 +253,8 @@ def call(cmd, timeout=None, signum=signal.SIGKILL, keep_rc=False, encoding="utf-
     ------
         CalledProcessError
             Raised when cmd fails
+        CalledProcessTimeout
+            Raised when cmd doesn't complete before the timeout
     """
 
     if not isinstance(cmd, list):